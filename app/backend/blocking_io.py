@@ -0,0 +1,132 @@
+"""
+Execution helpers for mixing blocking work with the asyncio event loop.
+
+- run_blocking(): run sync SQLAlchemy / SDK calls from async code on a
+  dedicated, bounded thread pool instead of on the event loop.
+- run_sync(): run a coroutine to completion from sync code, even when the
+  caller is itself on a thread with a running loop.
+- start_loop_monitor(): heartbeat task plus watchdog thread that logs (with
+  the loop thread's stack) whenever the event loop is blocked for longer
+  than LOOP_STALL_THRESHOLD_MS.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Threads for blocking DB and SDK work started from async handlers. Keep it at or
+# below the SQLAlchemy pool size (create_engine's default: 5 + 10 overflow = 15
+# connections) so queued work waits here rather than on the pool; the default
+# leaves headroom for request sessions held by sync routes.
+BLOCKING_POOL_SIZE = int(os.environ.get("BLOCKING_POOL_SIZE", "10"))
+LOOP_STALL_THRESHOLD_MS = float(os.environ.get("LOOP_STALL_THRESHOLD_MS", "250"))
+LOOP_MONITOR_INTERVAL_MS = float(os.environ.get("LOOP_MONITOR_INTERVAL_MS", "100"))
+
+_executor = ThreadPoolExecutor(max_workers=BLOCKING_POOL_SIZE, thread_name_prefix="blocking-io")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the shared pool and await its result.
+
+    Context variables (request-scoped logging context etc.) are carried over.
+    Objects such as a SQLAlchemy Session may be handed over as long as the
+    caller does not use them concurrently while the call is running.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_executor, call)
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine from synchronous code and return its result.
+
+    Uses asyncio.run() when the current thread has no running loop; otherwise
+    runs it on a pool thread with its own loop so the caller's loop is never
+    re-entered. Either way this call blocks the calling thread until the
+    coroutine finishes: called from a thread running an event loop, it stalls
+    that loop for the whole duration (a warning is logged). Async code should
+    await the coroutine instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    logger.warning("run_sync() called on an event loop thread; the loop is blocked until it returns")
+    return _executor.submit(asyncio.run, coro).result()
+
+
+class _LoopMonitor:
+    def __init__(self, threshold_ms: float, interval_ms: float):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.last_beat = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+        self._reported_beat: Optional[float] = None
+
+    async def heartbeat(self):
+        self.loop_thread_id = threading.get_ident()
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = now - expected
+            self.last_beat = now
+            if lag > self.threshold:
+                self.stalls += 1
+                self.max_lag_ms = max(self.max_lag_ms, lag * 1000)
+                logger.warning(f"⏱️ EVENT LOOP: blocked for {lag * 1000:.0f} ms")
+
+    def watchdog(self):
+        # Catches the stall while it is happening, so the stack shows the culprit
+        while True:
+            time.sleep(self.threshold)
+            beat = self.last_beat
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for <= self.threshold or self._reported_beat == beat:
+                continue
+            self._reported_beat = beat
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "unavailable"
+            logger.warning(
+                f"⏱️ EVENT LOOP: blocked for over {blocked_for * 1000:.0f} ms; loop thread stack:\n{stack}"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "threshold_ms": self.threshold * 1000,
+            "blocking_pool_size": BLOCKING_POOL_SIZE,
+        }
+
+
+_monitor: Optional[_LoopMonitor] = None
+
+
+def start_loop_monitor() -> None:
+    """Start stall detection for the running event loop (call once from app startup)"""
+    global _monitor
+    if _monitor is not None or LOOP_STALL_THRESHOLD_MS <= 0:
+        return
+    _monitor = _LoopMonitor(LOOP_STALL_THRESHOLD_MS, LOOP_MONITOR_INTERVAL_MS)
+    asyncio.get_running_loop().create_task(_monitor.heartbeat())
+    threading.Thread(target=_monitor.watchdog, name="loop-stall-watchdog", daemon=True).start()
+    logger.info(f"Event loop stall monitor started (threshold {LOOP_STALL_THRESHOLD_MS:.0f} ms)")
+
+
+def loop_monitor_stats() -> Dict[str, Any]:
+    return _monitor.stats() if _monitor is not None else {"enabled": False}
@@ -0,0 +1,117 @@
+"""
+Serialization for cached values.
+
+Every stored value starts with a one-byte tag naming its codec, so readers
+can decode entries written with any codec (or by an older release) and the
+codec can be changed per namespace without flushing Redis:
+
+    J  JSON (stdlib)
+    O  orjson
+    M  msgpack
+    Z  zstd-compressed, followed by another tagged payload
+
+Values written before tagging existed are plain JSON text; JSON never starts
+with an uppercase letter, so they are recognised and decoded as JSON.
+
+orjson, msgpack and zstandard are optional. When a configured codec is not
+installed, encoding falls back to JSON; decoding a value whose codec is not
+installed raises ValueError, which the cache treats as a miss.
+"""
+import json
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:
+    import msgpack
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+TAG_JSON = b"J"
+TAG_ORJSON = b"O"
+TAG_MSGPACK = b"M"
+TAG_ZSTD = b"Z"
+
+# Default codec for every namespace: json, orjson or msgpack
+CACHE_CODEC = os.environ.get("CACHE_CODEC", "orjson").lower()
+# Per-namespace overrides, longest prefix wins, e.g.
+# "resources:search=msgpack,recommendations=orjson"
+CACHE_NAMESPACE_CODECS = os.environ.get("CACHE_NAMESPACE_CODECS", "")
+# Payloads at least this large are zstd-compressed (0 disables compression)
+CACHE_COMPRESS_THRESHOLD_BYTES = int(os.environ.get("CACHE_COMPRESS_THRESHOLD_BYTES", "16384"))
+CACHE_COMPRESS_LEVEL = int(os.environ.get("CACHE_COMPRESS_LEVEL", "3"))
+
+
+def _parse_namespace_codecs(spec: str) -> Dict[str, str]:
+    codecs = {}
+    for item in spec.split(","):
+        prefix, _, codec = item.partition("=")
+        if prefix.strip() and codec.strip():
+            codecs[prefix.strip()] = codec.strip().lower()
+    return codecs
+
+
+_namespace_codecs = _parse_namespace_codecs(CACHE_NAMESPACE_CODECS)
+
+
+def codec_for_key(key: str) -> str:
+    """Codec configured for the namespace a key belongs to"""
+    best = None
+    for prefix in _namespace_codecs:
+        if key.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return _namespace_codecs[best] if best is not None else CACHE_CODEC
+
+
+def _dump(value: Any, codec: str) -> bytes:
+    if codec == "orjson" and orjson is not None:
+        return TAG_ORJSON + orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if codec == "msgpack" and msgpack is not None:
+        return TAG_MSGPACK + msgpack.packb(value, default=str, use_bin_type=True)
+    return TAG_JSON + json.dumps(value, default=str).encode("utf-8")
+
+
+def encode(value: Any, codec: str = CACHE_CODEC, compress_threshold: Optional[int] = None) -> bytes:
+    """Serialize a value to tagged bytes, compressing large payloads"""
+    payload = _dump(value, codec)
+    threshold = CACHE_COMPRESS_THRESHOLD_BYTES if compress_threshold is None else compress_threshold
+    if zstandard is not None and threshold > 0 and len(payload) >= threshold:
+        compressed = zstandard.ZstdCompressor(level=CACHE_COMPRESS_LEVEL).compress(payload)
+        if len(compressed) < len(payload):
+            return TAG_ZSTD + compressed
+    return payload
+
+
+def decode(data: bytes) -> Any:
+    """Deserialize bytes written by encode() (or legacy untagged JSON)"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not data:
+        raise ValueError("Empty cache payload")
+
+    tag, body = data[:1], data[1:]
+    if tag == TAG_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        return decode(zstandard.ZstdDecompressor().decompress(body))
+    if tag == TAG_ORJSON:
+        if orjson is None:
+            raise ValueError("orjson cache entry but orjson is not installed")
+        return orjson.loads(body)
+    if tag == TAG_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack cache entry but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if tag == TAG_JSON:
+        return json.loads(body)
+    # Untagged: written as JSON text before codecs were introduced
+    return json.loads(data)
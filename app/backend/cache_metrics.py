@@ -0,0 +1,190 @@
+"""
+Hit/miss/latency metrics for CacheService.
+
+Each worker counts events per key namespace in memory (no I/O on the request
+path) and a background thread periodically adds its deltas to a Redis hash,
+so /api/resources/cache/stats and /api/resources/cache/metrics report totals
+for the whole fleet. Without Redis, the numbers cover this process only.
+
+Hash fields are "<namespace>|<name>", e.g. "resources:search|hits" or
+"resources:search|get_bucket|0.005".
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_METRICS_KEY = "cache:metrics"
+CACHE_METRICS_FLUSH_SECONDS = float(os.environ.get("CACHE_METRICS_FLUSH_SECONDS", "10"))
+
+COUNTERS = ("hits", "l1_hits", "misses", "sets", "evictions", "errors")
+OPERATIONS = ("get", "set")
+# Latency histogram upper bounds in seconds (cumulative, Prometheus style)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_VERSION_PART = re.compile(r"^v\d+$")
+
+
+def namespace_of(key: str) -> str:
+    """Namespace a cache key belongs to: the parts before its version tag, at most two.
+
+    resources:search:v2:g3:ab12 -> resources:search
+    categories:list:v2:g3       -> categories:list
+    """
+    parts = key.split(":")
+    namespace = []
+    for part in parts[:2]:
+        if _VERSION_PART.match(part):
+            break
+        namespace.append(part)
+    return ":".join(namespace) or "other"
+
+
+def _bucket_label(bound: float) -> str:
+    return f"{bound:g}"
+
+
+class CacheMetrics:
+    """Thread-safe per-namespace counters and latency histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Deltas not yet flushed to Redis, and running totals for this process
+        self._pending: Dict[str, float] = defaultdict(float)
+        self._local: Dict[str, float] = defaultdict(float)
+        self._flush_thread: Optional[threading.Thread] = None
+
+    def _add(self, field: str, amount: float = 1) -> None:
+        self._pending[field] += amount
+        self._local[field] += amount
+
+    def incr(self, key: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._add(f"{namespace_of(key)}|{counter}", amount)
+
+    def observe(self, key: str, operation: str, seconds: float) -> None:
+        namespace = namespace_of(key)
+        with self._lock:
+            for bound in LATENCY_BUCKETS:
+                if seconds <= bound:
+                    self._add(f"{namespace}|{operation}_bucket|{_bucket_label(bound)}")
+            self._add(f"{namespace}|{operation}_bucket|+Inf")
+            self._add(f"{namespace}|{operation}_count")
+            self._add(f"{namespace}|{operation}_sum", seconds)
+
+    def start_flusher(self, get_client) -> None:
+        """Flush deltas to Redis every CACHE_METRICS_FLUSH_SECONDS; get_client returns
+        the sync Redis client or None when the cache is unavailable"""
+        if self._flush_thread is not None or CACHE_METRICS_FLUSH_SECONDS <= 0:
+            return
+
+        def _loop():
+            while True:
+                time.sleep(CACHE_METRICS_FLUSH_SECONDS)
+                self.flush(get_client())
+
+        self._flush_thread = threading.Thread(target=_loop, name="cache-metrics-flush", daemon=True)
+        self._flush_thread.start()
+
+    def flush(self, client) -> bool:
+        if client is None:
+            return False
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+        if not pending:
+            return True
+        try:
+            pipe = client.pipeline(transaction=False)
+            for field, amount in pending.items():
+                if field.endswith("_sum"):
+                    pipe.hincrbyfloat(CACHE_METRICS_KEY, field, amount)
+                else:
+                    pipe.hincrby(CACHE_METRICS_KEY, field, int(amount))
+            pipe.execute()
+            return True
+        except Exception as e:
+            # Put the deltas back so they are not lost
+            with self._lock:
+                for field, amount in pending.items():
+                    self._pending[field] += amount
+            logger.warning(f"Failed to flush cache metrics: {e}")
+            return False
+
+    def totals(self, client=None) -> Tuple[Dict[str, float], str]:
+        """(field -> value, scope) aggregated across workers when Redis is reachable"""
+        if client is not None and self.flush(client):
+            try:
+                raw = client.hgetall(CACHE_METRICS_KEY)
+                totals = {}
+                for field, value in raw.items():
+                    if isinstance(field, bytes):
+                        field = field.decode("utf-8")
+                    totals[field] = float(value)
+                return totals, "cluster"
+            except Exception as e:
+                logger.warning(f"Failed to read cache metrics: {e}")
+        with self._lock:
+            return dict(self._local), "process"
+
+
+def summarize(totals: Dict[str, float]) -> Dict[str, Any]:
+    """Per-namespace counters, hit rate and mean latencies for the stats endpoint"""
+    namespaces: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    for field, value in totals.items():
+        namespace, _, name = field.partition("|")
+        if name in COUNTERS:
+            namespaces[namespace][name] = int(value)
+        elif name in ("get_count", "set_count", "get_sum", "set_sum"):
+            namespaces[namespace][name] = value
+
+    summary = {}
+    for namespace, values in sorted(namespaces.items()):
+        entry = {name: values.get(name, 0) for name in COUNTERS}
+        lookups = entry["hits"] + entry["misses"]
+        entry["hit_rate"] = round(entry["hits"] / lookups, 4) if lookups else None
+        for operation in OPERATIONS:
+            count = values.get(f"{operation}_count", 0)
+            entry[f"{operation}_avg_ms"] = round(values.get(f"{operation}_sum", 0) / count * 1000, 3) if count else None
+        summary[namespace] = entry
+    return summary
+
+
+def render_prometheus(totals: Dict[str, float]) -> str:
+    """Prometheus text exposition (version 0.0.4) of the aggregated metrics"""
+    counters: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+    histograms: Dict[str, Dict[str, Dict[str, float]]] = {op: defaultdict(dict) for op in OPERATIONS}
+    for field, value in sorted(totals.items()):
+        parts = field.split("|")
+        namespace, name = parts[0], parts[1] if len(parts) > 1 else ""
+        if name in COUNTERS:
+            counters[name].append((namespace, value))
+            continue
+        operation, _, kind = name.partition("_")
+        if operation in histograms:
+            label = parts[2] if kind == "bucket" and len(parts) > 2 else kind
+            histograms[operation][namespace][label] = value
+
+    lines = []
+    for name in COUNTERS:
+        metric = f"pioneer_cache_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for namespace, value in counters.get(name, []):
+            lines.append(f'{metric}{{namespace="{namespace}"}} {int(value)}')
+    for operation in OPERATIONS:
+        metric = f"pioneer_cache_{operation}_duration_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for namespace, values in sorted(histograms[operation].items()):
+            for bound in [_bucket_label(b) for b in LATENCY_BUCKETS] + ["+Inf"]:
+                lines.append(f'{metric}_bucket{{namespace="{namespace}",le="{bound}"}} {int(values.get(bound, 0))}')
+            lines.append(f'{metric}_sum{{namespace="{namespace}"}} {values.get("sum", 0):.6f}')
+            lines.append(f'{metric}_count{{namespace="{namespace}"}} {int(values.get("count", 0))}')
+    return "\n".join(lines) + "\n"
+
+
+# Global metrics instance used by CacheService
+metrics = CacheMetrics()
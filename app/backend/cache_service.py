@@ -1,13 +1,154 @@
 import os
 import json
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
 import redis
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Callable, Tuple
 from datetime import timedelta
 import logging
 
+import cache_codecs
+from cache_metrics import metrics as cache_metrics, summarize as summarize_metrics
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover - async API degrades to cache misses
+    aioredis = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Redis key holding the resource catalog version counter
+CATALOG_VERSION_KEY = "catalog:version"
+CATALOG_NAMESPACE = "catalog"
+# Bumped whenever a resource translation completes; responses that embed translated
+# resources (e.g. the per-user dashboards) include it in their keys
+RESOURCE_TRANSLATIONS_NAMESPACE = "resource-translations"
+# Generation counters that predate the gen:{namespace} layout keep their key
+GENERATION_KEYS = {CATALOG_NAMESPACE: CATALOG_VERSION_KEY}
+
+# Key patterns removed by an explicit purge (routine invalidation only bumps the generation)
+PURGE_PATTERNS = [
+    "resources:*",
+    "categories:*",
+    "languages:*",
+    "recommendations:*"
+]
+
+# Stampede protection (see CacheService.get_or_compute)
+# Extra time an entry stays in Redis after its soft expiry so it can be served stale
+CACHE_STALE_GRACE_SECONDS = int(os.environ.get("CACHE_STALE_GRACE_SECONDS", "120"))
+# How long a recompute lease is held across workers before it is considered abandoned
+CACHE_LEASE_SECONDS = float(os.environ.get("CACHE_LEASE_SECONDS", "15"))
+# How long a worker waits for another worker's recompute before computing itself
+CACHE_LEASE_WAIT_SECONDS = float(os.environ.get("CACHE_LEASE_WAIT_SECONDS", "5"))
+# XFetch beta: >1 favours earlier recomputation, 0 disables probabilistic early expiry
+CACHE_EARLY_EXPIRY_BETA = float(os.environ.get("CACHE_EARLY_EXPIRY_BETA", "1.0"))
+
+# In-process L1 cache in front of Redis (see LocalCache)
+CACHE_L1_MAX_BYTES = int(os.environ.get("CACHE_L1_MAX_BYTES", str(32 * 1024 * 1024)))
+# Upper bound on how long an entry lives in L1; 0 disables the L1 layer
+CACHE_L1_TTL_SECONDS = float(os.environ.get("CACHE_L1_TTL_SECONDS", "30"))
+# How long a worker trusts its last-read generation numbers before asking Redis again
+CACHE_GENERATION_TTL_SECONDS = float(os.environ.get("CACHE_GENERATION_TTL_SECONDS", "1"))
+# Pub/sub channel used to tell other workers to drop L1 entries
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Connection pool size for the asyncio client used by async routes
+CACHE_ASYNC_MAX_CONNECTIONS = int(os.environ.get("CACHE_ASYNC_MAX_CONNECTIONS", "50"))
+
+# Circuit breaker around Redis (see CacheService._record_failure)
+CACHE_BREAKER_FAILURE_THRESHOLD = int(os.environ.get("CACHE_BREAKER_FAILURE_THRESHOLD", "3"))
+CACHE_BREAKER_PROBE_INTERVAL_SECONDS = float(os.environ.get("CACHE_BREAKER_PROBE_INTERVAL_SECONDS", "5"))
+
+# Bump when the key layout or cached payload shapes change
+CACHE_KEY_VERSION = "v2"
+
+_ENVELOPE_MARKER = "__swr__"
+
+# Delete the lease only if we still own it
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with per-entry TTLs and a byte budget.
+
+    Values are kept in their serialized form, which bounds memory accurately
+    and hands every caller a fresh object (routes may mutate what they get).
+    """
+    
+    def __init__(self, max_bytes: int = CACHE_L1_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+    
+    def set(self, key: str, payload: bytes, ttl: float) -> None:
+        size = len(payload)
+        if ttl <= 0 or size > self.max_bytes:
+            self.delete(key)
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                evicted = next(iter(self._entries))
+                self._remove(evicted)
+                cache_metrics.incr(evicted, "evictions")
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+
+class _Flight:
+    """One in-process recomputation of a key that other callers can wait on"""
+    __slots__ = ("done", "value", "ok")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.ok = False
+
+
 class CacheService:
     """Redis cache service for application caching"""
     
@@ -15,6 +156,23 @@ class CacheService:
         self.redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
         self.redis_client = None
         self.cache_enabled = True
+        self._local_generations: Dict[str, int] = {}
+        # namespace -> (generation, monotonic time it was read from Redis)
+        self._generation_cache: Dict[str, Tuple[int, float]] = {}
+        self.local = LocalCache()
+        self._pubsub_thread = None
+        # key -> _Flight for recomputations in progress in this process. The lock only
+        # guards the map; it is never held while a value is computed.
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        # Circuit breaker state
+        self._consecutive_failures = 0
+        self._breaker_open = False
+        self._breaker_lock = threading.Lock()
+        self._probe_thread = None
+        # asyncio clients are bound to the loop that created them; the main app
+        # has one loop, but the *_blocking recommender wrappers spin up their own
+        self._async_clients = weakref.WeakKeyDictionary()
         self._connect()
     
     def _connect(self):
@@ -22,7 +180,7 @@ class CacheService:
         try:
             self.redis_client = redis.from_url(
                 self.redis_url,
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
@@ -31,131 +189,707 @@ class CacheService:
             # Test connection
             self.redis_client.ping()
             logger.info(f"✅ Redis connected successfully at {self.redis_url}")
+            self._subscribe_invalidations()
+            self._start_metrics_flusher()
             
         except Exception as e:
-            logger.warning(f"⚠️ Redis connection failed: {e}. Caching disabled.")
-            self.cache_enabled = False
-            self.redis_client = None
+            # Start with the breaker open; the probe thread keeps retrying so
+            # caching comes back once Redis does
+            logger.warning(f"⚠️ Redis connection failed: {e}. Caching disabled until Redis is reachable.")
+            self._open_breaker()
+    
+    def _start_metrics_flusher(self):
+        cache_metrics.start_flusher(lambda: self.redis_client if self.is_available() else None)
     
     def is_available(self) -> bool:
-        """Check if Redis cache is available"""
-        if not self.cache_enabled or not self.redis_client:
-            return False
-        
+        """Check if Redis cache is available (no round-trip; see the circuit breaker below)"""
+        return self.cache_enabled and self.redis_client is not None and not self._breaker_open
+    
+    # Circuit breaker: Redis errors are counted inline by every operation. After
+    # CACHE_BREAKER_FAILURE_THRESHOLD consecutive failures the breaker opens and
+    # all cache calls short-circuit to misses, while a background thread pings
+    # Redis every CACHE_BREAKER_PROBE_INTERVAL_SECONDS and closes it again.
+    
+    def _record_success(self):
+        if self._consecutive_failures:
+            self._consecutive_failures = 0
+    
+    def _record_failure(self, error: Exception):
+        with self._breaker_lock:
+            self._consecutive_failures += 1
+            if self._breaker_open or self._consecutive_failures < CACHE_BREAKER_FAILURE_THRESHOLD:
+                return
+        logger.warning(
+            f"Redis failed {self._consecutive_failures} times in a row ({error}); "
+            f"opening cache circuit breaker"
+        )
+        self._open_breaker()
+    
+    def _open_breaker(self):
+        with self._breaker_lock:
+            self._breaker_open = True
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(
+                target=self._probe_until_healthy, name="cache-breaker-probe", daemon=True
+            )
+            self._probe_thread.start()
+    
+    def _probe_until_healthy(self):
+        while True:
+            time.sleep(CACHE_BREAKER_PROBE_INTERVAL_SECONDS)
+            try:
+                if self.redis_client is None:
+                    self.redis_client = redis.from_url(
+                        self.redis_url,
+                        decode_responses=False,
+                        socket_connect_timeout=5,
+                        socket_timeout=5,
+                        retry_on_timeout=True,
+                        health_check_interval=30
+                    )
+                self.redis_client.ping()
+            except Exception as e:
+                logger.debug(f"Cache breaker probe failed: {e}")
+                continue
+            
+            # Invalidations published while we were cut off were missed
+            self._generation_cache.clear()
+            self.local.clear()
+            if self._pubsub_thread is None:
+                self._subscribe_invalidations()
+            self._start_metrics_flusher()
+            with self._breaker_lock:
+                self._consecutive_failures = 0
+                self._breaker_open = False
+            logger.info("✅ Redis reachable again; cache circuit breaker closed")
+            return
+    
+    def _subscribe_invalidations(self):
+        """Listen for invalidations published by other workers and drop L1 entries"""
+        if CACHE_L1_TTL_SECONDS <= 0:
+            return
         try:
-            self.redis_client.ping()
-            return True
-        except Exception:
-            logger.warning("Redis ping failed, disabling cache temporarily")
-            return False
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CACHE_INVALIDATION_CHANNEL: self._on_invalidation})
+            self._pubsub_thread = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_pubsub_error
+            )
+        except Exception as e:
+            logger.warning(f"Cache invalidation subscription failed: {e}. L1 entries will expire on TTL only.")
+    
+    def _on_invalidation(self, message: Dict[str, Any]):
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", "replace")
+        if data and data.startswith("key:"):
+            self.local.delete(data[4:])
+        elif data and data.startswith("gen:"):
+            # Keys embed generations, so L1 entries of the old generation are
+            # simply never read again; only the cached number must be dropped
+            self._generation_cache.pop(data[4:], None)
+        else:
+            self._generation_cache.clear()
+            self.local.clear()
+    
+    def _on_pubsub_error(self, error, pubsub, thread):
+        logger.warning(f"Cache invalidation listener error: {error}")
+        # Without invalidation messages L1 could serve stale data; play safe
+        self._generation_cache.clear()
+        self.local.clear()
+    
+    def _publish_invalidation(self, message: str):
+        if not self.is_available():
+            return
+        try:
+            self.redis_client.publish(CACHE_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Failed to publish cache invalidation: {e}")
+    
+    @staticmethod
+    def _encode(key: str, value: Any) -> bytes:
+        """Serialize with the codec configured for the key's namespace (see cache_codecs)"""
+        return cache_codecs.encode(value, cache_codecs.codec_for_key(key))
+    
+    @staticmethod
+    def _decode(payload: bytes) -> Any:
+        return cache_codecs.decode(payload)
+    
+    def _decode_remote(self, key: str, payload: bytes) -> Optional[Any]:
+        """Decode a value read from Redis and keep it in L1; undecodable entries are misses"""
+        try:
+            value = self._decode(payload)
+        except Exception as e:
+            # Not a Redis failure (e.g. written with a codec this worker lacks)
+            logger.warning(f"Cache entry {key} could not be decoded, treating as miss: {e}")
+            cache_metrics.incr(key, "errors")
+            cache_metrics.incr(key, "misses")
+            return None
+        cache_metrics.incr(key, "hits")
+        self.local.set(key, payload, CACHE_L1_TTL_SECONDS)
+        return value
     
     def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         """Set a cache value with TTL (default 5 minutes)"""
+        try:
+            serialized_value = self._encode(key, value)
+        except Exception as e:
+            logger.error(f"Cache SET failed for key {key}: {e}")
+            return False
+        
+        self.local.set(key, serialized_value, min(ttl, CACHE_L1_TTL_SECONDS))
         if not self.is_available():
             return False
         
         try:
-            # Serialize value to JSON
-            serialized_value = json.dumps(value, default=str)
+            started = time.perf_counter()
             self.redis_client.setex(key, timedelta(seconds=ttl), serialized_value)
+            cache_metrics.observe(key, "set", time.perf_counter() - started)
+            cache_metrics.incr(key, "sets")
+            self._record_success()
             logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
             return True
             
         except Exception as e:
+            self._record_failure(e)
+            cache_metrics.incr(key, "errors")
             logger.error(f"Cache SET failed for key {key}: {e}")
             return False
     
     def get(self, key: str) -> Optional[Any]:
-        """Get a cache value"""
+        """Get a cache value (in-process L1 first, then Redis)"""
+        value = self.local.get(key)
+        if value is not None:
+            logger.debug(f"Cache L1 HIT: {key}")
+            cache_metrics.incr(key, "hits")
+            cache_metrics.incr(key, "l1_hits")
+            return self._decode(value)
+        
         if not self.is_available():
+            cache_metrics.incr(key, "misses")
             return None
         
         try:
+            started = time.perf_counter()
             value = self.redis_client.get(key)
-            if value is None:
-                logger.debug(f"Cache MISS: {key}")
-                return None
-            
-            # Deserialize from JSON
-            deserialized_value = json.loads(value)
-            logger.debug(f"Cache HIT: {key}")
-            return deserialized_value
-            
+            cache_metrics.observe(key, "get", time.perf_counter() - started)
+            self._record_success()
         except Exception as e:
+            self._record_failure(e)
+            cache_metrics.incr(key, "errors")
+            cache_metrics.incr(key, "misses")
             logger.error(f"Cache GET failed for key {key}: {e}")
             return None
+        
+        if value is None:
+            cache_metrics.incr(key, "misses")
+        deserialized_value = self._decode_remote(key, value) if value is not None else None
+        logger.debug(f"Cache {'HIT' if deserialized_value is not None else 'MISS'}: {key}")
+        return deserialized_value
     
     def delete(self, key: str) -> bool:
         """Delete a cache key"""
+        self.local.delete(key)
         if not self.is_available():
             return False
         
         try:
             result = self.redis_client.delete(key)
+            self._publish_invalidation(f"key:{key}")
             logger.debug(f"Cache DELETE: {key} (existed: {bool(result)})")
             return bool(result)
             
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Cache DELETE failed for key {key}: {e}")
             return False
     
-    def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching a pattern"""
+    def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """Delete all keys matching a pattern.
+
+        Walks the keyspace incrementally with SCAN and frees keys with UNLINK
+        (non-blocking delete) in pipelined batches, so Redis keeps serving other
+        clients. Prefer bump_generation() for routine invalidation; this is for
+        admin-driven bulk cleanup.
+        """
+        self.local.clear()
         if not self.is_available():
             return 0
         
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                deleted = self.redis_client.delete(*keys)
-                logger.debug(f"Cache DELETE PATTERN: {pattern} ({deleted} keys deleted)")
-                return deleted
-            return 0
+            deleted = 0
+            batch = []
+            for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += self._unlink_batch(batch)
+                    batch = []
+            if batch:
+                deleted += self._unlink_batch(batch)
+            self._publish_invalidation(f"pattern:{pattern}")
+            logger.debug(f"Cache DELETE PATTERN: {pattern} ({deleted} keys deleted)")
+            return deleted
             
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Cache DELETE PATTERN failed for pattern {pattern}: {e}")
             return 0
     
-    def invalidate_resources_cache(self):
-        """Invalidate all resource-related cache entries"""
-        patterns = [
-            "resources:*",
-            "categories:*", 
-            "languages:*",
-            "recommendations:*"
-        ]
+    def _unlink_batch(self, keys: List[str]) -> int:
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.unlink(key)
+        return sum(int(n or 0) for n in pipe.execute())
+    
+    def _start_flight(self, key: str) -> Tuple[_Flight, bool]:
+        """(flight, is_leader): the first caller for a key leads, later ones follow"""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+    
+    def _finish_flight(self, key: str, flight: _Flight) -> None:
+        with self._flights_lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+    
+    def _acquire_lease(self, key: str) -> Optional[str]:
+        """Try to take the cross-worker recompute lease for key.
+
+        Returns a token on success, "" when Redis is unavailable (no cross-worker
+        coordination possible) and None if another worker holds the lease.
+        """
+        if not self.is_available():
+            return ""
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis_client.set(f"lease:{key}", token, nx=True, px=int(CACHE_LEASE_SECONDS * 1000))
+            return token if acquired else None
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Cache lease failed for key {key}: {e}")
+            return ""
+    
+    def _release_lease(self, key: str, token: str) -> None:
+        if not token or not self.is_available():
+            return
+        try:
+            self.redis_client.eval(_RELEASE_LEASE_SCRIPT, 1, f"lease:{key}", token)
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Cache lease release failed for key {key}: {e}")
+    
+    @staticmethod
+    def _unwrap(raw: Any) -> Tuple[Any, float, float]:
+        """Return (value, soft_expiry, compute_seconds) for a stored entry"""
+        if isinstance(raw, dict) and raw.get(_ENVELOPE_MARKER):
+            return raw.get("v"), float(raw.get("exp", 0)), float(raw.get("d", 0))
+        # Plain values written by cache.set never go stale early
+        return raw, math.inf, 0.0
+    
+    @staticmethod
+    def _is_fresh(soft_expiry: float, compute_seconds: float) -> bool:
+        """XFetch probabilistic early expiry: recompute slightly before the soft
+        expiry with a probability that grows as it approaches, scaled by how
+        long the value takes to compute."""
+        if soft_expiry == math.inf:
+            return True
+        jitter = 0.0
+        if CACHE_EARLY_EXPIRY_BETA > 0 and compute_seconds > 0:
+            jitter = -compute_seconds * CACHE_EARLY_EXPIRY_BETA * math.log(max(random.random(), 1e-12))
+        return time.time() + jitter < soft_expiry
+    
+    @staticmethod
+    def _envelope(value: Any, ttl: int, compute_seconds: float) -> Dict[str, Any]:
+        return {
+            _ENVELOPE_MARKER: 1,
+            "v": value,
+            "exp": time.time() + ttl,
+            "d": round(compute_seconds, 4),
+        }
+    
+    def _store_envelope(self, key: str, value: Any, ttl: int, compute_seconds: float) -> None:
+        self.set(key, self._envelope(value, ttl, compute_seconds), ttl + CACHE_STALE_GRACE_SECONDS)
+    
+    def _compute_and_store(self, key: str, compute: Callable[[], Any], ttl: int) -> Any:
+        started = time.perf_counter()
+        value = compute()
+        self._store_envelope(key, value, ttl, time.perf_counter() - started)
+        return value
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: int = 300) -> Tuple[Any, bool]:
+        """Return (value, was_cached), recomputing at most once per key at a time.
+
+        - Fresh hit: returned directly.
+        - Stale hit (past soft expiry, or picked for early expiry): one caller
+          leads the refresh (in-process flight plus the Redis SET NX lease);
+          everyone else keeps getting the stale value meanwhile.
+        - Miss: the first caller in this process computes; the others wait on its
+          flight for up to CACHE_LEASE_WAIT_SECONDS and then compute themselves.
+          Other workers wait briefly on the Redis lease for the winner's value.
+        
+        No lock is held while compute() runs, so computes may nest
+        get_or_compute calls on other keys without risking a deadlock.
+        Exceptions from compute propagate unless a stale value can be served.
+        """
+        raw = self.get(key)
+        if raw is not None:
+            value, soft_expiry, compute_seconds = self._unwrap(raw)
+            if self._is_fresh(soft_expiry, compute_seconds):
+                return value, True
+            
+            # Stale-while-revalidate: only one caller refreshes
+            flight, leader = self._start_flight(key)
+            if not leader:
+                return value, True
+            try:
+                token = self._acquire_lease(key)
+                if token is None:
+                    return value, True
+                try:
+                    return self._compute_and_store(key, compute, ttl), False
+                except Exception as e:
+                    logger.warning(f"Cache refresh failed for key {key}, serving stale value: {e}")
+                    return value, True
+                finally:
+                    self._release_lease(key, token)
+            finally:
+                self._finish_flight(key, flight)
+        
+        # Miss: single-flight within this process
+        flight, leader = self._start_flight(key)
+        if not leader:
+            if flight.done.wait(CACHE_LEASE_WAIT_SECONDS) and flight.ok:
+                return flight.value, True
+            if not flight.done.is_set():
+                logger.warning(f"Timed out waiting for in-process recompute of {key}; computing locally")
+            return self._compute_and_store(key, compute, ttl), False
+        
+        try:
+            raw = self.get(key)
+            if raw is not None:
+                flight.value, flight.ok = self._unwrap(raw)[0], True
+                return flight.value, True
+            
+            token = self._acquire_lease(key)
+            if token is None:
+                # Another worker is computing; wait for its result
+                deadline = time.monotonic() + CACHE_LEASE_WAIT_SECONDS
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    raw = self.get(key)
+                    if raw is not None:
+                        flight.value, flight.ok = self._unwrap(raw)[0], True
+                        return flight.value, True
+                logger.warning(f"Timed out waiting for recompute of {key}; computing locally")
+            try:
+                flight.value = self._compute_and_store(key, compute, ttl)
+                flight.ok = True
+                return flight.value, False
+            finally:
+                if token:
+                    self._release_lease(key, token)
+        finally:
+            self._finish_flight(key, flight)
+    
+    # ------------------------------------------------------------------
+    # asyncio API for async routes: same keys, L1, codec and circuit breaker
+    # as the sync methods above, but never blocks the event loop on Redis.
+    # ------------------------------------------------------------------
+    
+    def _get_async_client(self):
+        if aioredis is None or not self.is_available():
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = aioredis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                health_check_interval=30,
+                max_connections=CACHE_ASYNC_MAX_CONNECTIONS
+            )
+            self._async_clients[loop] = client
+        return client
+    
+    async def aget(self, key: str) -> Optional[Any]:
+        """Async get (in-process L1 first, then Redis)"""
+        value = self.local.get(key)
+        if value is not None:
+            cache_metrics.incr(key, "hits")
+            cache_metrics.incr(key, "l1_hits")
+            return self._decode(value)
         
-        total_deleted = 0
-        for pattern in patterns:
-            total_deleted += self.delete_pattern(pattern)
+        client = self._get_async_client()
+        if client is None:
+            cache_metrics.incr(key, "misses")
+            return None
         
-        logger.info(f"Invalidated {total_deleted} resource cache entries")
-        return total_deleted
+        try:
+            started = time.perf_counter()
+            value = await client.get(key)
+            cache_metrics.observe(key, "get", time.perf_counter() - started)
+            self._record_success()
+        except Exception as e:
+            self._record_failure(e)
+            cache_metrics.incr(key, "errors")
+            cache_metrics.incr(key, "misses")
+            logger.error(f"Cache AGET failed for key {key}: {e}")
+            return None
+        
+        if value is None:
+            cache_metrics.incr(key, "misses")
+            return None
+        return self._decode_remote(key, value)
+    
+    async def aset(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """Async set with TTL (default 5 minutes)"""
+        try:
+            serialized_value = self._encode(key, value)
+        except Exception as e:
+            logger.error(f"Cache ASET failed for key {key}: {e}")
+            return False
+        
+        self.local.set(key, serialized_value, min(ttl, CACHE_L1_TTL_SECONDS))
+        client = self._get_async_client()
+        if client is None:
+            return False
+        
+        try:
+            started = time.perf_counter()
+            await client.set(key, serialized_value, ex=ttl)
+            cache_metrics.observe(key, "set", time.perf_counter() - started)
+            cache_metrics.incr(key, "sets")
+            self._record_success()
+            return True
+            
+        except Exception as e:
+            self._record_failure(e)
+            cache_metrics.incr(key, "errors")
+            logger.error(f"Cache ASET failed for key {key}: {e}")
+            return False
+    
+    async def aget_generation(self, namespace: str) -> int:
+        """Async variant of get_generation()"""
+        cached = self._generation_cache.get(namespace)
+        if cached is not None and time.monotonic() - cached[1] < CACHE_GENERATION_TTL_SECONDS:
+            return cached[0]
+        
+        local = self._local_generations.get(namespace, 0)
+        client = self._get_async_client()
+        if client is None:
+            return local
+        
+        try:
+            value = await client.get(self._generation_key(namespace))
+            generation = int(value) if value is not None else 0
+            self._generation_cache[namespace] = (generation, time.monotonic())
+            return generation
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Cache AGET failed for {namespace} generation: {e}")
+            return local
+    
+    async def abump_generation(self, namespace: str) -> int:
+        """Async variant of bump_generation()"""
+        local = self._local_generations.get(namespace, 0) + 1
+        self._local_generations[namespace] = local
+        self._generation_cache.pop(namespace, None)
+        client = self._get_async_client()
+        if client is None:
+            return local
+        
+        try:
+            generation = int(await client.incr(self._generation_key(namespace)))
+            self._generation_cache[namespace] = (generation, time.monotonic())
+            await client.publish(CACHE_INVALIDATION_CHANNEL, f"gen:{namespace}")
+            logger.info(f"Cache generation for {namespace} bumped to {generation}")
+            return generation
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Failed to bump {namespace} generation: {e}")
+            return local
+    
+    async def aget_catalog_version(self) -> int:
+        return await self.aget_generation(CATALOG_NAMESPACE)
+    
+    async def ainvalidate_resources_cache(self, purge: bool = False) -> int:
+        """Async variant of invalidate_resources_cache()"""
+        generation = await self.abump_generation(CATALOG_NAMESPACE)
+        if purge:
+            # SCAN/UNLINK walks are long-running; keep them off the event loop
+            for pattern in PURGE_PATTERNS:
+                await asyncio.to_thread(self.delete_pattern, pattern)
+        logger.info(f"Invalidated resource cache (catalog generation {generation})")
+        return generation
+    
+    def _generation_key(self, namespace: str) -> str:
+        return GENERATION_KEYS.get(namespace, f"gen:{namespace}")
+    
+    def get_generation(self, namespace: str) -> int:
+        """Current generation number of a cache namespace.
+
+        Keys embed the generation of the namespace they belong to, so bumping it
+        orphans every existing entry at once; orphans expire on their own TTLs.
+        Falls back to a process-local counter when Redis is unavailable.
+        """
+        cached = self._generation_cache.get(namespace)
+        if cached is not None and time.monotonic() - cached[1] < CACHE_GENERATION_TTL_SECONDS:
+            return cached[0]
+        
+        local = self._local_generations.get(namespace, 0)
+        if not self.is_available():
+            return local
+        
+        try:
+            value = self.redis_client.get(self._generation_key(namespace))
+            generation = int(value) if value is not None else 0
+            self._generation_cache[namespace] = (generation, time.monotonic())
+            return generation
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Cache GET failed for {namespace} generation: {e}")
+            return local
+    
+    def bump_generation(self, namespace: str) -> int:
+        """Invalidate a namespace with a single INCR"""
+        local = self._local_generations.get(namespace, 0) + 1
+        self._local_generations[namespace] = local
+        self._generation_cache.pop(namespace, None)
+        if not self.is_available():
+            return local
+        
+        try:
+            generation = int(self.redis_client.incr(self._generation_key(namespace)))
+            self._generation_cache[namespace] = (generation, time.monotonic())
+            self._publish_invalidation(f"gen:{namespace}")
+            logger.info(f"Cache generation for {namespace} bumped to {generation}")
+            return generation
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Failed to bump {namespace} generation: {e}")
+            return local
+    
+    def get_catalog_version(self) -> int:
+        """Current resource catalog version, bumped whenever resources change.
+
+        Include it in keys for data derived from the catalog (e.g. LLM rankings)
+        so entries from an older catalog are never served.
+        """
+        return self.get_generation(CATALOG_NAMESPACE)
+    
+    def bump_catalog_version(self) -> int:
+        """Advance the catalog version (call after resources are imported/published)"""
+        return self.bump_generation(CATALOG_NAMESPACE)
+    
+    def invalidate_resources_cache(self, purge: bool = False) -> int:
+        """Invalidate all resource-related cache entries.
+
+        Bumps the catalog generation, which every resources/categories/languages/
+        recommendations key embeds. With purge=True the orphaned entries are also
+        deleted right away (SCAN + UNLINK) instead of waiting for their TTLs.
+        Returns the new catalog generation.
+        """
+        generation = self.bump_catalog_version()
+        if purge:
+            total_deleted = 0
+            for pattern in PURGE_PATTERNS:
+                total_deleted += self.delete_pattern(pattern)
+            logger.info(f"Purged {total_deleted} resource cache entries")
+        
+        logger.info(f"Invalidated resource cache (catalog generation {generation})")
+        return generation
+    
+    def get_metrics_totals(self) -> Tuple[Dict[str, float], str]:
+        """Raw hit/miss/latency totals and their scope ("cluster" or "process")"""
+        return cache_metrics.totals(self.redis_client if self.is_available() else None)
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        totals, scope = self.get_metrics_totals()
+        namespaces = summarize_metrics(totals)
+        hits = sum(ns["hits"] for ns in namespaces.values())
+        lookups = hits + sum(ns["misses"] for ns in namespaces.values())
+        stats = {
+            "cache_hit_rate": round(hits / lookups, 4) if lookups else None,
+            "metrics_scope": scope,
+            "namespaces": namespaces,
+            "local_cache": self.local.stats()
+        }
+        
         if not self.is_available():
-            return {"status": "disabled", "error": "Redis not available"}
+            stats.update({
+                "status": "disabled",
+                "error": "Redis not available",
+                "circuit_breaker": "open" if self._breaker_open else "closed"
+            })
+            return stats
         
         try:
-            info = self.redis_client.info('memory')
-            stats = {
+            # One INFO call covers the memory, clients and stats sections
+            info = self.redis_client.info()
+            stats.update({
                 "status": "connected",
                 "used_memory": info.get('used_memory_human', 'unknown'),
-                "connected_clients": self.redis_client.info('clients').get('connected_clients', 0),
-                "total_commands_processed": self.redis_client.info('stats').get('total_commands_processed', 0),
-                "cache_hit_rate": "N/A"  # Would need to implement hit/miss tracking
-            }
+                "connected_clients": info.get('connected_clients', 0),
+                "total_commands_processed": info.get('total_commands_processed', 0),
+                "redis_keyspace_hits": info.get('keyspace_hits', 0),
+                "redis_keyspace_misses": info.get('keyspace_misses', 0),
+                "redis_evicted_keys": info.get('evicted_keys', 0)
+            })
             return stats
             
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Failed to get cache stats: {e}")
-            return {"status": "error", "error": str(e)}
+            stats.update({"status": "error", "error": str(e)})
+            return stats
 
 # Global cache instance
 cache = CacheService()
 
 # Helper functions for common cache operations
+def make_cache_key(
+    namespace: str,
+    params: Optional[Dict[str, Any]] = None,
+    catalog_scoped: bool = True,
+    generation: Optional[int] = None
+) -> str:
+    """Build a cache key that is identical across workers and restarts.
+
+    Parameters are canonicalized (None values dropped, keys sorted, compact JSON)
+    and digested with BLAKE2b, so the same query maps to the same key in every
+    process - unlike the built-in hash(), which is salted per interpreter.
+    Catalog-scoped keys embed the catalog version, so entries written before a
+    resource change are never read again. Async callers should pass
+    generation=await cache.aget_catalog_version() to avoid a blocking lookup.
+    
+    Example: resources:search:v2:g14:3f2a9c0d41b7e8a65c1d2e70
+    """
+    parts = [namespace, CACHE_KEY_VERSION]
+    if catalog_scoped:
+        if generation is None:
+            generation = cache.get_catalog_version()
+        parts.append(f"g{generation}")
+    filtered_params = {k: v for k, v in (params or {}).items() if v is not None}
+    if filtered_params:
+        canonical = json.dumps(filtered_params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        parts.append(hashlib.blake2b(canonical.encode("utf-8"), digest_size=12).hexdigest())
+    return ":".join(parts)
+
+def user_cache_namespace(user_id: Any) -> str:
+    """Generation namespace for one user's cached responses; bump it when their data changes"""
+    return f"user:{user_id}"
+
 def get_resources_cache_key(
     category: Optional[str] = None,
     subcategory: Optional[str] = None,
@@ -164,10 +898,11 @@ def get_resources_cache_key(
     location: Optional[str] = None,
     audience_type: Optional[str] = None,
     page: int = 1,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = None
 ) -> str:
     """Generate cache key for resources search"""
-    params = {
+    return make_cache_key("resources:search", {
         "category": category,
         "subcategory": subcategory,
         "search": search,
@@ -175,23 +910,36 @@ def get_resources_cache_key(
         "location": location,
         "audience_type": audience_type,
         "page": page,
-        "limit": limit
-    }
-    # Remove None values and create a deterministic key
-    filtered_params = {k: v for k, v in params.items() if v is not None}
-    param_string = "&".join(f"{k}={v}" for k, v in sorted(filtered_params.items()))
-    return f"resources:search:{hash(param_string) % 1000000}"  # Limit hash size
+        "limit": limit,
+        "cursor": cursor
+    })
+
+def get_resources_count_cache_key(
+    category: Optional[str] = None,
+    subcategory: Optional[str] = None,
+    search: Optional[str] = None,
+    language: Optional[str] = None,
+    location: Optional[str] = None,
+    audience_type: Optional[str] = None
+) -> str:
+    """Cache key for the total match count of a resources search (independent of page/cursor)"""
+    return make_cache_key("resources:count", {
+        "category": category,
+        "subcategory": subcategory,
+        "search": search,
+        "language": language,
+        "location": location,
+        "audience_type": audience_type
+    })
 
 def get_categories_cache_key() -> str:
     """Cache key for categories list"""
-    return "categories:list"
+    return make_cache_key("categories:list")
 
 def get_languages_cache_key() -> str:
     """Cache key for languages list"""
-    return "languages:list"
-
-def get_resource_detail_cache_key(resource_id: str) -> str:
-    """Cache key for individual resource details"""
-    return f"resources:detail:{resource_id}"
+    return make_cache_key("languages:list")
 
- 
\ No newline at end of file
+def get_resource_detail_cache_key(resource_id: str, language: str = 'en') -> str:
+    """Cache key for individual resource details in a given language"""
+    return make_cache_key("resources:detail", {"id": resource_id, "language": language})
@@ -1,8 +1,8 @@
 import os
 import logging
 from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, ARRAY, REAL
+from sqlalchemy.orm import declarative_base, sessionmaker, relationship, deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 
@@ -81,6 +81,12 @@ class Resource(Base):
     
     # Full-text search vector for PostgreSQL FTS
     search_vector = Column(TSVECTOR)
+    
+    # Precomputed recommender keyword features (see resource_relevance.py); NULL = not yet computed
+    relevance_flags = Column(Integer)
+    # Local text embedding for semantic ranking (see resource_embeddings.py).
+    # Deferred so list/search queries do not load it; the recommender undefers it.
+    embedding = deferred(Column(ARRAY(REAL)))
 
     # Add indexes for common query patterns
     __table_args__ = (
@@ -94,6 +100,10 @@ class Resource(Base):
         Index('idx_resource_published_ready', 'published', 'ready'),
         # Index for translation status
         Index('idx_resource_translation_status', 'translation_status'),
+        # GIN index for ranked full-text search over search_vector
+        Index('idx_resources_search_vector', 'search_vector', postgresql_using='gin'),
+        # Keyset pagination order: priority DESC NULLS LAST, resource_name, id
+        Index('idx_resource_priority_name_id', text('priority DESC NULLS LAST'), 'resource_name', 'id'),
     )
 
 class Category(Base):
@@ -165,6 +175,52 @@ class PriorityCategorySubtitleTranslation(Base):
         Index('idx_category_subtitle_user_category', 'user_id', 'category_key'),
     )
 
+class TranslationMemory(Base):
+    """Content-addressed translations shared by resources, user descriptions and subtitles"""
+    __tablename__ = "translation_memory"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_hash = Column(String(64), nullable=False)  # sha256 hex of the source text
+    source_language = Column(String(10), nullable=False, default='en')
+    language_code = Column(String(10), nullable=False)
+    provider = Column(String(32), nullable=False, default='google')  # translation_providers name
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('source_hash', 'source_language', 'language_code', 'provider', name='uq_translation_memory_source_provider'),
+    )
+
+class TranslationJob(Base):
+    """Durable background translation work, claimed by translation_worker with SKIP LOCKED"""
+    __tablename__ = "translation_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(40), nullable=False)  # user_description, category_subtitles
+    subject_id = Column(String(100), nullable=False)  # e.g. the user id
+    language_code = Column(String(10), nullable=False)
+    payload = Column(JSONB)
+    dedupe_key = Column(String(200), nullable=False)
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, completed, failed, superseded
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # At most one queued job per (kind, subject, language); running jobs may have a queued successor
+        Index('uq_translation_jobs_queued_dedupe', 'dedupe_key', unique=True, postgresql_where=text("status = 'queued'")),
+        Index('idx_translation_jobs_status_run_after', 'status', 'run_after'),
+    )
+
 class ScreeningResponse(Base):
     __tablename__ = "screening_responses"
 
@@ -116,6 +116,66 @@ def initialize_database():
             import traceback
             logger.error(traceback.format_exc())
 
+        # Run translation memory migration (idempotent)
+        logger.info("Running translation memory migration...")
+        try:
+            from migration_add_translation_memory import run_migration
+            run_migration()
+            logger.info("✅ Translation memory migration completed")
+        except Exception as e:
+            logger.error(f"⚠️  Translation memory migration failed: {e}")
+            logger.error("Translations will call the translator for every string until this succeeds")
+            import traceback
+            logger.error(traceback.format_exc())
+
+        # Run translation jobs migration (idempotent)
+        logger.info("Running translation jobs migration...")
+        try:
+            from migration_add_translation_jobs import run_migration
+            run_migration()
+            logger.info("✅ Translation jobs migration completed")
+        except Exception as e:
+            logger.error(f"⚠️  Translation jobs migration failed: {e}")
+            logger.error("Background translations for user roadmaps and subtitles will not run until this succeeds")
+            import traceback
+            logger.error(traceback.format_exc())
+
+        # Run resource search index migration (idempotent)
+        logger.info("Running resource search index migration...")
+        try:
+            from migration_add_search_indexes import run_migration
+            run_migration()
+            logger.info("✅ Resource search index migration completed")
+        except Exception as e:
+            logger.error(f"⚠️  Resource search index migration failed: {e}")
+            logger.error("Resource search will fall back to slower scans until indexes exist")
+            import traceback
+            logger.error(traceback.format_exc())
+
+        # Run resource relevance flags migration (idempotent)
+        logger.info("Running resource relevance flags migration...")
+        try:
+            from migration_add_relevance_flags import run_migration
+            run_migration()
+            logger.info("✅ Resource relevance flags migration completed")
+        except Exception as e:
+            logger.error(f"⚠️  Resource relevance flags migration failed: {e}")
+            logger.error("Recommendations will compute relevance flags on the fly until this succeeds")
+            import traceback
+            logger.error(traceback.format_exc())
+
+        # Run resource embeddings migration (idempotent)
+        logger.info("Running resource embeddings migration...")
+        try:
+            from migration_add_resource_embeddings import run_migration
+            run_migration()
+            logger.info("✅ Resource embeddings migration completed")
+        except Exception as e:
+            logger.error(f"⚠️  Resource embeddings migration failed: {e}")
+            logger.error("Semantic ranking will embed resources on the fly until this succeeds")
+            import traceback
+            logger.error(traceback.format_exc())
+
         # Run new languages schema migration (idempotent - extends language_code columns)
         logger.info("Running new languages schema migration (extending language_code columns)...")
         try:
@@ -226,6 +286,21 @@ def initialize_database():
         logger.error(f"Database initialization failed: {e}")
         return False
 
+def start_translation_worker():
+    """Run translation_worker.py as its own process next to the API"""
+    if os.environ.get("TRANSLATION_WORKER_PROCESS", "true").lower() != "true":
+        logger.info("TRANSLATION_WORKER_PROCESS=false; expecting the translation worker to run elsewhere")
+        return
+    if os.environ.get("TRANSLATION_WORKER_EMBEDDED", "false").lower() == "true":
+        logger.info("Translation worker runs embedded in the API process")
+        return
+    
+    try:
+        worker = subprocess.Popen([sys.executable, str(backend_dir / "translation_worker.py")], cwd=str(backend_dir))
+        logger.info(f"Started translation worker process (pid {worker.pid})")
+    except Exception as e:
+        logger.error(f"Failed to start translation worker: {e}")
+
 def start_application():
     """Start the FastAPI application"""
     logger.info("Starting FastAPI application…")
@@ -279,7 +354,10 @@ def main():
     # Step 2: Initialize database
     initialize_database()
     
-    # Step 3: Start the application
+    # Step 3: Start the background translation worker
+    start_translation_worker()
+    
+    # Step 4: Start the application
     start_application()
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from rate_limit_service import limiter, get_rate_limit_status
+from blocking_io import start_loop_monitor, loop_monitor_stats
+from translation_worker import start_embedded_worker
 
 # Configure logging for debugging the recommender
 logging.getLogger('recommender_llm').setLevel(logging.DEBUG)
@@ -58,6 +60,16 @@ app.include_router(bookmarks.router, prefix="/api/bookmarks", tags=["bookmarks"]
 app.include_router(onboarding.router, prefix="/api/onboarding", tags=["onboarding"])
 app.include_router(developer.router, prefix="/api/developer", tags=["developer"])
 
+@app.on_event("startup")
+async def start_event_loop_monitor():
+    """Log any event loop stall longer than LOOP_STALL_THRESHOLD_MS"""
+    start_loop_monitor()
+
+@app.on_event("startup")
+def start_translation_worker():
+    """Process queued translations in-process unless TRANSLATION_WORKER_EMBEDDED=false"""
+    start_embedded_worker()
+
 @app.get("/api", summary="API Information")
 def api_info():
     """API information endpoint"""
@@ -86,6 +98,7 @@ def health_runtime():
     return {
         "started_at": APP_START_TIME.isoformat(),
         "uptime_seconds": int(uptime_seconds),
+        "event_loop": loop_monitor_stats(),
     }
 
 @app.get("/api/health/rate-limit", summary="Rate limiting configuration status")
@@ -0,0 +1,52 @@
+"""
+Migration: Add relevance_flags column to resources
+
+Stores the recommender's keyword features (refugee, affordable housing,
+cultural community) as a bitmask computed once per resource, so per-user
+filtering no longer re-scans names and summaries. Backfills rows that have
+no flags yet. Safe to run repeatedly.
+"""
+import logging
+from sqlalchemy import text
+from database import engine
+from resource_relevance import compute_relevance_flags
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+def run_migration():
+    """Add relevance_flags column and backfill missing values"""
+    logger.info("Starting migration: Add relevance_flags to resources")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("ALTER TABLE resources ADD COLUMN IF NOT EXISTS relevance_flags INTEGER"))
+            
+            rows = conn.execute(text(
+                "SELECT id, resource_name, summary FROM resources WHERE relevance_flags IS NULL"
+            )).fetchall()
+            
+            updates = [
+                {"id": row.id, "flags": compute_relevance_flags(row.resource_name, row.summary)}
+                for row in rows
+            ]
+            for start in range(0, len(updates), BATCH_SIZE):
+                conn.execute(
+                    text("UPDATE resources SET relevance_flags = :flags WHERE id = :id"),
+                    updates[start:start + BATCH_SIZE]
+                )
+            
+            conn.commit()
+            logger.info(f"✅ relevance_flags ready ({len(updates)} resources backfilled)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Migration failed: {e}")
+            conn.rollback()
+            raise
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migration()
+    logger.info("Migration completed successfully")
@@ -0,0 +1,54 @@
+"""
+Migration: Add embedding column to resources
+
+Stores a local hashed bag-of-words embedding per resource (see
+resource_embeddings.py) for LLM-free semantic ranking. Backfills rows
+without an embedding; pass --recompute to rebuild every row after changing
+the embedding scheme. Safe to run repeatedly.
+"""
+import sys
+import logging
+from sqlalchemy import text
+from database import engine
+from resource_embeddings import embed_resource
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+def run_migration(recompute: bool = False):
+    """Add embedding column and backfill missing (or all, with recompute) values"""
+    logger.info("Starting migration: Add embedding to resources")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("ALTER TABLE resources ADD COLUMN IF NOT EXISTS embedding REAL[]"))
+            
+            where = "" if recompute else " WHERE embedding IS NULL"
+            rows = conn.execute(text(
+                f"SELECT id, resource_name, summary, subcategory FROM resources{where}"
+            )).fetchall()
+            
+            updates = [
+                {"id": row.id, "embedding": embed_resource(row.resource_name, row.summary, row.subcategory)}
+                for row in rows
+            ]
+            for start in range(0, len(updates), BATCH_SIZE):
+                conn.execute(
+                    text("UPDATE resources SET embedding = :embedding WHERE id = :id"),
+                    updates[start:start + BATCH_SIZE]
+                )
+            
+            conn.commit()
+            logger.info(f"✅ Resource embeddings ready ({len(updates)} resources embedded)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Migration failed: {e}")
+            conn.rollback()
+            raise
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migration(recompute="--recompute" in sys.argv)
+    logger.info("Migration completed successfully")
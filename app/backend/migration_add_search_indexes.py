@@ -0,0 +1,78 @@
+"""
+Migration: Ensure full-text and trigram search indexes on resources
+
+The public resource search ranks matches with the weighted `search_vector`
+tsvector and falls back to trigram similarity on `resource_name`. This
+migration makes sure the column is populated, kept in sync by a trigger,
+and backed by GIN indexes so neither path needs a sequential scan.
+Safe to run repeatedly.
+"""
+import logging
+from sqlalchemy import text
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('simple', replace(coalesce({p}resource_name,''), '/', ' ')), 'A') ||
+    setweight(to_tsvector('simple', replace(coalesce({p}category,''), '/', ' ')), 'B') ||
+    setweight(to_tsvector('simple', replace(coalesce({p}subcategory,''), '/', ' ')), 'B') ||
+    setweight(to_tsvector('simple', coalesce({p}summary,'')), 'C') ||
+    setweight(to_tsvector('simple', coalesce({p}notes,'')), 'D')
+"""
+
+def run_migration():
+    """Create search_vector trigger, backfill missing vectors and build GIN indexes"""
+    logger.info("Starting migration: Ensure resource search indexes")
+
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text("ALTER TABLE resources ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+
+            # Keep search_vector updated on insert/update
+            conn.execute(text(f"""
+                CREATE OR REPLACE FUNCTION resources_tsv_update() RETURNS trigger AS $$
+                BEGIN
+                  NEW.search_vector := {SEARCH_VECTOR_SQL.format(p='NEW.')};
+                  RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql;
+            """))
+            conn.execute(text("DROP TRIGGER IF EXISTS trg_resources_tsv_update ON resources"))
+            conn.execute(text("""
+                CREATE TRIGGER trg_resources_tsv_update
+                BEFORE INSERT OR UPDATE ON resources
+                FOR EACH ROW EXECUTE PROCEDURE resources_tsv_update()
+            """))
+
+            # Backfill rows created before the trigger existed
+            result = conn.execute(text(
+                f"UPDATE resources SET search_vector = {SEARCH_VECTOR_SQL.format(p='')} WHERE search_vector IS NULL"
+            ))
+            logger.info(f"Backfilled search_vector for {result.rowcount} resources")
+
+            indexes = [
+                "CREATE INDEX IF NOT EXISTS idx_resources_search_vector ON resources USING GIN (search_vector)",
+                "CREATE INDEX IF NOT EXISTS idx_resources_name_trgm ON resources USING GIN (resource_name gin_trgm_ops)",
+                "CREATE INDEX IF NOT EXISTS idx_resources_summary_trgm ON resources USING GIN (summary gin_trgm_ops)",
+                # Keyset pagination order for cursor-mode listing
+                "CREATE INDEX IF NOT EXISTS idx_resource_priority_name_id ON resources (priority DESC NULLS LAST, resource_name, id)"
+            ]
+
+            for index_sql in indexes:
+                conn.execute(text(index_sql))
+
+            conn.commit()
+            logger.info("✅ Resource search indexes are in place")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Migration failed: {e}")
+            conn.rollback()
+            raise
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migration()
+    logger.info("Migration completed successfully")
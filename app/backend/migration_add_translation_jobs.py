@@ -0,0 +1,61 @@
+"""
+Migration: Add translation_jobs table
+
+Background translations (user roadmap summaries, category subtitles) are
+queued here and processed by translation_worker instead of fire-and-forget
+asyncio tasks, so they survive restarts and can be retried.
+"""
+import logging
+from sqlalchemy import text
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+def run_migration():
+    """Add translation_jobs table"""
+    logger.info("Starting migration: Add translation_jobs table")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS translation_jobs (
+                    id SERIAL PRIMARY KEY,
+                    kind VARCHAR(40) NOT NULL,
+                    subject_id VARCHAR(100) NOT NULL,
+                    language_code VARCHAR(10) NOT NULL,
+                    payload JSONB,
+                    dedupe_key VARCHAR(200) NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 5,
+                    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                    locked_by VARCHAR(100),
+                    locked_at TIMESTAMP WITH TIME ZONE,
+                    last_error TEXT,
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    completed_at TIMESTAMP WITH TIME ZONE
+                )
+            """))
+            
+            indexes = [
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_translation_jobs_queued_dedupe ON translation_jobs(dedupe_key) WHERE status = 'queued'",
+                "CREATE INDEX IF NOT EXISTS idx_translation_jobs_status_run_after ON translation_jobs(status, run_after)"
+            ]
+            
+            for index_sql in indexes:
+                conn.execute(text(index_sql))
+            
+            conn.commit()
+            logger.info("✅ Successfully created translation_jobs table and indexes")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Migration failed: {e}")
+            conn.rollback()
+            raise
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migration()
+    logger.info("Migration completed successfully")
@@ -0,0 +1,67 @@
+"""
+Migration: Add translation_memory table
+
+Stores every translation keyed by the SHA-256 of its source text, the
+target language and the provider that produced it, so identical strings
+(templated roadmap text, category subtitles, repeated resource summaries) are
+only sent to the translator once. Safe to run repeatedly; tables created
+before the provider column existed are upgraded in place.
+"""
+import logging
+from sqlalchemy import text
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+def run_migration():
+    """Add translation_memory table"""
+    logger.info("Starting migration: Add translation_memory table")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS translation_memory (
+                    id SERIAL PRIMARY KEY,
+                    source_hash VARCHAR(64) NOT NULL,
+                    source_language VARCHAR(10) NOT NULL DEFAULT 'en',
+                    language_code VARCHAR(10) NOT NULL,
+                    provider VARCHAR(32) NOT NULL DEFAULT 'google',
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    last_used_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    CONSTRAINT uq_translation_memory_source_provider UNIQUE (source_hash, source_language, language_code, provider)
+                )
+            """))
+            
+            # Tables created before entries were keyed by provider
+            conn.execute(text(
+                "ALTER TABLE translation_memory ADD COLUMN IF NOT EXISTS provider VARCHAR(32) NOT NULL DEFAULT 'google'"
+            ))
+            conn.execute(text(
+                "ALTER TABLE translation_memory DROP CONSTRAINT IF EXISTS uq_translation_memory_source_language"
+            ))
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_translation_memory_source_provider
+                ON translation_memory (source_hash, source_language, language_code, provider)
+            """))
+            # Marked pass-through output of the local provider, stored as google before the split
+            conn.execute(text("""
+                DELETE FROM translation_memory
+                WHERE translated_text = '[' || language_code || '] ' || source_text
+            """))
+            
+            conn.commit()
+            logger.info("✅ Successfully created translation_memory table")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Migration failed: {e}")
+            conn.rollback()
+            raise
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migration()
+    logger.info("Migration completed successfully")
@@ -0,0 +1,81 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the sort key
+of the last row on the previous page. Resources are paged on
+(priority DESC NULLS LAST, resource_name ASC, id ASC), which is a total
+order because id is unique, so each page is a bounded index range scan
+instead of an OFFSET that re-reads every earlier row.
+"""
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode a sort-key dict into an opaque continuation token"""
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True, default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Decode a continuation token. Raises ValueError for malformed tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor: expected an object")
+    return values
+
+
+def resource_cursor(priority: Optional[int], resource_name: str, resource_id: str) -> str:
+    """Build the continuation token for the last resource on a page"""
+    return encode_cursor({"p": priority, "n": resource_name, "i": resource_id})
+
+
+def decode_resource_cursor(token: str) -> Dict[str, Any]:
+    """Decode and validate a resource cursor into {'p', 'n', 'i'}"""
+    values = decode_cursor(token)
+    priority = values.get("p")
+    name = values.get("n")
+    resource_id = values.get("i")
+    if priority is not None and not isinstance(priority, int):
+        raise ValueError("Invalid cursor: priority must be an integer or null")
+    if not isinstance(name, str) or not isinstance(resource_id, str):
+        raise ValueError("Invalid cursor: missing resource_name/id")
+    return {"p": priority, "n": name, "i": resource_id}
+
+
+def resource_keyset_filter(priority_col, name_col, id_col, cursor: Dict[str, Any]):
+    """SQLAlchemy predicate selecting rows strictly after `cursor` in
+    (priority DESC NULLS LAST, resource_name ASC, id ASC) order."""
+    tie_break = or_(
+        name_col > cursor["n"],
+        and_(name_col == cursor["n"], id_col > cursor["i"]),
+    )
+    if cursor["p"] is None:
+        # Already inside the NULL-priority tail
+        return and_(priority_col.is_(None), tie_break)
+    return or_(
+        priority_col < cursor["p"],
+        priority_col.is_(None),
+        and_(priority_col == cursor["p"], tie_break),
+    )
+
+
+def resource_keyset_sql(cursor: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Raw-SQL equivalent of resource_keyset_filter for text() queries"""
+    params = {"cursor_name": cursor["n"], "cursor_id": cursor["i"]}
+    tie_break = "(resource_name > :cursor_name OR (resource_name = :cursor_name AND id > :cursor_id))"
+    if cursor["p"] is None:
+        return f"(priority IS NULL AND {tie_break})", params
+    params["cursor_priority"] = cursor["p"]
+    return (
+        f"(priority < :cursor_priority OR priority IS NULL "
+        f"OR (priority = :cursor_priority AND {tie_break}))",
+        params,
+    )
@@ -20,14 +20,36 @@ import os
 import json
 import re
 import asyncio
+import hashlib
 import logging
+import threading
+import time
 from typing import Any, Dict, List, Tuple, Optional
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import or_, desc, text as sql_text
 
 from database import Resource
+from cache_service import cache, make_cache_key
+from blocking_io import run_blocking, run_sync
+from resource_embeddings import embed_text, embed_resource, cosine_scores, EMBEDDING_DIM
+from resource_relevance import (
+    compute_relevance_flags,
+    cultural_pattern_index,
+    has_affordable_housing_content,
+    has_refugee_content,
+    allowed_cultural_patterns,
+    user_relevance_mask,
+    flags_allowed,
+    CULTURAL_PATTERN_SHIFT,
+)
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - vectorized filtering falls back to pure Python
+    np = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +64,26 @@ RECOMMENDER_MODEL = os.getenv("RECOMMENDER_MODEL", "gemini-flash-lite-latest")
 MAX_CANDIDATES = int(os.getenv("RECOMMENDER_MAX_CANDIDATES", "200"))
 AI_DESCRIPTION_ENABLED = os.getenv("AI_DESCRIPTION_ENABLED", "true").lower() == "true"
 AI_DESCRIPTION_FALLBACK = os.getenv("AI_DESCRIPTION_FALLBACK", "true").lower() == "true"
+# Max concurrent Gemini ranking calls per onboarding, and per-call timeout before
+# falling back to deterministic ordering
+RECOMMENDER_CONCURRENCY = int(os.getenv("RECOMMENDER_CONCURRENCY", "4"))
+RECOMMENDER_LLM_TIMEOUT_SECONDS = float(os.getenv("RECOMMENDER_LLM_TIMEOUT_SECONDS", "20"))
+# Rank all priority categories with a single structured prompt instead of one per category
+RECOMMENDER_BATCH_RANKING = os.getenv("RECOMMENDER_BATCH_RANKING", "false").lower() == "true"
+RECOMMENDER_BATCH_TIMEOUT_SECONDS = float(os.getenv("RECOMMENDER_BATCH_TIMEOUT_SECONDS", "45"))
+# Cache of final per-category rankings keyed by answer fingerprint + catalog version
+RANKING_CACHE_TTL = int(os.getenv("RECOMMENDER_RANKING_CACHE_TTL", "86400"))
+RANKING_LOCAL_CACHE_SIZE = int(os.getenv("RECOMMENDER_RANKING_LOCAL_CACHE_SIZE", "512"))
+# Ranking strategy:
+# - "llm": Gemini ranks each category; deterministic priority/name order on failure
+# - "semantic": local embedding similarity only, no network calls
+# - "hybrid": embeddings pre-rank and trim candidates before Gemini, and replace
+#   the deterministic fallback when Gemini fails or times out
+RECOMMENDER_RANKING_MODE = os.getenv("RECOMMENDER_RANKING_MODE", "llm").lower()
+# Hybrid mode: number of top semantic candidates sent to Gemini (at least the category limit)
+RECOMMENDER_SEMANTIC_PREFILTER = int(os.getenv("RECOMMENDER_SEMANTIC_PREFILTER", "40"))
+# Safety net for catalog changes that did not bump the catalog version (e.g. another process without Redis)
+CANDIDATE_INDEX_MAX_AGE_SECONDS = int(os.getenv("RECOMMENDER_CANDIDATE_INDEX_MAX_AGE", "600"))
 
 
 _gemini_configured = False
@@ -280,22 +322,8 @@ def _is_refugee_appropriate_resource(resource_name: str, summary: str, user_is_r
     if not resource_name and not summary:
         return True
     
-    text = f"{resource_name} {summary}".lower()
-    
-    # Keywords that indicate refugee-specific resources
-    refugee_keywords = [
-        'refugee', 'asylum', 'immigrant services', 'resettlement', 'newcomer services',
-        'temporary protected status', 'tps', 'immigration legal', 'immigration attorney',
-        'immigration law', 'visa assistance', 'green card', 'naturalization',
-        'citizenship classes', 'refugee assistance', 'refugee support',
-        'immigration services', 'deportation defense', 'asylum seekers'
-    ]
-    
-    # Check if this resource contains refugee-specific keywords
-    has_refugee_content = any(keyword in text for keyword in refugee_keywords)
-    
-    if has_refugee_content:
-        # If resource is refugee-specific, only show it if user is refugee/TPS
+    # If resource is refugee-specific, only show it if user is refugee/TPS
+    if has_refugee_content(f"{resource_name} {summary}".lower()):
         return user_is_refugee
     
     # If it's not refugee-specific, show it to everyone
@@ -310,22 +338,8 @@ def _is_affordable_housing_appropriate_resource(resource_name: str, summary: str
     if not resource_name and not summary:
         return True
     
-    text = f"{resource_name} {summary}".lower()
-    
-    # Keywords that indicate affordable/subsidized housing resources
-    affordable_housing_keywords = [
-        'section 8', 'section eight', 'housing voucher', 'subsidized housing',
-        'affordable housing', 'low income housing', 'income-based rent',
-        'rent assistance', 'housing assistance', 'free housing', 'reduced rent',
-        'housing subsidy', 'public housing', 'housing authority', 'hud',
-        'income qualified', 'sliding scale rent', 'rental assistance'
-    ]
-    
-    # Check if this resource contains affordable housing keywords
-    has_affordable_housing_content = any(keyword in text for keyword in affordable_housing_keywords)
-    
-    if has_affordable_housing_content:
-        # If resource is affordable housing-specific, only show it if user selected affordable housing
+    # If resource is affordable housing-specific, only show it if user selected affordable housing
+    if has_affordable_housing_content(f"{resource_name} {summary}".lower()):
         return user_needs_affordable
     
     # If it's not affordable housing-specific, show it to everyone
@@ -340,51 +354,13 @@ def _is_culturally_relevant_resource(resource_name: str, summary: str, user_lang
     if not resource_name and not summary:
         return True
     
-    text = f"{resource_name} {summary}".lower()
-    
-    # Language mapping for cultural relevance
-    language_to_culture = {
-        'es': ['hispanic', 'latino', 'spanish'],
-        'zh': ['chinese', 'asian'],
-        'ar': ['arabic', 'arab', 'middle eastern'],
-        'fr': ['french'],
-        'nepali': ['nepali', 'bhutanese'],
-        'dari': ['afghan', 'dari'],
-        'pashto': ['afghan', 'pashto'],
-        'sw': ['swahili', 'african', 'east african'],
-        'swahili': ['swahili', 'african', 'east african'],
-        'uz': ['uzbek', 'central asian'],
-        'uzbek': ['uzbek', 'central asian'],
-        'en': ['english', 'american', 'british'],
-        # Handle compound language codes from frontend survey
-        'ne_dz': ['nepali', 'bhutanese', 'afghan', 'dari'],
-        'fa_ps': ['afghan', 'dari', 'pashto'],
-    }
-    
-    # Known cultural organization patterns that should be filtered
-    cultural_patterns = [
-        'african chamber', 'asian chamber', 'hispanic chamber', 'latino chamber',
-        'chinese association', 'korean association', 'vietnamese association',
-        'african american', 'black chamber', 'jewish federation',
-        'indian association', 'pakistani association', 'bangladeshi association',
-        'swahili association', 'east african', 'african community',
-        'uzbek association', 'central asian', 'uzbek community',
-        'english speaking', 'british association', 'american chamber'
-    ]
+    # Check if this is a culturally-specific organization; the first matching pattern decides
+    pattern_idx = cultural_pattern_index(f"{resource_name} {summary}".lower())
+    if pattern_idx is None:
+        return True
     
-    # Check if this is a culturally-specific organization
-    for pattern in cultural_patterns:
-        if pattern in text:
-            # If user's language matches this cultural pattern, include it
-            user_cultures = language_to_culture.get(user_language, [])
-            for culture in user_cultures:
-                if culture in pattern:
-                    return True
-            # Otherwise, exclude it
-            return False
-    
-    # If it's not a culturally-specific organization, include it
-    return True
+    # Include it only if the user's language matches this cultural pattern
+    return (pattern_idx + 1) in allowed_cultural_patterns(user_language)
 
 
 def _should_include_resource(resource_name: str, summary: str, answers: Dict[str, Any]) -> bool:
@@ -414,6 +390,14 @@ def _should_include_resource(resource_name: str, summary: str, answers: Dict[str
     return True
 
 
+def _resource_flags(resource: Resource) -> int:
+    """Stored relevance flags, computed on the fly for rows imported before the column existed"""
+    flags = getattr(resource, 'relevance_flags', None)
+    if flags is None:
+        flags = compute_relevance_flags(resource.resource_name, resource.summary)
+    return flags
+
+
 def _filters_for_priority_key(category_key: str) -> Tuple[List[str], List[str]]:
     """Return tuples of (category_like_filters, subcategory_keyword_filters) for a priority key."""
     key = (category_key or '').lower().strip()
@@ -465,8 +449,9 @@ def _filters_for_priority_key(category_key: str) -> Tuple[List[str], List[str]]:
     return ([], [])
 
 
-def _fetch_candidates_for_priority_key(db: Session, category_key: str, limit: int) -> List[Resource]:
-    base = db.query(Resource).filter(Resource.published == True, Resource.ready == True)
+def _query_candidates_for_priority_key(db: Session, category_key: str, limit: int) -> List[Resource]:
+    """Legacy ILIKE candidate query, used when the candidate index is unavailable"""
+    base = db.query(Resource).options(undefer(Resource.embedding)).filter(Resource.published == True, Resource.ready == True)
     cats, subs = _filters_for_priority_key(category_key)
     query = base
     if cats:
@@ -500,41 +485,274 @@ def _fetch_candidates_for_priority_key(db: Session, category_key: str, limit: in
         return query.limit(50).all()
 
 
+class _CandidateIndex:
+    """In-memory prefilter: priority key -> published/ready resource ids in candidate order.
+
+    The category/subcategory matching that used to run as ILIKE OR-chains on
+    every onboarding is computed once from a single catalog scan, so fetching
+    candidates becomes a primary-key lookup. The index is rebuilt when the
+    catalog version changes (CSV import / publish bump it) or when it is older
+    than RECOMMENDER_CANDIDATE_INDEX_MAX_AGE seconds.
+    
+    Each key also keeps the resources' relevance flags as an array, so the
+    per-user refugee/housing/cultural filter is a vectorized mask over the
+    whole category before the candidate cap is applied.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._built_at = 0.0
+        # (id, category_lower, subcategory_lower, relevance_flags) in candidate order
+        self._rows: List[Tuple[str, str, str, int]] = []
+        # key -> (ids, flags array)
+        self._by_key: Dict[str, Tuple[List[str], Any]] = {}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def rebuild(self, db: Session) -> None:
+        version = cache.get_catalog_version()
+        rows = db.query(
+            Resource.id, Resource.category, Resource.subcategory,
+            Resource.priority, Resource.updated_at, Resource.resource_name,
+            Resource.summary, Resource.relevance_flags
+        ).filter(Resource.published == True, Resource.ready == True).all()
+
+        # Same order as the SQL query: priority DESC NULLS LAST, updated_at DESC (NULLs first), name
+        def order_key(row):
+            updated = row.updated_at.timestamp() if row.updated_at else None
+            return (
+                row.priority is None,
+                -(row.priority or 0),
+                updated is not None,
+                -(updated or 0.0),
+                row.resource_name or ''
+            )
+
+        ordered = sorted(rows, key=order_key)
+        with self._lock:
+            self._rows = [
+                (
+                    r.id,
+                    (r.category or '').lower(),
+                    (r.subcategory or '').lower(),
+                    r.relevance_flags if r.relevance_flags is not None
+                    else compute_relevance_flags(r.resource_name, r.summary)
+                )
+                for r in ordered
+            ]
+            self._by_key = {}
+            self._version = version
+            self._built_at = time.monotonic()
+        logger.info(f"🧠 CANDIDATE INDEX: Rebuilt with {len(ordered)} resources (catalog v{version})")
+
+    def _is_stale(self) -> bool:
+        if self._version is None:
+            return True
+        if time.monotonic() - self._built_at > CANDIDATE_INDEX_MAX_AGE_SECONDS:
+            return True
+        return self._version != cache.get_catalog_version()
+
+    def ids_for_key(self, db: Session, category_key: str, relevance_mask: Optional[Tuple[int, Any]] = None) -> List[str]:
+        if self._is_stale():
+            self.rebuild(db)
+        with self._lock:
+            entry = self._by_key.get(category_key)
+            if entry is None:
+                cats, subs = _filters_for_priority_key(category_key)
+                cats_l = [c.lower() for c in cats]
+                subs_l = [x.lower() for x in subs]
+                matched = [
+                    (rid, flags) for (rid, cat, sub, flags) in self._rows
+                    if (not cats_l or any(c in cat for c in cats_l))
+                    and (not subs_l or any(x in sub for x in subs_l))
+                ]
+                ids = [rid for rid, _ in matched]
+                flags = [f for _, f in matched]
+                if np is not None:
+                    flags = np.asarray(flags, dtype=np.int64)
+                entry = (ids, flags)
+                self._by_key[category_key] = entry
+        ids, flags = entry
+        if relevance_mask is None:
+            return ids
+        blocked, allowed_patterns = relevance_mask
+        if np is not None:
+            keep = ((flags & blocked) == 0) & np.isin(
+                flags >> CULTURAL_PATTERN_SHIFT, [0, *allowed_patterns]
+            )
+            return [ids[i] for i in np.flatnonzero(keep)]
+        return [rid for rid, f in zip(ids, flags) if flags_allowed(f, relevance_mask)]
+
+
+_candidate_index = _CandidateIndex()
+
+
+def rebuild_candidate_index(db: Session) -> None:
+    """Rebuild the priority-key candidate index (call after resources are imported/published)"""
+    try:
+        _candidate_index.rebuild(db)
+    except Exception as e:
+        logger.warning(f"🧠 CANDIDATE INDEX: Rebuild failed, will retry lazily: {e}")
+        _candidate_index.invalidate()
+
+
+def _fetch_candidates_for_priority_key(db: Session, category_key: str, limit: int, answers: Optional[Dict[str, Any]] = None) -> List[Resource]:
+    """Fetch capped candidates for a priority key.
+
+    When normalized `answers` are given, resources the user should never see
+    are masked out over the whole category before the cap, so the cap is
+    spent on eligible candidates only.
+    """
+    # Middle-ground performance: cap DB candidates relative to requested limit
+    # This keeps recall high while avoiding very large prompts
+    cap_multiplier = 2
+    db_cap = max(10, limit * cap_multiplier)
+    try:
+        relevance_mask = user_relevance_mask(answers) if answers is not None else None
+        ids = _candidate_index.ids_for_key(db, category_key, relevance_mask)[:db_cap]
+        logger.info(f"🧠 CANDIDATES: Using DB cap {db_cap} (limit={limit}, mult={cap_multiplier}) for category: {category_key}")
+        if not ids:
+            return []
+        by_id = {
+            r.id: r for r in
+            db.query(Resource).options(undefer(Resource.embedding)).filter(Resource.id.in_(ids)).all()
+        }
+        return [by_id[rid] for rid in ids if rid in by_id]
+    except Exception as e:
+        logger.warning(f"🧠 CANDIDATES: Candidate index unavailable ({e}); using ILIKE query")
+        return _query_candidates_for_priority_key(db, category_key, limit)
+
+
+# In-process fallback used when Redis is unavailable
+_local_ranking_cache: TTLCache = TTLCache(maxsize=RANKING_LOCAL_CACHE_SIZE, ttl=RANKING_CACHE_TTL)
+_local_ranking_cache_lock = threading.Lock()
+
+
+def _answers_fingerprint(normalized: Dict[str, Any]) -> str:
+    """Stable hash of normalized survey answers (list order-insensitive)"""
+    canonical = {
+        key: sorted(str(v) for v in value) if isinstance(value, list) else value
+        for key, value in normalized.items()
+    }
+    payload = json.dumps(canonical, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _ranking_cache_key(normalized: Dict[str, Any], category_key: str, limit: int, target_display: Optional[int]) -> str:
+    """Cache key for a final category ranking; changes whenever the catalog version does"""
+    return make_cache_key("recommendations:ranking", generation=await cache.aget_catalog_version(), params={
+        "mode": RECOMMENDER_RANKING_MODE,
+        "category": category_key,
+        "limit": limit,
+        "target": target_display,
+        "answers": _answers_fingerprint(normalized),
+    })
+
+
+async def _get_cached_ranking(cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    cached = await cache.aget(cache_key)
+    if cached is None:
+        with _local_ranking_cache_lock:
+            cached = _local_ranking_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"🧠 RANKING CACHE HIT: {cache_key}")
+    return cached
+
+
+async def _store_ranking(cache_key: str, resources: List[Dict[str, Any]]) -> None:
+    await cache.aset(cache_key, resources, RANKING_CACHE_TTL)
+    with _local_ranking_cache_lock:
+        _local_ranking_cache[cache_key] = resources
+
+
+def _ranking_source() -> str:
+    return "semantic" if RECOMMENDER_RANKING_MODE == "semantic" else "ai"
+
+
+def _resource_embedding(resource: Resource) -> List[float]:
+    """Stored embedding, computed on the fly for rows imported before the column existed"""
+    embedding = getattr(resource, 'embedding', None)
+    if embedding is None or len(embedding) != EMBEDDING_DIM:
+        embedding = embed_resource(resource.resource_name, resource.summary, resource.subcategory)
+    return embedding
+
+
+def _semantic_profile_text(normalized: Dict[str, Any], category_key: str) -> str:
+    """Profile text embedded for semantic ranking: user profile, stated needs and category focus"""
+    _cats, subs = _filters_for_priority_key(category_key)
+    return "\n".join([
+        _generate_user_profile(normalized),
+        _generate_user_needs(normalized),
+        category_key.replace('_', ' '),
+        " ".join(subs),
+    ])
+
+
+def _semantic_order(normalized: Dict[str, Any], category_key: str, candidates: List[Resource]) -> List[Resource]:
+    """Order candidates by cosine similarity to the user's profile vector (stable on ties)"""
+    if not candidates:
+        return []
+    query = embed_text(_semantic_profile_text(normalized, category_key))
+    scores = cosine_scores(query, [_resource_embedding(r) for r in candidates])
+    order = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))
+    return [candidates[i] for i in order]
+
+
+def _category_limits(category_key: str) -> Tuple[int, int]:
+    """Candidate limit and display target used when pre-generating a category.
+
+    Middle ground: enough variety for quality ranking without slow prompts.
+    """
+    if category_key == "first_things_first":
+        return 50, 15   # per request: 50 for FTF, enforce max user display
+    return 40, 15       # per request: 40 for others, enforce max user display
+
+
 async def generate_all_priority_resources_llm(db: Session, answers: Dict[str, Any], priority_categories: List[Dict[str, Any]], limit: int = 12) -> Dict[str, Dict[str, Any]]:
     """Pre-generate resources for ALL priority categories at once.
     
     This is more efficient than generating one-by-one and ensures users have
     instant access to all their priority resources without additional LLM calls.
     
+    Candidates are fetched up front, one category after another, because the
+    SQLAlchemy Session is not safe for concurrent use. The LLM ranking calls
+    then run concurrently (bounded by RECOMMENDER_CONCURRENCY), each with a
+    RECOMMENDER_LLM_TIMEOUT_SECONDS timeout that falls back to deterministic
+    ordering, so total latency is roughly that of the slowest category.
+    
+    With RECOMMENDER_BATCH_RANKING=true all categories are ranked with a single
+    prompt instead; if that call fails the per-category path above is used.
+    
     Returns: Dict[category_key, {"resources": [...], "source": "ai/fallback", "generated_at": "..."}]
     """
     logger.info(f"🧠 PRE-GENERATING ALL PRIORITY RESOURCES: {len(priority_categories)} categories")
     
     results = {}
     
+    normalized = _normalize_answers(answers or {})
+    normalized.pop('tech_comfort', None)
+    
+    # Phase 1: cached rankings, then sequential DB work on the shared session
+    prefetched: Dict[str, Tuple[int, int, List[Resource]]] = {}
     for category in priority_categories:
         category_key = category.get("key")
-        if not category_key:
+        if not category_key or category_key in prefetched or category_key in results:
             continue
-            
-        try:
-            # Determine appropriate limit for this category
-            # Middle ground: enough variety for quality ranking without slow prompts
-            if category_key == "first_things_first":
-                category_limit = 50   # per request: 50 for FTF
-                target_display = 15   # enforce max user display
-            else:
-                category_limit = 40   # per request: 40 for others
-                target_display = 15   # enforce max user display
-            
-            # Generate resources for this category
-            resources = await rank_resources_llm_for_priority_category(db, answers, category_key, category_limit, target_display)
+        category_limit, target_display = _category_limits(category_key)
+        cached = await _get_cached_ranking(await _ranking_cache_key(normalized, category_key, category_limit, target_display))
+        if cached is not None:
             results[category_key] = {
-                "resources": resources,
-                "source": "ai",
+                "resources": cached,
+                "source": _ranking_source(),
                 "generated_at": datetime.utcnow().isoformat()
             }
-            logger.info(f"🧠 PRE-GENERATED RESOURCES [{category_key}]: {len(resources)} items (limit: {category_limit})")
+            continue
+        try:
+            candidates = await run_blocking(_fetch_candidates_for_priority_key, db, category_key, category_limit, normalized)
+            prefetched[category_key] = (category_limit, target_display, candidates)
         except Exception as e:
             logger.warning(f"🧠 PRE-GENERATION FAILED [{category_key}]: {e}")
             results[category_key] = {
@@ -543,36 +761,141 @@ async def generate_all_priority_resources_llm(db: Session, answers: Dict[str, An
                 "generated_at": datetime.utcnow().isoformat()
             }
     
+    # Optional: rank every category with a single prompt (semantic mode makes no LLM calls)
+    if RECOMMENDER_BATCH_RANKING and RECOMMENDER_RANKING_MODE != "semantic" and prefetched:
+        batched = await _rank_all_categories_batch(answers, prefetched)
+        if batched is not None:
+            results.update(batched)
+            logger.info(f"🧠 PRE-GENERATION COMPLETE: {len(results)} categories processed (batched)")
+            return results
+        logger.warning("🧠 BATCH RANKING: falling back to per-category ranking")
+    
+    # Phase 2: concurrent LLM ranking, no DB access
+    semaphore = asyncio.Semaphore(max(1, RECOMMENDER_CONCURRENCY))
+    
+    async def _rank(category_key: str, category_limit: int, target_display: int, candidates: List[Resource]):
+        async with semaphore:
+            return await rank_resources_llm_for_priority_category(
+                db, answers, category_key, category_limit, target_display, candidates=candidates
+            )
+    
+    keys = list(prefetched.keys())
+    outcomes = await asyncio.gather(
+        *[_rank(key, *prefetched[key]) for key in keys],
+        return_exceptions=True
+    )
+    
+    for category_key, outcome in zip(keys, outcomes):
+        category_limit = prefetched[category_key][0]
+        if isinstance(outcome, Exception):
+            logger.warning(f"🧠 PRE-GENERATION FAILED [{category_key}]: {outcome}")
+            results[category_key] = {
+                "resources": [],
+                "source": "fallback",
+                "generated_at": datetime.utcnow().isoformat()
+            }
+            continue
+        results[category_key] = {
+            "resources": outcome,
+            "source": _ranking_source(),
+            "generated_at": datetime.utcnow().isoformat()
+        }
+        logger.info(f"🧠 PRE-GENERATED RESOURCES [{category_key}]: {len(outcome)} items (limit: {category_limit})")
+    
     logger.info(f"🧠 PRE-GENERATION COMPLETE: {len(results)} categories processed")
     return results
 
 
-async def rank_resources_llm_for_priority_category(db: Session, answers: Dict[str, Any], category_key: str, limit: int, target_display: Optional[int] = None) -> List[Dict[str, Any]]:
-    """Rerank database candidates for a specific priority category key.
-
-    Uses the same LLM ranking flow but constrains candidates to a category-specific
-    slice. Falls back to deterministic ordering if AI fails.
+def _first_things_first_guidance(normalized: Dict[str, Any]) -> str:
+    """Distribution guidance for the First Things First prompt, based on selected immediate needs"""
+    distribution_guidance = ""
+    immediate_needs = normalized.get('immediate_needs', [])
+    logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Raw immediate_needs: {immediate_needs}")
     
-    Special handling for "first_things_first" category to ensure even distribution
-    across the 6 immediate needs when multiple are selected.
-    """
-    normalized = _normalize_answers(answers or {})
-    normalized.pop('tech_comfort', None)
+    if isinstance(immediate_needs, list) and len(immediate_needs) >= 1:
+        # Filter out 'none' if present
+        valid_needs = [need for need in immediate_needs if need and str(need).strip() and need != "none"]
+        logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Valid needs after filtering: {valid_needs}")
+        
+        if len(valid_needs) >= 1:
+            need_categories = _get_immediate_needs_categories(valid_needs)
+            logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Mapped need categories: {need_categories}")
+            
+            if len(valid_needs) == 6 and len(need_categories) == 6:
+                # User selected all 6 immediate needs - ensure exactly 1 resource per category
+                distribution_guidance = (
+                    f"\nSPECIAL DISTRIBUTION REQUIREMENT FOR FIRST THINGS FIRST:\n"
+                    f"User selected ALL 6 immediate needs from the survey.\n"
+                    f"Selected immediate needs: {', '.join(valid_needs)}\n"
+                    f"Need categories to represent: {', '.join(need_categories)}\n"
+                    f"CRITICAL: Return exactly 6 resources, with exactly 1 resource for each need category:\n"
+                    f"1. One resource for SOCIAL/COMMUNITY (meet_people) - Find a resource that helps with social connections, networking, community groups, meeting people\n"
+                    f"2. One resource for SERVICES (basic_services) - Find a resource for healthcare, banking, transportation, or basic services\n"
+                    f"3. One resource for EDUCATION (school_enrollment) - Find a resource for schools, childcare, education services, or child enrollment\n"
+                    f"4. One resource for LEGAL (legal_immigration) - Find a resource for legal aid, immigration assistance, or legal services\n"
+                    f"5. One resource for WELLNESS (mental_health) - Find a resource for mental health, counseling, wellness support, or mental health services\n"
+                    f"6. One resource for EMERGENCY (emergency_assistance) - Find a resource for food assistance, shelter, emergency services, or emergency support\n"
+                    f"SEARCH STRATEGY: Look through ALL candidate resources to find the best match for each category.\n"
+                    f"If a resource could fit multiple categories, assign it to the category that needs it most.\n"
+                    f"Each of the 6 resources MUST address a different immediate need category.\n"
+                    f"This distribution is MANDATORY for proper user experience - all 6 immediate need types must be covered.\n"
+                )
+            elif len(valid_needs) > 1 and len(need_categories) > 1:
+                # User selected multiple but not all immediate needs
+                distribution_guidance = (
+                    f"\nSPECIAL DISTRIBUTION REQUIREMENT FOR FIRST THINGS FIRST:\n"
+                    f"User selected {len(valid_needs)} immediate needs from the 6 possible options.\n"
+                    f"Selected immediate needs: {', '.join(valid_needs)}\n"
+                    f"Need categories to represent: {', '.join(need_categories)}\n"
+                    f"CRITICAL: Distribute the 6 resources evenly across these {len(need_categories)} need categories.\n"
+                    f"Target: approximately {6 // len(need_categories)} resource(s) per category, ensuring all categories are represented.\n"
+                    f"Prioritize covering all selected need types rather than clustering multiple resources in one area.\n"
+                )
+            elif len(valid_needs) == 1:
+                # User selected only one immediate need - still provide guidance for focused results
+                single_category = need_categories[0] if need_categories else "general"
+                distribution_guidance = (
+                    f"\nFOCUSED REQUIREMENT FOR FIRST THINGS FIRST:\n"
+                    f"User selected only 1 immediate need: {valid_needs[0]}\n"
+                    f"Need category: {single_category}\n"
+                    f"CRITICAL: Return exactly 6 resources that are ALL highly relevant to {valid_needs[0]}.\n"
+                    f"Focus on finding the 6 BEST resources for this specific immediate need.\n"
+                    f"Ensure all 6 resources directly address: {valid_needs[0]}\n"
+                )
+            
+            logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Distribution guidance generated: {bool(distribution_guidance)}")
+            if distribution_guidance:
+                logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Guidance content preview: {distribution_guidance[:200]}...")
 
-    # Set up display limit for final results
-    final_limit = target_display if target_display is not None else limit
-    
-    # For First Things First, we get more resources from LLM but filter to best distributed ones
-    if category_key == "first_things_first":
-        logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Requesting {limit} resources from LLM, will filter to top {final_limit} with proper distribution")
+    return distribution_guidance
 
-    candidates: List[Resource] = _fetch_candidates_for_priority_key(db, category_key, limit)
-    logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Found {len(candidates)} category-constrained candidates")
 
-    if not candidates:
-        logger.warning(f"🧠 PRIORITY RESOURCES [{category_key}]: No candidates, returning empty list")
-        return []
+def _ranking_rules(normalized: Dict[str, Any]) -> str:
+    """Filtering requirements and ranking guidelines shared by all ranking prompts"""
+    # Extract user status for enhanced prompt
+    user_audience = normalized.get('audience', '')
+    user_housing_need = normalized.get('housing_need', '')
+    user_is_refugee = (user_audience == 'refugee_tps')
+    user_needs_affordable = (user_housing_need == 'affordable')
+
+    return (
+        "CRITICAL FILTERING REQUIREMENTS:\n"
+        f"- REFUGEE/IMMIGRATION RESOURCES: User is {'a refugee/TPS holder' if user_is_refugee else 'NOT a refugee/TPS holder'}. "
+        f"{'Include' if user_is_refugee else 'EXCLUDE'} resources specifically for refugees, asylum seekers, immigration services, or TPS holders.\n"
+        f"- AFFORDABLE HOUSING RESOURCES: User {'selected affordable housing' if user_needs_affordable else 'did NOT select affordable housing'}. "
+        f"{'Include' if user_needs_affordable else 'EXCLUDE'} resources offering Section 8, housing vouchers, subsidized housing, or rent assistance.\n\n"
+        "RANKING GUIDELINES:\n"
+        "- Only include resources that clearly fit the priority category\n"
+        "- For language-specific resources: match to user's primary language when relevant\n"
+        "- For cultural/community organizations: only include if they serve the user's linguistic community\n"
+        "- Exclude resources serving different cultural/ethnic communities unless they're general-purpose\n"
+        "- Prioritize practical relevance over demographic matching\n"
+        "- Quality over quantity: fewer highly relevant resources are better than many loose matches\n"
+    )
+
 
+def _build_ranking_prompt(normalized: Dict[str, Any], category_key: str, candidates: List[Resource], limit: int) -> str:
+    """Build the Gemini ranking prompt for one priority category's candidate slice"""
     candidate_snap: List[Tuple[str, str, str, str]] = []
     for r in candidates:
         candidate_snap.append((
@@ -592,89 +915,14 @@ async def rank_resources_llm_for_priority_category(db: Session, answers: Dict[st
         )
     candidates_str = "\n".join(candidates_str_parts)
 
-    # Extract user status for enhanced prompt
-    user_audience = normalized.get('audience', '')
-    user_housing_need = normalized.get('housing_need', '')
-    user_is_refugee = (user_audience == 'refugee_tps')
-    user_needs_affordable = (user_housing_need == 'affordable')
-
     # Special handling for First Things First category with proper 6-item distribution
-    distribution_guidance = ""
-    if category_key == "first_things_first":
-        immediate_needs = normalized.get('immediate_needs', [])
-        logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Raw immediate_needs: {immediate_needs}")
-        
-        if isinstance(immediate_needs, list) and len(immediate_needs) >= 1:
-            # Filter out 'none' if present
-            valid_needs = [need for need in immediate_needs if need and str(need).strip() and need != "none"]
-            logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Valid needs after filtering: {valid_needs}")
-            
-            if len(valid_needs) >= 1:
-                need_categories = _get_immediate_needs_categories(valid_needs)
-                logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Mapped need categories: {need_categories}")
-                
-                if len(valid_needs) == 6 and len(need_categories) == 6:
-                    # User selected all 6 immediate needs - ensure exactly 1 resource per category
-                    distribution_guidance = (
-                        f"\nSPECIAL DISTRIBUTION REQUIREMENT FOR FIRST THINGS FIRST:\n"
-                        f"User selected ALL 6 immediate needs from the survey.\n"
-                        f"Selected immediate needs: {', '.join(valid_needs)}\n"
-                        f"Need categories to represent: {', '.join(need_categories)}\n"
-                        f"CRITICAL: Return exactly 6 resources, with exactly 1 resource for each need category:\n"
-                        f"1. One resource for SOCIAL/COMMUNITY (meet_people) - Find a resource that helps with social connections, networking, community groups, meeting people\n"
-                        f"2. One resource for SERVICES (basic_services) - Find a resource for healthcare, banking, transportation, or basic services\n"
-                        f"3. One resource for EDUCATION (school_enrollment) - Find a resource for schools, childcare, education services, or child enrollment\n"
-                        f"4. One resource for LEGAL (legal_immigration) - Find a resource for legal aid, immigration assistance, or legal services\n"
-                        f"5. One resource for WELLNESS (mental_health) - Find a resource for mental health, counseling, wellness support, or mental health services\n"
-                        f"6. One resource for EMERGENCY (emergency_assistance) - Find a resource for food assistance, shelter, emergency services, or emergency support\n"
-                        f"SEARCH STRATEGY: Look through ALL candidate resources to find the best match for each category.\n"
-                        f"If a resource could fit multiple categories, assign it to the category that needs it most.\n"
-                        f"Each of the 6 resources MUST address a different immediate need category.\n"
-                        f"This distribution is MANDATORY for proper user experience - all 6 immediate need types must be covered.\n"
-                    )
-                elif len(valid_needs) > 1 and len(need_categories) > 1:
-                    # User selected multiple but not all immediate needs
-                    distribution_guidance = (
-                        f"\nSPECIAL DISTRIBUTION REQUIREMENT FOR FIRST THINGS FIRST:\n"
-                        f"User selected {len(valid_needs)} immediate needs from the 6 possible options.\n"
-                        f"Selected immediate needs: {', '.join(valid_needs)}\n"
-                        f"Need categories to represent: {', '.join(need_categories)}\n"
-                        f"CRITICAL: Distribute the 6 resources evenly across these {len(need_categories)} need categories.\n"
-                        f"Target: approximately {6 // len(need_categories)} resource(s) per category, ensuring all categories are represented.\n"
-                        f"Prioritize covering all selected need types rather than clustering multiple resources in one area.\n"
-                    )
-                elif len(valid_needs) == 1:
-                    # User selected only one immediate need - still provide guidance for focused results
-                    single_category = need_categories[0] if need_categories else "general"
-                    distribution_guidance = (
-                        f"\nFOCUSED REQUIREMENT FOR FIRST THINGS FIRST:\n"
-                        f"User selected only 1 immediate need: {valid_needs[0]}\n"
-                        f"Need category: {single_category}\n"
-                        f"CRITICAL: Return exactly 6 resources that are ALL highly relevant to {valid_needs[0]}.\n"
-                        f"Focus on finding the 6 BEST resources for this specific immediate need.\n"
-                        f"Ensure all 6 resources directly address: {valid_needs[0]}\n"
-                    )
-                
-                logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Distribution guidance generated: {bool(distribution_guidance)}")
-                if distribution_guidance:
-                    logger.info(f"🧠 FIRST THINGS FIRST DEBUG: Guidance content preview: {distribution_guidance[:200]}...")
+    distribution_guidance = _first_things_first_guidance(normalized) if category_key == "first_things_first" else ""
 
     prompt = (
         "Rank only the resources most relevant for the specific priority category shown below.\n"
         f"Priority category key: {category_key}.\n"
         "Disqualify items that are not a clear fit for this category.\n\n"
-        "CRITICAL FILTERING REQUIREMENTS:\n"
-        f"- REFUGEE/IMMIGRATION RESOURCES: User is {'a refugee/TPS holder' if user_is_refugee else 'NOT a refugee/TPS holder'}. "
-        f"{'Include' if user_is_refugee else 'EXCLUDE'} resources specifically for refugees, asylum seekers, immigration services, or TPS holders.\n"
-        f"- AFFORDABLE HOUSING RESOURCES: User {'selected affordable housing' if user_needs_affordable else 'did NOT select affordable housing'}. "
-        f"{'Include' if user_needs_affordable else 'EXCLUDE'} resources offering Section 8, housing vouchers, subsidized housing, or rent assistance.\n\n"
-        "RANKING GUIDELINES:\n"
-        "- Only include resources that clearly fit the priority category\n"
-        "- For language-specific resources: match to user's primary language when relevant\n"
-        "- For cultural/community organizations: only include if they serve the user's linguistic community\n"
-        "- Exclude resources serving different cultural/ethnic communities unless they're general-purpose\n"
-        "- Prioritize practical relevance over demographic matching\n"
-        "- Quality over quantity: fewer highly relevant resources are better than many loose matches\n"
+        + _ranking_rules(normalized)
         + distribution_guidance + "\n"
         "USER PROFILE:\n" + user_profile + "\n\n" +
         "USER'S STATED NEEDS:\n" + user_needs + "\n\n" +
@@ -684,46 +932,147 @@ async def rank_resources_llm_for_priority_category(db: Session, answers: Dict[st
         f"Include up to {max(limit * 2, 20)} items, prioritizing quality over quantity. Include fewer if most candidates aren't strong matches."
     )
 
-    ranked_names: List[str] = []
-    try:
-        _configure_gemini()
-        model = genai.GenerativeModel(RECOMMENDER_MODEL)
-        logger.debug(f"Making LLM call for priority category '{category_key}' with {len(candidate_snap)} candidates (limit: {limit})")
-        
-        full_prompt = f"System: You are an intelligent resource matching engine. Respond in JSON only.\n\nUser: {prompt}"
-        resp = await model.generate_content_async(
+    return prompt
+
+
+async def _generate_ranking_json(prompt: str, timeout: float) -> Dict[str, Any]:
+    """Send a ranking prompt to Gemini and parse its JSON response"""
+    _configure_gemini()
+    model = genai.GenerativeModel(RECOMMENDER_MODEL)
+    full_prompt = f"System: You are an intelligent resource matching engine. Respond in JSON only.\n\nUser: {prompt}"
+    resp = await asyncio.wait_for(
+        model.generate_content_async(
             full_prompt,
             generation_config=genai.types.GenerationConfig(
                 temperature=0.2,
                 response_mime_type="application/json"
             )
-        )
-        content = resp.text if resp and resp.text else "{}"
-        parsed = json.loads(content)
+        ),
+        timeout=timeout
+    )
+    content = resp.text if resp and resp.text else "{}"
+    parsed = json.loads(content)
+    return parsed if isinstance(parsed, dict) else {}
+
+
+async def _llm_rank_names(prompt: str, category_key: str, candidate_count: int, limit: int) -> List[str]:
+    """Ask Gemini to rank candidates; returns ranked resource names or [] on failure/timeout"""
+    try:
+        logger.debug(f"Making LLM call for priority category '{category_key}' with {candidate_count} candidates (limit: {limit})")
+        parsed = await _generate_ranking_json(prompt, RECOMMENDER_LLM_TIMEOUT_SECONDS)
         ranked_names = list(parsed.get("ranked_resource_names", []))
         logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: AI ranked {len(ranked_names)} resources")
+        return ranked_names
+    except asyncio.TimeoutError:
+        logger.warning(f"🧠 PRIORITY RESOURCES [{category_key}]: LLM ranking timed out after {RECOMMENDER_LLM_TIMEOUT_SECONDS}s. Falling back")
+        return []
     except Exception as e:
         logger.warning(f"🧠 PRIORITY RESOURCES [{category_key}]: LLM ranking failed: {e}. Falling back")
-        ranked_names = []
+        return []
+
+
+def _build_batch_ranking_prompt(normalized: Dict[str, Any], slices: Dict[str, Tuple[int, List[Resource]]]) -> str:
+    """Build one prompt ranking every priority category at once.
+
+    The user profile, needs and rules are sent once; candidates shared between
+    categories are listed once in a numbered catalog and each category refers
+    to its slice by number.
+    """
+    catalog: List[Resource] = []
+    number_by_id: Dict[str, int] = {}
+    category_lines: List[str] = []
+    for category_key, (limit, candidates) in slices.items():
+        numbers: List[int] = []
+        for r in candidates:
+            if r.id not in number_by_id:
+                catalog.append(r)
+                number_by_id[r.id] = len(catalog)
+            numbers.append(number_by_id[r.id])
+        category_lines.append(
+            f"- {category_key}: candidates {numbers}; include up to {max(limit * 2, 20)} items"
+        )
+
+    catalog_str = "\n".join(
+        f"[{n}] \"{r.resource_name or ''}\"\n  Summary: {r.summary or ''}\n  Category: {r.category or ''}/{r.subcategory or ''}\n"
+        for n, r in enumerate(catalog, start=1)
+    )
+
+    distribution_guidance = _first_things_first_guidance(normalized) if "first_things_first" in slices else ""
+
+    return (
+        "Rank the resources most relevant for EACH priority category listed below.\n"
+        "Each category may only use its own candidate numbers from the catalog.\n"
+        "Disqualify items that are not a clear fit for their category.\n\n"
+        + _ranking_rules(normalized)
+        + (("\nThe following applies to first_things_first only:" + distribution_guidance) if distribution_guidance else "")
+        + "\n"
+        "USER PROFILE:\n" + _generate_user_profile(normalized) + "\n\n" +
+        "USER'S STATED NEEDS:\n" + _generate_user_needs(normalized) + "\n\n" +
+        "CANDIDATE CATALOG:\n" + catalog_str + "\n" +
+        "PRIORITY CATEGORIES:\n" + "\n".join(category_lines) + "\n\n" +
+        "Return a JSON object with key 'rankings' mapping every category key above to a list of\n"
+        "resource names (exactly as written in the catalog), ordered most to least relevant for that category.\n"
+        "Only include clearly relevant resources, prioritizing quality over quantity."
+    )
+
+
+async def _llm_rank_names_batch(prompt: str, category_keys: List[str]) -> Optional[Dict[str, List[str]]]:
+    """Rank all categories with one Gemini call; returns None on failure/timeout"""
+    try:
+        logger.debug(f"Making batched LLM ranking call for {len(category_keys)} priority categories")
+        parsed = await _generate_ranking_json(prompt, RECOMMENDER_BATCH_TIMEOUT_SECONDS)
+        rankings = parsed.get("rankings")
+        if not isinstance(rankings, dict):
+            raise ValueError("response has no 'rankings' object")
+        result = {
+            key: [str(name) for name in rankings.get(key) or []]
+            for key in category_keys
+            if isinstance(rankings.get(key), list)
+        }
+        logger.info(f"🧠 BATCH RANKING: AI ranked {len(result)}/{len(category_keys)} categories in one call")
+        return result
+    except asyncio.TimeoutError:
+        logger.warning(f"🧠 BATCH RANKING: timed out after {RECOMMENDER_BATCH_TIMEOUT_SECONDS}s")
+        return None
+    except Exception as e:
+        logger.warning(f"🧠 BATCH RANKING: failed: {e}")
+        return None
+
+
+def _finalize_ranked_resources(
+    candidates: List[Resource],
+    ranked_names: List[str],
+    normalized: Dict[str, Any],
+    category_key: str,
+    limit: int,
+    target_display: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Filter, fill and order candidates given an LLM ranking (empty ranking = deterministic order)"""
+    final_limit = target_display if target_display is not None else limit
 
     # Apply comprehensive filtering and smart distribution for First Things First
     logger.debug(f"🧠 PRIORITY RESOURCES [{category_key}]: Applying comprehensive filtering (cultural, refugee, affordable housing)")
     
+    # Same rules as _should_include_resource, evaluated against precomputed flags
+    relevance_mask = user_relevance_mask(normalized)
     name_to_resource: Dict[str, Resource] = { (r.resource_name or ''): r for r in candidates }
     all_filtered: List[Resource] = []
     seen_ids = set()
+    # Blend keys are kept locally (not on the shared ORM objects) since several
+    # categories may be finalized from the same resources
+    blend_keys: Dict[str, Tuple[int, int, str]] = {}
     
     # First pass: ranked items with comprehensive filtering (collect all valid resources)
     for idx, name in enumerate(ranked_names):
         r = name_to_resource.get(name)
         if r and r.id not in seen_ids:
-            if _should_include_resource(r.resource_name or '', r.summary or '', normalized):
+            if flags_allowed(_resource_flags(r), relevance_mask):
                 # Attach a blended score using LLM order, then DB priority (recency removed)
                 llm_rank = idx  # lower is better
                 db_priority = -(r.priority or 0)  # lower is better after negation
                 name_tie = (r.resource_name or '').lower()
                 # Composite tuple for later sorting if needed
-                setattr(r, "_blend_key", (llm_rank, db_priority, name_tie))
+                blend_keys[r.id] = (llm_rank, db_priority, name_tie)
                 all_filtered.append(r)
                 seen_ids.add(r.id)
             else:
@@ -742,10 +1091,10 @@ async def rank_resources_llm_for_priority_category(db: Session, answers: Dict[st
         for r in deterministic:
             if len(all_filtered) >= limit:
                 break
-            if _should_include_resource(r.resource_name or '', r.summary or '', normalized):
+            if flags_allowed(_resource_flags(r), relevance_mask):
                 # LLM didn't rank this; push behind LLM-ranked by using large llm_rank
                 name_tie = (r.resource_name or '').lower()
-                setattr(r, "_blend_key", (10**6, -(r.priority or 0), name_tie))
+                blend_keys[r.id] = (10**6, -(r.priority or 0), name_tie)
                 all_filtered.append(r)
             else:
                 logger.debug(f"🧠 FILTERING: Excluded fallback resource: {r.resource_name}")
@@ -763,7 +1112,7 @@ async def rank_resources_llm_for_priority_category(db: Session, answers: Dict[st
         try:
             ordered = sorted(
                 all_filtered,
-                key=lambda x: getattr(x, "_blend_key", (10**6, -(x.priority or 0), (x.resource_name or "").lower()))
+                key=lambda x: blend_keys.get(x.id, (10**6, -(x.priority or 0), (x.resource_name or "").lower()))
             )
         except Exception:
             ordered = all_filtered
@@ -774,6 +1123,120 @@ async def rank_resources_llm_for_priority_category(db: Session, answers: Dict[st
     logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Returning {len(final_ordered)} filtered resources (target: {final_limit}, available: {len(ordered)})")
     return [_serialize_resource(r) for r in final_ordered]
 
+
+async def _rank_all_categories_batch(
+    answers: Dict[str, Any],
+    prefetched: Dict[str, Tuple[int, int, List[Resource]]]
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Rank all prefetched categories with one LLM call.
+
+    Returns None if the call fails so the caller can use per-category ranking.
+    Categories missing from the response use deterministic ordering.
+    """
+    normalized = _normalize_answers(answers or {})
+    normalized.pop('tech_comfort', None)
+
+    # Hybrid mode: semantic pre-ranking trims each slice and backs up missing categories
+    semantic_names: Dict[str, List[str]] = {}
+    slices: Dict[str, Tuple[int, List[Resource]]] = {}
+    for key, (category_limit, _target, candidates) in prefetched.items():
+        if not candidates:
+            continue
+        if RECOMMENDER_RANKING_MODE == "hybrid":
+            semantic = _semantic_order(normalized, key, candidates)
+            semantic_names[key] = [r.resource_name or '' for r in semantic]
+            candidates = semantic[:max(category_limit, RECOMMENDER_SEMANTIC_PREFILTER)]
+        slices[key] = (category_limit, candidates)
+    rankings: Dict[str, List[str]] = {}
+    if slices:
+        prompt = _build_batch_ranking_prompt(normalized, slices)
+        rankings = await _llm_rank_names_batch(prompt, list(slices.keys()))
+        if rankings is None:
+            return None
+        for key, names in semantic_names.items():
+            if not rankings.get(key):
+                rankings[key] = names
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for category_key, (category_limit, target_display, candidates) in prefetched.items():
+        resources = _finalize_ranked_resources(
+            candidates, rankings.get(category_key, []), normalized, category_key, category_limit, target_display
+        ) if candidates else []
+        if rankings.get(category_key):
+            await _store_ranking(await _ranking_cache_key(normalized, category_key, category_limit, target_display), resources)
+        results[category_key] = {
+            "resources": resources,
+            "source": "ai",
+            "generated_at": datetime.utcnow().isoformat()
+        }
+        logger.info(f"🧠 PRE-GENERATED RESOURCES [{category_key}]: {len(resources)} items (limit: {category_limit}, batched)")
+    return results
+
+
+async def rank_resources_llm_for_priority_category(
+    db: Session,
+    answers: Dict[str, Any],
+    category_key: str,
+    limit: int,
+    target_display: Optional[int] = None,
+    candidates: Optional[List[Resource]] = None
+) -> List[Dict[str, Any]]:
+    """Rerank database candidates for a specific priority category key.
+
+    Uses the same LLM ranking flow but constrains candidates to a category-specific
+    slice. Falls back to deterministic ordering if AI fails or times out.
+    
+    Special handling for "first_things_first" category to ensure even distribution
+    across the 6 immediate needs when multiple are selected.
+    
+    Pass prefetched `candidates` to skip the DB query (used when ranking several
+    categories concurrently).
+    """
+    normalized = _normalize_answers(answers or {})
+    normalized.pop('tech_comfort', None)
+
+    # Identical answers against the same catalog version get the same ranking
+    cache_key = await _ranking_cache_key(normalized, category_key, limit, target_display)
+    cached = await _get_cached_ranking(cache_key)
+    if cached is not None:
+        return cached
+
+    # Set up display limit for final results
+    final_limit = target_display if target_display is not None else limit
+    
+    # For First Things First, we get more resources from LLM but filter to best distributed ones
+    if category_key == "first_things_first":
+        logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Requesting {limit} resources from LLM, will filter to top {final_limit} with proper distribution")
+
+    if candidates is None:
+        candidates = await run_blocking(_fetch_candidates_for_priority_key, db, category_key, limit, normalized)
+    logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Found {len(candidates)} category-constrained candidates")
+
+    if not candidates:
+        logger.warning(f"🧠 PRIORITY RESOURCES [{category_key}]: No candidates, returning empty list")
+        return []
+
+    if RECOMMENDER_RANKING_MODE == "semantic":
+        ranked_names = [r.resource_name or '' for r in _semantic_order(normalized, category_key, candidates)]
+        logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Semantic ranking of {len(ranked_names)} candidates")
+    else:
+        prompt_candidates = candidates
+        semantic_names: List[str] = []
+        if RECOMMENDER_RANKING_MODE == "hybrid":
+            semantic = _semantic_order(normalized, category_key, candidates)
+            semantic_names = [r.resource_name or '' for r in semantic]
+            prompt_candidates = semantic[:max(limit, RECOMMENDER_SEMANTIC_PREFILTER)]
+        prompt = _build_ranking_prompt(normalized, category_key, prompt_candidates, limit)
+        ranked_names = await _llm_rank_names(prompt, category_key, len(prompt_candidates), limit)
+        if not ranked_names and semantic_names:
+            logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Using semantic ranking as fallback")
+            ranked_names = semantic_names
+    resources = _finalize_ranked_resources(candidates, ranked_names, normalized, category_key, limit, target_display)
+    # Only AI/semantic rankings are cached; deterministic fallbacks should retry the LLM next time
+    if ranked_names:
+        await _store_ranking(cache_key, resources)
+    return resources
+
 async def generate_personalized_description_llm(answers: Dict[str, Any]) -> str:
     """Generate a personalized 'You are a...' description using AI.
     
@@ -889,110 +1352,7 @@ async def generate_personalized_description_llm(answers: Dict[str, Any]) -> str:
 
 def generate_personalized_description_llm_blocking(answers: Dict[str, Any]) -> str:
     """Synchronous wrapper for AI description generation."""
-    logger.info("🧠 AI DESCRIPTION: Starting synchronous AI description generation")
-    
-    normalized = _normalize_answers(answers or {})
-    logger.debug(f"🧠 AI DESCRIPTION: Input data - {normalized}")
-    
-    # Build a comprehensive user context for the AI
-    user_context_parts = []
-    
-    # Basic profile information
-    audience = normalized.get('audience', '')
-    if audience:
-        user_context_parts.append(f"Audience/Situation: {audience}")
-    
-    professional_status = normalized.get('professional_status', '')
-    if professional_status:
-        user_context_parts.append(f"Professional Status: {professional_status}")
-    
-    primary_language = normalized.get('primary_language', 'en')
-    if primary_language and primary_language != 'en':
-        user_context_parts.append(f"Primary Language: {primary_language}")
-    
-    timeline = normalized.get('timeline', '')
-    if timeline:
-        user_context_parts.append(f"Timeline/Arrival Status: {timeline}")
-    
-    # Specific needs
-    housing_need = normalized.get('housing_need', '')
-    if housing_need and housing_need != 'secured':
-        user_context_parts.append(f"Housing Need: {housing_need}")
-    
-    employment = normalized.get('employment', '')
-    if employment and employment not in ['no_support_needed']:
-        user_context_parts.append(f"Employment Status: {employment}")
-    
-    language_support = normalized.get('language_support', '')
-    if language_support and 'no language support' not in str(language_support).lower():
-        user_context_parts.append(f"Language Support Need: {language_support}")
-    
-    community_priorities = normalized.get('community_priorities', [])
-    if isinstance(community_priorities, list) and community_priorities:
-        clean_priorities = [str(p).strip() for p in community_priorities if p and str(p).strip()]
-        if clean_priorities:
-            user_context_parts.append(f"Community Priorities: {', '.join(clean_priorities)}")
-    
-    immediate_needs = normalized.get('immediate_needs', [])
-    if isinstance(immediate_needs, list) and immediate_needs:
-        clean_needs = [str(n).strip() for n in immediate_needs if n and str(n).strip()]
-        if clean_needs:
-            user_context_parts.append(f"Immediate Needs: {', '.join(clean_needs)}")
-    
-    user_context = "\n".join(f"- {part}" for part in user_context_parts)
-    logger.debug(f"🧠 AI DESCRIPTION: Built user context with {len(user_context_parts)} elements")
-    
-    prompt = (
-        "Based on the user profile information below, generate a personalized description in the exact format:\n"
-        "'You are a [descriptive profile] looking for [specific needs].'\n\n"
-        "Requirements:\n"
-        "- Start with 'You are a' and end with a period\n"
-        "- Be specific and personalized based on the provided information\n"
-        "- Focus on the most relevant aspects of their identity and current situation\n"
-        "- Include their primary needs in a natural, conversational way\n"
-        "- Keep it concise but comprehensive (1-2 sentences max)\n"
-        "- Use inclusive, welcoming language\n"
-        "- If they're a newcomer/immigrant, acknowledge their journey\n"
-        "- Connect their background to their current needs\n"
-        "- IMPORTANT: Do not include any references to race, ethnicity, national origin, or cultural background\n"
-        "- Focus on professional status, needs, timeline, and goals rather than demographic characteristics\n\n"
-        "USER PROFILE:\n" + user_context + "\n\n" +
-        "Generate only the personalized description, nothing else."
-    )
-    
-    try:
-        _configure_gemini()
-        model = genai.GenerativeModel(RECOMMENDER_MODEL)
-        logger.info(f"🧠 AI DESCRIPTION: Making Gemini API call using model {RECOMMENDER_MODEL}")
-        logger.debug(f"🧠 AI DESCRIPTION: Prompt length: {len(prompt)} characters")
-        
-        full_prompt = f"System: You are an expert at creating personalized, empathetic descriptions for newcomers and immigrants. Create natural, welcoming descriptions that acknowledge their unique journey and needs. Never include references to race, ethnicity, national origin, or cultural background - focus on professional status, goals, and specific needs instead.\n\nUser: {prompt}"
-        
-        # Use synchronous generate_content instead of async version
-        resp = model.generate_content(
-            full_prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=200
-            )
-        )
-        content = resp.text if resp and resp.text else ""
-        description = content.strip()
-        
-        logger.info(f"🧠 AI DESCRIPTION: ✅ Successfully generated description: '{description}'")
-        
-        # Basic validation - ensure it follows the expected format
-        if description and description.startswith("You are") and description.endswith("."):
-            logger.info("🧠 AI DESCRIPTION: ✅ Format validation passed")
-            return description
-        else:
-            logger.warning(f"🧠 AI DESCRIPTION: ❌ Format validation failed - Description: '{description}'")
-            logger.warning("🧠 AI DESCRIPTION: Expected format: 'You are a... looking for...'")
-            return ""
-            
-    except Exception as e:
-        logger.error(f"🧠 AI DESCRIPTION: ❌ Gemini API call failed: {e}")
-        return ""
+    return run_sync(generate_personalized_description_llm(answers))
 
 
 def _generate_subtitle_for_category(category_key: str, normalized_answers: Dict[str, Any]) -> str:
@@ -1233,20 +1593,13 @@ async def generate_priority_categories_llm(answers: Dict[str, Any]) -> Dict[str,
 
 def generate_priority_categories_llm_blocking(answers: Dict[str, Any]) -> Dict[str, Any]:
     """Synchronous wrapper for category generation - simple since deterministic now."""
-    return asyncio.run(generate_priority_categories_llm(answers))
+    return run_sync(generate_priority_categories_llm(answers))
 
 
 def generate_all_priority_resources_llm_blocking(db: Session, answers: Dict[str, Any], priority_categories: List[Dict[str, Any]], limit: int = 12) -> Dict[str, Dict[str, Any]]:
     """Synchronous wrapper for priority resources generation."""
     try:
-        # Always create a new event loop to avoid conflicts
-        new_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(new_loop)
-        try:
-            return new_loop.run_until_complete(generate_all_priority_resources_llm(db, answers, priority_categories, limit))
-        finally:
-            new_loop.close()
-            asyncio.set_event_loop(None)
+        return run_sync(generate_all_priority_resources_llm(db, answers, priority_categories, limit))
     except Exception as e:
         logger.error(f"🧠 PRIORITY RESOURCES: ❌ Synchronous wrapper failed: {e}")
         return {}
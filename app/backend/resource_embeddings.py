@@ -0,0 +1,94 @@
+"""
+Local text embeddings for resources.
+
+A dependency-free hashed bag-of-words embedding (unigrams + bigrams,
+sublinear term frequency, signed feature hashing, L2-normalized). It needs
+no model download or network access, is deterministic across processes,
+and is cheap enough to compute for every resource at CSV import. The
+recommender uses it to rank candidates by cosine similarity to a user
+profile vector when Gemini is disabled, slow or failing.
+
+Embeddings are stored in `resources.embedding` (REAL[]). Changing
+EMBEDDING_DIM or the feature scheme requires re-running the backfill
+migration with --recompute.
+"""
+import hashlib
+import math
+import re
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - similarity falls back to pure Python
+    np = None  # type: ignore
+
+EMBEDDING_DIM = 256
+BIGRAM_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this',
+    'to', 'we', 'with', 'you', 'your', 'who', 'will', 'can', 'all', 'more', 'also',
+    'na', 'none', 'other',
+})
+
+
+def _tokens(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall((text or '').lower()):
+        if len(token) < 2 or token in _STOPWORDS:
+            continue
+        # Light plural folding so "services"/"service" share a feature
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _bucket(feature: str, dim: int):
+    digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+    value = int.from_bytes(digest, 'little')
+    return value % dim, (1.0 if (value >> 63) & 1 else -1.0)
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Embed free text into a unit-length vector (all zeros for empty text)"""
+    tokens = _tokens(text)
+    counts: Dict[str, float] = {}
+    for token in tokens:
+        counts[token] = counts.get(token, 0.0) + 1.0
+    for left, right in zip(tokens, tokens[1:]):
+        bigram = f"{left} {right}"
+        counts[bigram] = counts.get(bigram, 0.0) + BIGRAM_WEIGHT
+
+    vector = [0.0] * dim
+    for feature, count in counts.items():
+        idx, sign = _bucket(feature, dim)
+        weight = (1.0 + math.log(count)) if count >= 1.0 else count
+        vector[idx] += sign * weight
+
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0.0:
+        return vector
+    return [round(v / norm, 6) for v in vector]
+
+
+def resource_embedding_text(resource_name: Optional[str], summary: Optional[str], subcategory: Optional[str]) -> str:
+    """Text embedded for a resource; the name is repeated to weight it above the summary"""
+    name = resource_name or ''
+    return f"{name} {name} {subcategory or ''} {summary or ''}"
+
+
+def embed_resource(resource_name: Optional[str], summary: Optional[str], subcategory: Optional[str]) -> List[float]:
+    return embed_text(resource_embedding_text(resource_name, summary, subcategory))
+
+
+def cosine_scores(query: Sequence[float], matrix: Sequence[Sequence[float]]) -> List[float]:
+    """Cosine similarity of a unit query vector against unit row vectors"""
+    if not matrix:
+        return []
+    if np is not None:
+        return (np.asarray(matrix, dtype=np.float32) @ np.asarray(query, dtype=np.float32)).tolist()
+    return [sum(q * r for q, r in zip(query, row)) for row in matrix]
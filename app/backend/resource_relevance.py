@@ -0,0 +1,138 @@
+"""
+Keyword-based relevance features for resources.
+
+The recommender hides refugee-specific, affordable-housing and
+culture-specific community resources from users they do not apply to. The
+keyword scans behind those rules depend only on a resource's name and
+summary, so they are computed once at import time and stored as a bitmask
+in `resources.relevance_flags`:
+
+- bit 0: refugee/immigration-specific content
+- bit 1: affordable/subsidized housing content
+- bits 4+: 1-based index of the first matching CULTURAL_PATTERNS entry (0 = none)
+
+Per-user filtering is then a mask comparison over the flags.
+"""
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+# Keywords that indicate refugee-specific resources
+REFUGEE_KEYWORDS = [
+    'refugee', 'asylum', 'immigrant services', 'resettlement', 'newcomer services',
+    'temporary protected status', 'tps', 'immigration legal', 'immigration attorney',
+    'immigration law', 'visa assistance', 'green card', 'naturalization',
+    'citizenship classes', 'refugee assistance', 'refugee support',
+    'immigration services', 'deportation defense', 'asylum seekers'
+]
+
+# Keywords that indicate affordable/subsidized housing resources
+AFFORDABLE_HOUSING_KEYWORDS = [
+    'section 8', 'section eight', 'housing voucher', 'subsidized housing',
+    'affordable housing', 'low income housing', 'income-based rent',
+    'rent assistance', 'housing assistance', 'free housing', 'reduced rent',
+    'housing subsidy', 'public housing', 'housing authority', 'hud',
+    'income qualified', 'sliding scale rent', 'rental assistance'
+]
+
+# Language mapping for cultural relevance
+LANGUAGE_TO_CULTURE = {
+    'es': ['hispanic', 'latino', 'spanish'],
+    'zh': ['chinese', 'asian'],
+    'ar': ['arabic', 'arab', 'middle eastern'],
+    'fr': ['french'],
+    'nepali': ['nepali', 'bhutanese'],
+    'dari': ['afghan', 'dari'],
+    'pashto': ['afghan', 'pashto'],
+    'sw': ['swahili', 'african', 'east african'],
+    'swahili': ['swahili', 'african', 'east african'],
+    'uz': ['uzbek', 'central asian'],
+    'uzbek': ['uzbek', 'central asian'],
+    'en': ['english', 'american', 'british'],
+    # Handle compound language codes from frontend survey
+    'ne_dz': ['nepali', 'bhutanese', 'afghan', 'dari'],
+    'fa_ps': ['afghan', 'dari', 'pashto'],
+}
+
+# Known cultural organization patterns that should be filtered.
+# Order matters: the first matching pattern decides. Only append new patterns,
+# since stored flags reference patterns by position.
+CULTURAL_PATTERNS = [
+    'african chamber', 'asian chamber', 'hispanic chamber', 'latino chamber',
+    'chinese association', 'korean association', 'vietnamese association',
+    'african american', 'black chamber', 'jewish federation',
+    'indian association', 'pakistani association', 'bangladeshi association',
+    'swahili association', 'east african', 'african community',
+    'uzbek association', 'central asian', 'uzbek community',
+    'english speaking', 'british association', 'american chamber'
+]
+
+FLAG_REFUGEE = 1 << 0
+FLAG_AFFORDABLE_HOUSING = 1 << 1
+CULTURAL_PATTERN_SHIFT = 4
+
+
+def has_refugee_content(text: str) -> bool:
+    return any(keyword in text for keyword in REFUGEE_KEYWORDS)
+
+
+def has_affordable_housing_content(text: str) -> bool:
+    return any(keyword in text for keyword in AFFORDABLE_HOUSING_KEYWORDS)
+
+
+def cultural_pattern_index(text: str) -> Optional[int]:
+    """Index of the first cultural pattern found in text, or None"""
+    for idx, pattern in enumerate(CULTURAL_PATTERNS):
+        if pattern in text:
+            return idx
+    return None
+
+
+def compute_relevance_flags(resource_name: Optional[str], summary: Optional[str]) -> int:
+    """Compute the relevance bitmask for a resource's name and summary"""
+    if not resource_name and not summary:
+        return 0
+    text = f"{resource_name or ''} {summary or ''}".lower()
+    flags = 0
+    if has_refugee_content(text):
+        flags |= FLAG_REFUGEE
+    if has_affordable_housing_content(text):
+        flags |= FLAG_AFFORDABLE_HOUSING
+    pattern_idx = cultural_pattern_index(text)
+    if pattern_idx is not None:
+        flags |= (pattern_idx + 1) << CULTURAL_PATTERN_SHIFT
+    return flags
+
+
+def allowed_cultural_patterns(user_language: str) -> FrozenSet[int]:
+    """1-based cultural pattern ids that match the user's language community"""
+    user_cultures = LANGUAGE_TO_CULTURE.get(user_language, [])
+    return frozenset(
+        idx + 1 for idx, pattern in enumerate(CULTURAL_PATTERNS)
+        if any(culture in pattern for culture in user_cultures)
+    )
+
+
+def user_relevance_mask(answers: Dict[str, Any]) -> Tuple[int, FrozenSet[int]]:
+    """Return (blocked_bits, allowed_pattern_ids) for normalized survey answers.
+
+    A resource is included when `flags & blocked_bits == 0` and its cultural
+    pattern id is 0 or in allowed_pattern_ids.
+    """
+    user_language = answers.get('primary_language', 'en')
+    user_is_refugee = (answers.get('audience', '') == 'refugee_tps')
+    user_needs_affordable = (answers.get('housing_need', '') == 'affordable')
+
+    blocked = 0
+    if not user_is_refugee:
+        blocked |= FLAG_REFUGEE
+    if not user_needs_affordable:
+        blocked |= FLAG_AFFORDABLE_HOUSING
+    return blocked, allowed_cultural_patterns(user_language)
+
+
+def flags_allowed(flags: int, mask: Tuple[int, FrozenSet[int]]) -> bool:
+    """Scalar check of one resource's flags against a user mask"""
+    blocked, allowed_patterns = mask
+    if flags & blocked:
+        return False
+    pattern_id = flags >> CULTURAL_PATTERN_SHIFT
+    return pattern_id == 0 or pattern_id in allowed_patterns
@@ -18,6 +18,11 @@ from database import get_db, Resource, User, Bookmark, create_tables, engine, Re
 from translation_service import translation_service, SUPPORTED_LANGUAGES
 from auth_middleware import require_admin_user
 from cache_service import cache
+from blocking_io import run_blocking
+import translation_jobs
+from pagination import resource_cursor, decode_resource_cursor, resource_keyset_sql
+from resource_relevance import compute_relevance_flags
+from resource_embeddings import embed_resource
 from rate_limit_service import limiter, RATE_LIMIT_AI_PER_MINUTE
 
 router = APIRouter()
@@ -47,6 +52,7 @@ async def trigger_demo_user_recommendations(db: Session) -> Dict[str, Any]:
         
         processed_count = 0
         errors = []
+        subtitle_translations = []
         
         # Import the recommendation functions
         from recommender_llm import generate_priority_categories_llm, generate_all_priority_resources_llm
@@ -82,17 +88,9 @@ async def trigger_demo_user_recommendations(db: Session) -> Dict[str, Any]:
                 user.onboarding_profile = profile
                 processed_count += 1
                 
-                # Trigger translation of category subtitles for demo user
+                # Queue translation of category subtitles once the profiles are committed
                 if priority_categories:
-                    try:
-                        from translation_service import translation_service
-                        from routers.onboarding import start_category_subtitle_translation_task
-                        logger.info(f"🌐 TRANSLATION: Starting translation for {len(priority_categories)} category subtitles for demo user {user.id}")
-                        import asyncio
-                        asyncio.create_task(start_category_subtitle_translation_task(user.id, priority_categories))
-                        logger.info(f"🌐 TRANSLATION: Translation task created for category subtitles for demo user {user.id}")
-                    except Exception as e:
-                        logger.warning(f"🌐 TRANSLATION: Failed to start category subtitle translation for demo user {user.id}: {e}")
+                    subtitle_translations.append((user.id, priority_categories))
                 
                 logger.info(f"🎭 DEMO RECOMMENDATIONS: ✅ Successfully updated recommendations for {user.email}")
                 
@@ -106,6 +104,12 @@ async def trigger_demo_user_recommendations(db: Session) -> Dict[str, Any]:
             db.commit()
             logger.info(f"🎭 DEMO RECOMMENDATIONS: ✅ Successfully committed recommendations for {processed_count} demo users")
         
+        for user_id, priority_categories in subtitle_translations:
+            try:
+                translation_jobs.enqueue_category_subtitles(db, user_id, priority_categories)
+            except Exception as e:
+                logger.warning(f"🌐 TRANSLATION: Failed to queue category subtitle translation for demo user {user_id}: {e}")
+        
         return {
             "processed": processed_count,
             "errors": errors,
@@ -752,6 +756,8 @@ def import_csv_data_batch(
         # Invalidate cache and recompute publishing counters after import
         if hasattr(cache, 'invalidate_resources_cache'):
             cache.invalidate_resources_cache()
+        from recommender_llm import rebuild_candidate_index
+        rebuild_candidate_index(db)
             
     except Exception as e:
         db.rollback()
@@ -877,6 +883,17 @@ def process_batch(
                     result.warnings.append(
                         f"✅ Row {row_number}: Updated existing resource '{resource_data['resource_name']}' with new information"
                     )
+
+                # Derived recommender features are kept out of resource_data so they never
+                # count as a content change (which would unpublish the resource)
+                legacy_row = existing_resource.relevance_flags is None
+                relevance_flags = compute_relevance_flags(existing_resource.resource_name, existing_resource.summary)
+                if existing_resource.relevance_flags != relevance_flags:
+                    existing_resource.relevance_flags = relevance_flags
+                if legacy_row or {'resource_name', 'summary', 'subcategory'} & set(changed_fields):
+                    existing_resource.embedding = embed_resource(
+                        existing_resource.resource_name, existing_resource.summary, existing_resource.subcategory
+                    )
             else:
                 # Create new resource. Ensure unique ID if base name-slug already exists for a different link
                 base_id_conflict = (
@@ -896,6 +913,8 @@ def process_batch(
                     resource_data['id'] = proposed_id
                     resource_id = proposed_id
                 resource = Resource(**resource_data)
+                resource.relevance_flags = compute_relevance_flags(resource.resource_name, resource.summary)
+                resource.embedding = embed_resource(resource.resource_name, resource.summary, resource.subcategory)
                 db.add(resource)
                 result.new_records += 1
                 
@@ -1046,14 +1065,16 @@ async def publish_ready_resources(
         db.commit()
 
         # Invalidate caches after publishing
-        if hasattr(cache, 'invalidate_resources_cache'):
-            cache.invalidate_resources_cache()
+        if hasattr(cache, 'ainvalidate_resources_cache'):
+            await cache.ainvalidate_resources_cache()
+        from recommender_llm import rebuild_candidate_index
+        await run_blocking(rebuild_candidate_index, db)
 
         # Trigger translations for ready resources that need them
         translation_results = {"triggered": 0, "already_complete": 0, "errors": []}
         try:
             logger.info("🌐 PUBLISH: Triggering translations for resources needing translation")
-            resource_ids = translation_service.identify_resources_needing_translation(db)
+            resource_ids = await run_blocking(translation_service.identify_resources_needing_translation, db)
             if resource_ids:
                 logger.info(f"🌐 PUBLISH: Found {len(resource_ids)} resources needing translation")
                 results = await translation_service.translate_resources_batch(
@@ -1418,7 +1439,8 @@ async def import_resources_csv(
                 )
         
         # Import data using batch processing
-        result = import_csv_data_batch(csv_content, db)
+        # Parsing, upserts and the index rebuild are all sync; keep them off the event loop
+        result = await run_blocking(import_csv_data_batch, csv_content, db)
         
         # Log import activity
         logger.info(f"CSV import by admin {current_user.email}: "
@@ -1613,9 +1635,22 @@ def get_all_resources(
     current_user: User = Depends(require_admin_user),
     db: Session = Depends(get_db),
     page: int = 1,
-    limit: int = 50
+    limit: int = 50,
+    cursor: Optional[str] = None
 ):
-    """Get paginated list of all resources for admin view only (no editing)"""
+    """Get paginated list of all resources for admin view only (no editing).
+
+    Pass `cursor` (empty for the first page) to page with a continuation token
+    on (priority DESC NULLS LAST, resource_name, id); the total is then the
+    planner's row estimate instead of an exact COUNT.
+    """
+    cursor_mode = cursor is not None
+    cursor_values = None
+    if cursor:
+        try:
+            cursor_values = decode_resource_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     try:
         # If resources table is missing, return an empty result set instead of 500
@@ -1633,8 +1668,16 @@ def get_all_resources(
         # Calculate offset for pagination
         offset = (page - 1) * limit
 
-        # Total count via raw SQL to avoid ORM column drift issues
-        total_resources = db.execute(sql_text("SELECT COUNT(1) FROM resources")).scalar() or 0
+        if cursor_mode:
+            # Planner estimate avoids a full scan per page; fall back to COUNT on fresh tables
+            total_resources = db.execute(sql_text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = 'resources'::regclass"
+            )).scalar()
+            if total_resources is None or total_resources < 0:
+                total_resources = db.execute(sql_text("SELECT COUNT(1) FROM resources")).scalar() or 0
+        else:
+            # Total count via raw SQL to avoid ORM column drift issues
+            total_resources = db.execute(sql_text("SELECT COUNT(1) FROM resources")).scalar() or 0
 
         # Build resilient SELECT that substitutes NULL for any missing columns
         existing_cols = set(get_existing_columns(db, "resources"))
@@ -1659,19 +1702,34 @@ def get_all_resources(
             (col if col in existing_cols else f"NULL AS {col}") for col in required_cols
         ]
 
-        # Order by updated_at if it exists, else created_at; both NULL-safe
-        # Compute order expression based on available columns
-        if "updated_at" in existing_cols:
-            order_expr = "updated_at DESC NULLS LAST"
-        elif "created_at" in existing_cols:
-            order_expr = "created_at DESC NULLS LAST"
+        if cursor_mode:
+            where_sql = ""
+            params: Dict[str, Any] = {"limit": limit + 1}
+            if cursor_values:
+                keyset_sql, keyset_params = resource_keyset_sql(cursor_values)
+                where_sql = f"WHERE {keyset_sql} "
+                params.update(keyset_params)
+            sql = sql_text(
+                f"SELECT {', '.join(select_parts)} FROM resources {where_sql}"
+                "ORDER BY priority DESC NULLS LAST, resource_name ASC, id ASC LIMIT :limit"
+            )
+            rows = db.execute(sql, params).mappings().all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
         else:
-            order_expr = "id DESC"
+            # Order by updated_at if it exists, else created_at; both NULL-safe
+            # Compute order expression based on available columns
+            if "updated_at" in existing_cols:
+                order_expr = "updated_at DESC NULLS LAST"
+            elif "created_at" in existing_cols:
+                order_expr = "created_at DESC NULLS LAST"
+            else:
+                order_expr = "id DESC"
 
-        sql = sql_text(
-            f"SELECT {', '.join(select_parts)} FROM resources ORDER BY {order_expr} OFFSET :offset LIMIT :limit"
-        )
-        rows = db.execute(sql, {"offset": offset, "limit": limit}).mappings().all()
+            sql = sql_text(
+                f"SELECT {', '.join(select_parts)} FROM resources ORDER BY {order_expr} OFFSET :offset LIMIT :limit"
+            )
+            rows = db.execute(sql, {"offset": offset, "limit": limit}).mappings().all()
 
         resource_list = []
         for r in rows:
@@ -1692,6 +1750,22 @@ def get_all_resources(
                 "translation_status": r.get("translation_status") or "not_started",
             })
         
+        if cursor_mode:
+            last = rows[-1] if rows else None
+            return {
+                "resources": resource_list,
+                "pagination": {
+                    "total": total_resources,
+                    "total_is_estimate": True,
+                    "limit": limit,
+                    "next_cursor": (
+                        resource_cursor(last.get("priority"), last.get("resource_name"), last.get("id"))
+                        if has_more and last is not None else None
+                    ),
+                    "has_more": has_more
+                }
+            }
+        
         return {
             "resources": resource_list,
             "pagination": {
@@ -1725,7 +1799,8 @@ def get_translation_status(
             "status": "success",
             "data": status,
             "supported_languages": SUPPORTED_LANGUAGES,
-            "translation_service_available": translation_service.is_available()
+            "translation_service_available": translation_service.is_available(),
+            "provider_latency": translation_service.get_latency_stats()
         }
     except Exception as e:
         logger.error(f"Error getting translation status: {e}")
@@ -1760,9 +1835,17 @@ def get_translation_progress(
             
             resources[resource_id]['languages'][translation.language_code] = translation.translation_status
         
+        try:
+            jobs = translation_jobs.progress(db)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Error reading translation job progress: {e}")
+            jobs = None
+        
         return {
             "status": "success",
             "resources": resources,
+            "jobs": jobs,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -1810,7 +1893,7 @@ async def translate_resources(
     try:
         # If no specific resources provided, find ones needing translation
         if not resource_ids:
-            resource_ids = translation_service.identify_resources_needing_translation(db)
+            resource_ids = await run_blocking(translation_service.identify_resources_needing_translation, db)
             
         if not resource_ids:
             return {
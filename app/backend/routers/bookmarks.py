@@ -5,8 +5,9 @@ from sqlalchemy.exc import IntegrityError
 import logging
 import json
 
-from database import get_db, Bookmark, Resource, User, ResourceTranslation
+from database import get_db, Bookmark, Resource, User
 from auth_middleware import get_current_user
+from routers.resources import load_resource_translations
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,6 +24,17 @@ async def get_user_bookmarks(
             Bookmark.user_id == current_user.id
         ).join(Resource).all()
         
+        # Load translations for every bookmarked resource in one query
+        translations = {}
+        if language != 'en':
+            try:
+                translations = load_resource_translations(
+                    db, [bookmark.resource_id for bookmark in bookmarks], language
+                )
+            except Exception as e:
+                logger.error(f"Error fetching translations for bookmarks of user {current_user.id} in {language}: {e}")
+                # Fall back to original content on error
+        
         result = []
         for bookmark in bookmarks:
             resource = bookmark.resource
@@ -42,24 +54,13 @@ async def get_user_bookmarks(
                 "notes": resource.notes,
             }
             
-            # If language is not English, try to get translations
-            if language != 'en':
-                try:
-                    translation = db.query(ResourceTranslation).filter(
-                        ResourceTranslation.resource_id == resource.id,
-                        ResourceTranslation.language_code == language,
-                        ResourceTranslation.translation_status == 'completed'
-                    ).first()
-                    
-                    if translation:
-                        # Use translated content if available
-                        if translation.resource_name_translated:
-                            resource_data["resource_name"] = translation.resource_name_translated
-                        if translation.summary_translated:
-                            resource_data["summary"] = translation.summary_translated
-                except Exception as e:
-                    logger.error(f"Error fetching translation for resource {resource.id} in {language}: {e}")
-                    # Fall back to original content on error
+            # Use translated content if available
+            translation = translations.get(resource.id)
+            if translation:
+                if translation.resource_name_translated:
+                    resource_data["resource_name"] = translation.resource_name_translated
+                if translation.summary_translated:
+                    resource_data["summary"] = translation.summary_translated
             
             result.append(resource_data)
         
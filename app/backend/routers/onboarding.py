@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Query, Request
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any, Optional
+from fastapi.responses import JSONResponse, Response
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+import os
 import json
 import hashlib
 import logging
@@ -8,10 +9,13 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from database import get_db, User, ScreeningResponse, Resource, SessionLocal
+from database import get_db, User, ScreeningResponse, Resource
 from recommendation import determine_profile, compose_summary, normalize_answers
 
 from auth_middleware import get_current_user
+from cache_service import cache, make_cache_key, user_cache_namespace, RESOURCE_TRANSLATIONS_NAMESPACE
+import translation_jobs
+from blocking_io import run_blocking
 
 from rate_limit_service import limiter, RATE_LIMIT_AI_PER_MINUTE
 
@@ -70,31 +74,113 @@ def normalize_primary_language(language: str) -> str:
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-async def start_user_translation_task(user_id: int):
-    """Background task to translate user description with proper session management"""
-    db = SessionLocal()
-    try:
-        from translation_service import translation_service
-        logger.info(f"🌐 TRANSLATION TASK: Starting translation for user {user_id}")
-        await translation_service.translate_user_description_batch(user_id, db)
-        logger.info(f"🌐 TRANSLATION TASK: Completed translation for user {user_id}")
-    except Exception as e:
-        logger.error(f"🌐 TRANSLATION TASK: Failed for user {user_id}: {e}")
-    finally:
-        db.close()
+# Per-user response cache for the dashboard endpoints. Keys embed the user's cache
+# generation (bumped when answers or the stored profile change and when one of the
+# user's translations completes), the resource translations generation (bumped when
+# any resource translation completes) and the catalog generation (bumped when
+# resources change), so entries never need to be deleted explicitly.
+USER_RESPONSE_CACHE_TTL = int(os.environ.get("USER_RESPONSE_CACHE_TTL", "3600"))
 
-async def start_category_subtitle_translation_task(user_id: int, categories: List[Dict[str, any]]):
-    """Background task to translate category subtitles with proper session management"""
-    db = SessionLocal()
-    try:
-        from translation_service import translation_service
-        logger.info(f"🌐 TRANSLATION TASK: Starting category subtitle translation for user {user_id}")
-        await translation_service.translate_category_subtitles(user_id, categories, db)
-        logger.info(f"🌐 TRANSLATION TASK: Completed category subtitle translation for user {user_id}")
-    except Exception as e:
-        logger.error(f"🌐 TRANSLATION TASK: Category subtitle translation failed for user {user_id}: {e}")
-    finally:
-        db.close()
+async def _user_response_cache_key(namespace: str, user_id: int, **params) -> str:
+    user_generation = await cache.aget_generation(user_cache_namespace(user_id))
+    translations_generation = await cache.aget_generation(RESOURCE_TRANSLATIONS_NAMESPACE)
+    return make_cache_key(
+        namespace,
+        {
+            "user": user_id,
+            "user_generation": user_generation,
+            "translations_generation": translations_generation,
+            **params
+        },
+        generation=await cache.aget_catalog_version()
+    )
+
+async def invalidate_user_responses(user_id: int):
+    """Drop every cached dashboard response for a user"""
+    await cache.abump_generation(user_cache_namespace(user_id))
+
+# Sync SQLAlchemy work in the async handlers below goes through run_blocking so it
+# never runs on the event loop.
+
+def _commit_user_changes(
+    db: Session,
+    user: User,
+    roadmap_summary: Optional[str] = None,
+    categories: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Commit pending changes to a user and queue translations of their new content.
+
+    Blocking; call through run_blocking. Queueing commits again, so the user is
+    reloaded last and the caller can keep reading its attributes without touching
+    the database.
+    """
+    db.commit()
+    user_id = user.id
+
+    if roadmap_summary and roadmap_summary.strip():
+        try:
+            logger.info(f"🌐 TRANSLATION: Queueing translation for user {user_id} roadmap summary")
+            translation_jobs.enqueue_user_description(db, user_id)
+            logger.info(f"🌐 TRANSLATION: Translation jobs queued for user {user_id}")
+        except Exception as e:
+            logger.warning(f"🌐 TRANSLATION: Failed to queue translation for user {user_id}: {e}")
+
+    if categories:
+        try:
+            logger.info(f"🌐 TRANSLATION: Queueing translation for {len(categories)} category subtitles for user {user_id}")
+            translation_jobs.enqueue_category_subtitles(db, user_id, categories)
+            logger.info(f"🌐 TRANSLATION: Translation jobs queued for category subtitles for user {user_id}")
+        except Exception as e:
+            logger.warning(f"🌐 TRANSLATION: Failed to queue category subtitle translation for user {user_id}: {e}")
+
+    db.refresh(user)
+
+def _subtitle_translation(db: Session, user_id: int, category_key: str, language: str, completed_only: bool = False):
+    """A user's stored subtitle translation for one category (blocking)"""
+    from database import PriorityCategorySubtitleTranslation
+    query = db.query(PriorityCategorySubtitleTranslation).filter(
+        PriorityCategorySubtitleTranslation.user_id == user_id,
+        PriorityCategorySubtitleTranslation.category_key == category_key,
+        PriorityCategorySubtitleTranslation.language_code == language
+    )
+    if completed_only:
+        query = query.filter(PriorityCategorySubtitleTranslation.translation_status == 'completed')
+    return query.first()
+
+def _etag_for(content: Dict[str, Any]) -> str:
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def _conditional_json_response(request: Request, content: Dict[str, Any], etag: str) -> Response:
+    # no-cache: browsers may keep the body but must revalidate with If-None-Match
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=content, headers=headers)
+
+async def _cached_user_response(
+    request: Request,
+    cache_key: str,
+    build: Callable[[], Awaitable[Dict[str, Any]]],
+    cacheable: Callable[[Dict[str, Any]], bool]
+) -> Response:
+    """Serve a per-user JSON response from cache (with ETag/304), building it on a miss"""
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return _conditional_json_response(request, cached["content"], cached["etag"])
+    
+    content = await build()
+    etag = _etag_for(content)
+    if cacheable(content):
+        await cache.aset(cache_key, {"content": content, "etag": etag}, USER_RESPONSE_CACHE_TTL)
+    return _conditional_json_response(request, content, etag)
 
 # Request/Response models
 class OnboardingSubmitRequest(BaseModel):
@@ -451,12 +537,31 @@ async def get_priority_categories(
     language: str = Query('en', description="Language code for translated subtitles")
 ):
     """Return priority categories for the current user; lazily generate if missing."""
+    cache_key = await _user_response_cache_key("onboarding:priority-categories", current_user.id, language=language)
+    return await _cached_user_response(
+        request,
+        cache_key,
+        lambda: _build_priority_categories(current_user, db, language),
+        _categories_cacheable
+    )
+
+
+def _categories_cacheable(content: Dict[str, Any]) -> bool:
+    """Only cache settled responses; pending/failed subtitle translations must be re-checked"""
+    if content.get("source") == "none":
+        return False
+    return not any(cat.get("subtitle_translation_status") for cat in content.get("categories", []))
+
+
+async def _build_priority_categories(current_user: User, db: Session, language: str) -> Dict[str, Any]:
+    # Offloaded commits expire current_user; keep what is needed after them in locals
+    user_id = current_user.id
     try:
         answers = current_user.survey_responses or {}
         logger.info(f"🧠 PRIORITY CATEGORIES: User {current_user.email} - survey_responses: {answers}")
         if not answers:
             logger.info("🧠 PRIORITY CATEGORIES: No survey responses; returning empty list")
-            return JSONResponse(content={"categories": []})
+            return {"categories": []}
 
         profile = current_user.onboarding_profile or {}
         cached = profile.get("priority_categories") if isinstance(profile, dict) else None
@@ -466,7 +571,6 @@ async def get_priority_categories(
             # Apply translations to subtitles if language is not English
             if language != 'en':
                 from translation_service import translation_service
-                from database import PriorityCategorySubtitleTranslation
                 
                 translated_cats = []
                 for cat in cached:
@@ -476,11 +580,9 @@ async def get_priority_categories(
                     
                     if category_key and subtitle:
                         # Check for existing translation
-                        existing_translation = db.query(PriorityCategorySubtitleTranslation).filter(
-                            PriorityCategorySubtitleTranslation.user_id == current_user.id,
-                            PriorityCategorySubtitleTranslation.category_key == category_key,
-                            PriorityCategorySubtitleTranslation.language_code == language
-                        ).first()
+                        existing_translation = await run_blocking(
+                            _subtitle_translation, db, user_id, category_key, language
+                        )
                         
                         if existing_translation and existing_translation.translation_status == 'completed':
                             # Use completed translation
@@ -495,22 +597,20 @@ async def get_priority_categories(
                             logger.info(f"Translation missing/failed for category {category_key} in {language}, generating on-demand...")
                             try:
                                 # Create pending entry and translate
-                                translation_service._create_pending_category_subtitle_translation(
-                                    db, current_user.id, category_key, language
+                                await run_blocking(
+                                    translation_service._create_pending_category_subtitle_translation,
+                                    db, user_id, category_key, language
                                 )
                                 
                                 success = await translation_service._translate_category_subtitle(
-                                    current_user.id, category_key, subtitle, language, db
+                                    user_id, category_key, subtitle, language
                                 )
                                 
                                 if success:
                                     # Fetch the newly created translation
-                                    updated_translation = db.query(PriorityCategorySubtitleTranslation).filter(
-                                        PriorityCategorySubtitleTranslation.user_id == current_user.id,
-                                        PriorityCategorySubtitleTranslation.category_key == category_key,
-                                        PriorityCategorySubtitleTranslation.language_code == language,
-                                        PriorityCategorySubtitleTranslation.translation_status == 'completed'
-                                    ).first()
+                                    updated_translation = await run_blocking(
+                                        _subtitle_translation, db, user_id, category_key, language, True
+                                    )
                                     
                                     if updated_translation:
                                         cat_copy['subtitle'] = updated_translation.subtitle_translated
@@ -529,9 +629,9 @@ async def get_priority_categories(
                         cat_copy['subtitle_translated'] = False
                     
                     translated_cats.append(cat_copy)
-                return JSONResponse(content={"categories": translated_cats})
+                return {"categories": translated_cats}
             
-            return JSONResponse(content={"categories": cached})
+            return {"categories": cached}
         
         logger.info("🧠 PRIORITY CATEGORIES: No cached categories, generating new ones")
 
@@ -545,28 +645,18 @@ async def get_priority_categories(
             profile = dict(profile or {})
             profile["priority_categories"] = cats
             current_user.onboarding_profile = profile
-            db.commit()
+            # Also queues translation of the new subtitles in the background
+            await run_blocking(_commit_user_changes, db, current_user, None, cats)
+            await invalidate_user_responses(user_id)
             logger.info("🧠 PRIORITY CATEGORIES: Generated and cached categories on profile")
             
-            # Trigger translation of subtitles in background
-            if cats:
-                try:
-                    from translation_service import translation_service
-                    logger.info(f"🌐 TRANSLATION: Starting translation for {len(cats)} category subtitles for user {current_user.id}")
-                    import asyncio
-                    asyncio.create_task(start_category_subtitle_translation_task(current_user.id, cats))
-                    logger.info(f"🌐 TRANSLATION: Translation task created for category subtitles for user {current_user.id}")
-                except Exception as e:
-                    logger.warning(f"🌐 TRANSLATION: Failed to start category subtitle translation for user {current_user.id}: {e}")
-            
         except Exception as e:
-            db.rollback()
+            await run_blocking(db.rollback)
             logger.warning(f"🧠 PRIORITY CATEGORIES: Failed to persist categories: {e}")
         
         # Apply translations to subtitles if language is not English
         if language != 'en':
             from translation_service import translation_service
-            from database import PriorityCategorySubtitleTranslation
             
             translated_cats = []
             for cat in cats:
@@ -576,11 +666,9 @@ async def get_priority_categories(
                 
                 if category_key and subtitle:
                     # Check for existing translation
-                    existing_translation = db.query(PriorityCategorySubtitleTranslation).filter(
-                        PriorityCategorySubtitleTranslation.user_id == current_user.id,
-                        PriorityCategorySubtitleTranslation.category_key == category_key,
-                        PriorityCategorySubtitleTranslation.language_code == language
-                    ).first()
+                    existing_translation = await run_blocking(
+                        _subtitle_translation, db, user_id, category_key, language
+                    )
                     
                     if existing_translation and existing_translation.translation_status == 'completed':
                         # Use completed translation
@@ -595,22 +683,20 @@ async def get_priority_categories(
                         logger.info(f"Translation missing/failed for category {category_key} in {language}, generating on-demand...")
                         try:
                             # Create pending entry and translate
-                            translation_service._create_pending_category_subtitle_translation(
-                                db, current_user.id, category_key, language
+                            await run_blocking(
+                                translation_service._create_pending_category_subtitle_translation,
+                                db, user_id, category_key, language
                             )
                             
                             success = await translation_service._translate_category_subtitle(
-                                current_user.id, category_key, subtitle, language, db
+                                user_id, category_key, subtitle, language
                             )
                             
                             if success:
                                 # Fetch the newly created translation
-                                updated_translation = db.query(PriorityCategorySubtitleTranslation).filter(
-                                    PriorityCategorySubtitleTranslation.user_id == current_user.id,
-                                    PriorityCategorySubtitleTranslation.category_key == category_key,
-                                    PriorityCategorySubtitleTranslation.language_code == language,
-                                    PriorityCategorySubtitleTranslation.translation_status == 'completed'
-                                ).first()
+                                updated_translation = await run_blocking(
+                                    _subtitle_translation, db, user_id, category_key, language, True
+                                )
                                 
                                 if updated_translation:
                                     cat_copy['subtitle'] = updated_translation.subtitle_translated
@@ -629,12 +715,12 @@ async def get_priority_categories(
                     cat_copy['subtitle_translated'] = False
                 
                 translated_cats.append(cat_copy)
-            return JSONResponse(content={"categories": translated_cats, "source": cats_result.get("source")})
+            return {"categories": translated_cats, "source": cats_result.get("source")}
         
-        return JSONResponse(content={"categories": cats, "source": cats_result.get("source")})
+        return {"categories": cats, "source": cats_result.get("source")}
     except Exception as e:
         logger.error(f"🧠 PRIORITY CATEGORIES: Error: {e}")
-        return JSONResponse(content={"categories": [], "source": "none"})
+        return {"categories": [], "source": "none"}
 
 
 class PriorityResourcesResponse(BaseModel):
@@ -671,25 +757,10 @@ async def get_priority_resources_for_category(
             if isinstance(stored_data, dict) and "resources" in stored_data:
                 resources_list = list(stored_data.get("resources") or [])
                 
-                # Apply translations if language is not English
+                # Apply translations if language is not English (one query for the whole list)
                 if language != 'en':
-                    translated_resources = []
-                    for resource_data in resources_list:
-                        # Get the resource from database to apply translations
-                        resource_id = resource_data.get('id')
-                        if resource_id:
-                            resource = db.query(Resource).filter(Resource.id == resource_id).first()
-                            if resource:
-                                # Use the proper serialize_resource function with translation support
-                                from routers.resources import serialize_resource
-                                translated_resource = serialize_resource(resource, db, language)
-                                translated_resources.append(translated_resource)
-                            else:
-                                # Fallback to original data if resource not found
-                                translated_resources.append(resource_data)
-                        else:
-                            translated_resources.append(resource_data)
-                    resources_list = translated_resources
+                    from routers.resources import hydrate_resources
+                    resources_list = await run_blocking(hydrate_resources, db, resources_list, language)
                 
                 logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Returning pre-generated resources ({len(resources_list)} items) in language {language}")
                 return JSONResponse(content={
@@ -711,25 +782,10 @@ async def get_priority_resources_for_category(
                 items = await rank_resources_llm_for_priority_category(db, answers, category_key, 40, 15)
             logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Generated {len(items)} items on-demand")
 
-            # Apply translations if language is not English
+            # Apply translations if language is not English (one query for the whole list)
             if language != 'en':
-                translated_items = []
-                for resource_data in items:
-                    # Get the resource from database to apply translations
-                    resource_id = resource_data.get('id')
-                    if resource_id:
-                        resource = db.query(Resource).filter(Resource.id == resource_id).first()
-                        if resource:
-                            # Use the proper serialize_resource function with translation support
-                            from routers.resources import serialize_resource
-                            translated_resource = serialize_resource(resource, db, language)
-                            translated_items.append(translated_resource)
-                        else:
-                            # Fallback to original data if resource not found
-                            translated_items.append(resource_data)
-                    else:
-                        translated_items.append(resource_data)
-                items = translated_items
+                from routers.resources import hydrate_resources
+                items = await run_blocking(hydrate_resources, db, items, language)
 
             # Persist generated resources to avoid re-generating next time
             try:
@@ -742,10 +798,11 @@ async def get_priority_resources_for_category(
                 }
                 profile_dict["priority_resources"] = pr
                 current_user.onboarding_profile = profile_dict
-                db.commit()
+                await run_blocking(_commit_user_changes, db, current_user)
+                await invalidate_user_responses(current_user.id)
                 logger.info(f"🧠 PRIORITY RESOURCES [{category_key}]: Persisted on-demand resources to profile")
             except Exception as persist_error:
-                db.rollback()
+                await run_blocking(db.rollback)
                 logger.warning(f"🧠 PRIORITY RESOURCES [{category_key}]: Failed to persist on-demand resources: {persist_error}")
 
             return JSONResponse(content={"category_key": category_key, "resources": items, "source": "on_demand"})
@@ -759,20 +816,32 @@ async def get_priority_resources_for_category(
 
 @router.get("/priority-data")
 async def get_all_priority_data(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    language: str = Query('en', description="Language code for translated resource content")
 ):
     """Return ALL priority data (categories + resources) for loading into frontend local storage.
     
     This endpoint provides everything needed for instant access to priority resources
     without additional API calls during the session.
     """
+    cache_key = await _user_response_cache_key("onboarding:priority-data", current_user.id, language=language)
+    return await _cached_user_response(
+        request,
+        cache_key,
+        lambda: _build_priority_data(current_user, db, language),
+        lambda content: content.get("source") != "none"
+    )
+
+
+async def _build_priority_data(current_user: User, db: Session, language: str = 'en') -> Dict[str, Any]:
     try:
         logger.info(f"🧠 PRIORITY DATA: Request from user {current_user.email}")
         answers = current_user.survey_responses or {}
         if not answers:
             logger.info("🧠 PRIORITY DATA: No survey responses; returning empty data")
-            return JSONResponse(content={"categories": [], "resources": {}, "source": "none"})
+            return {"categories": [], "resources": {}, "source": "none"}
 
         profile = current_user.onboarding_profile or {}
         
@@ -782,16 +851,33 @@ async def get_all_priority_data(
         # Get all pre-generated resources
         resources = profile.get("priority_resources", {}) if isinstance(profile, dict) else {}
         
+        # Translate every category's resources with a single query
+        if language != 'en' and resources:
+            from routers.resources import load_serialized_resources, hydrate_resources
+            stored_sets = {
+                key: data for key, data in resources.items()
+                if isinstance(data, dict) and isinstance(data.get("resources"), list)
+            }
+            serialized = await run_blocking(
+                load_serialized_resources,
+                db,
+                [item.get('id') for data in stored_sets.values() for item in data["resources"]],
+                language
+            )
+            resources = dict(resources)
+            for key, data in stored_sets.items():
+                resources[key] = {**data, "resources": hydrate_resources(db, data["resources"], language, serialized)}
+        
         logger.info(f"🧠 PRIORITY DATA: Returning {len(categories)} categories and {len(resources)} resource sets for local storage")
         
-        return JSONResponse(content={
+        return {
             "categories": categories,
             "resources": resources,
             "source": "stored"
-        })
+        }
     except Exception as e:
         logger.error(f"🧠 PRIORITY DATA: Error: {e}")
-        return JSONResponse(content={"categories": [], "resources": {}, "source": "none"})
+        return {"categories": [], "resources": {}, "source": "none"}
 
 
 @router.post("/submit", response_model=OnboardingResponse)
@@ -877,30 +963,9 @@ async def submit_onboarding(
         )
         db.add(screening_response)
         
-        db.commit()
-        
-        # Trigger translation of the roadmap summary
-        if roadmap_summary and roadmap_summary.strip():
-            try:
-                from translation_service import translation_service
-                logger.info(f"🌐 TRANSLATION: Starting translation for user {current_user.id} roadmap summary")
-                # Create background task with proper session management
-                import asyncio
-                asyncio.create_task(start_user_translation_task(current_user.id))
-                logger.info(f"🌐 TRANSLATION: Translation task created for user {current_user.id}")
-            except Exception as e:
-                logger.warning(f"🌐 TRANSLATION: Failed to start translation for user {current_user.id}: {e}")
-        
-        # Trigger translation of category subtitles
-        if priority_categories:
-            try:
-                from translation_service import translation_service
-                logger.info(f"🌐 TRANSLATION: Starting translation for {len(priority_categories)} category subtitles for user {current_user.id}")
-                import asyncio
-                asyncio.create_task(start_category_subtitle_translation_task(current_user.id, priority_categories))
-                logger.info(f"🌐 TRANSLATION: Translation task created for category subtitles for user {current_user.id}")
-            except Exception as e:
-                logger.warning(f"🌐 TRANSLATION: Failed to start category subtitle translation for user {current_user.id}: {e}")
+        # Commit, then queue translation of the roadmap summary and category subtitles
+        await run_blocking(_commit_user_changes, db, current_user, roadmap_summary, priority_categories)
+        await invalidate_user_responses(current_user.id)
         
         logger.info(f"User {current_user.email} completed onboarding with checklist {checklist_id}")
         
@@ -912,7 +977,7 @@ async def submit_onboarding(
         )
         
     except Exception as e:
-        db.rollback()
+        await run_blocking(db.rollback)
         logger.error(f"Error submitting onboarding for user {current_user.email}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -934,6 +999,7 @@ async def get_roadmap(
 @router.get("/roadmap/translated/{language_code}")
 async def get_translated_roadmap(
     language_code: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -951,85 +1017,101 @@ async def get_translated_roadmap(
             detail=f"Unsupported language code: {language_code}. Supported languages: {list(SUPPORTED_LANGUAGES.keys())}"
         )
     
+    cache_key = await _user_response_cache_key("onboarding:roadmap-translated", current_user.id, language=language_code)
+    return await _cached_user_response(
+        request,
+        cache_key,
+        lambda: _build_translated_roadmap(current_user, db, language_code),
+        # Pending/failed translations fall back to English and must be re-checked
+        lambda content: content.get("translation_status") == "completed"
+    )
+
+
+async def _build_translated_roadmap(current_user: User, db: Session, language_code: str) -> Dict[str, Any]:
+    # Offloaded commits expire current_user; keep what is needed after them in locals
+    user_id, roadmap_summary = current_user.id, current_user.roadmap_summary
     try:
         from translation_service import translation_service
         from database import UserDescriptionTranslation
         
         # Check for existing translation with any status
-        existing_translation = db.query(UserDescriptionTranslation).filter(
-            UserDescriptionTranslation.user_id == current_user.id,
-            UserDescriptionTranslation.language_code == language_code
-        ).first()
+        existing_translation = await run_blocking(
+            lambda: db.query(UserDescriptionTranslation).filter(
+                UserDescriptionTranslation.user_id == user_id,
+                UserDescriptionTranslation.language_code == language_code
+            ).first()
+        )
         
         # If translation exists and is completed, return it
         if existing_translation and existing_translation.translation_status == 'completed':
-            return JSONResponse(content={
+            return {
                 "language_code": language_code,
                 "roadmap_summary": existing_translation.roadmap_summary_translated,
                 "translation_status": "completed"
-            })
+            }
         
         # If translation is pending, return English with pending status
         if existing_translation and existing_translation.translation_status == 'pending':
-            logger.info(f"Translation pending for user {current_user.id} in {language_code}")
-            return JSONResponse(content={
+            logger.info(f"Translation pending for user {user_id} in {language_code}")
+            return {
                 "language_code": language_code,
-                "roadmap_summary": current_user.roadmap_summary,
+                "roadmap_summary": roadmap_summary,
                 "translation_status": "pending",
                 "note": "Translation in progress, showing original English text"
-            })
+            }
         
         # If translation doesn't exist or failed, generate it on-demand
-        logger.info(f"Translation not found or failed for user {current_user.id} in {language_code}, generating now...")
+        logger.info(f"Translation not found or failed for user {user_id} in {language_code}, generating now...")
         
         try:
             # Create pending entry first
-            translation_service._create_pending_user_translation(db, current_user.id, language_code)
+            await run_blocking(translation_service._create_pending_user_translation, db, user_id, language_code)
             
             # Generate translation asynchronously
             success = await translation_service.translate_user_description(
-                current_user.id, 
-                language_code, 
-                db
+                user_id, 
+                language_code,
+                roadmap_summary
             )
             
             if success:
                 # Fetch the newly created translation
-                translated_summary = translation_service.get_user_translation(
-                    current_user.id, 
+                translated_summary = await run_blocking(
+                    translation_service.get_user_translation,
+                    user_id, 
                     language_code, 
                     db
                 )
                 
                 if translated_summary:
-                    logger.info(f"Successfully generated translation for user {current_user.id} in {language_code}")
-                    return JSONResponse(content={
+                    logger.info(f"Successfully generated translation for user {user_id} in {language_code}")
+                    return {
                         "language_code": language_code,
                         "roadmap_summary": translated_summary,
                         "translation_status": "completed"
-                    })
+                    }
             
             # If translation generation failed, fall back to English
-            logger.warning(f"Failed to generate translation for user {current_user.id} in {language_code}")
-            return JSONResponse(content={
+            logger.warning(f"Failed to generate translation for user {user_id} in {language_code}")
+            return {
                 "language_code": language_code,
-                "roadmap_summary": current_user.roadmap_summary,
+                "roadmap_summary": roadmap_summary,
                 "translation_status": "generation_failed",
                 "note": "Translation generation failed, showing original English text"
-            })
+            }
             
         except Exception as gen_error:
-            logger.error(f"Error generating translation for user {current_user.id} in {language_code}: {gen_error}")
+            logger.error(f"Error generating translation for user {user_id} in {language_code}: {gen_error}")
             # Fall back to English on error
-            return JSONResponse(content={
+            return {
                 "language_code": language_code,
-                "roadmap_summary": current_user.roadmap_summary,
+                "roadmap_summary": roadmap_summary,
                 "translation_status": "error",
                 "note": f"Translation error: {str(gen_error)}, showing original English text"
-            })
+            }
         
     except Exception as e:
-        logger.error(f"Error getting translated roadmap for user {current_user.id}, language {language_code}: {e}")
+        logger.error(f"Error getting translated roadmap for user {user_id}, language {language_code}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve translated roadmap"
@@ -1114,30 +1196,9 @@ async def update_responses(
         )
         db.add(screening_response)
         
-        db.commit()
-        
-        # Trigger translation of the updated roadmap summary
-        if roadmap_summary and roadmap_summary.strip():
-            try:
-                from translation_service import translation_service
-                logger.info(f"🌐 TRANSLATION: Starting translation for updated user {current_user.id} roadmap summary")
-                # Create background task with proper session management
-                import asyncio
-                asyncio.create_task(start_user_translation_task(current_user.id))
-                logger.info(f"🌐 TRANSLATION: Translation task created for updated user {current_user.id}")
-            except Exception as e:
-                logger.warning(f"🌐 TRANSLATION: Failed to start translation for updated user {current_user.id}: {e}")
-        
-        # Trigger translation of updated category subtitles
-        if priority_categories:
-            try:
-                from translation_service import translation_service
-                logger.info(f"🌐 TRANSLATION: Starting translation for {len(priority_categories)} updated category subtitles for user {current_user.id}")
-                import asyncio
-                asyncio.create_task(start_category_subtitle_translation_task(current_user.id, priority_categories))
-                logger.info(f"🌐 TRANSLATION: Translation task created for updated category subtitles for user {current_user.id}")
-            except Exception as e:
-                logger.warning(f"🌐 TRANSLATION: Failed to start category subtitle translation for updated user {current_user.id}: {e}")
+        # Commit, then queue translation of the updated roadmap summary and category subtitles
+        await run_blocking(_commit_user_changes, db, current_user, roadmap_summary, priority_categories)
+        await invalidate_user_responses(current_user.id)
         
         logger.info(f"User {current_user.email} updated responses with new checklist {checklist_id}")
         
@@ -1149,7 +1210,7 @@ async def update_responses(
         )
         
     except Exception as e:
-        db.rollback()
+        await run_blocking(db.rollback)
         logger.error(f"Error updating responses for user {current_user.email}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
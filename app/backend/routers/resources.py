@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Dict, Any
+from fastapi.responses import PlainTextResponse
+from typing import List, Dict, Any, Optional
+import os
+import re
 import json
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, text as sql_text, func
+from sqlalchemy import or_, and_, text as sql_text, func, literal
 from datetime import datetime
 
 from database import get_db, Resource, ResourceTranslation
@@ -11,14 +14,16 @@ from database import get_db, Resource, ResourceTranslation
 from routers.admin import CANONICAL_CATEGORIES  # reuse canonical categories
 from routers.admin import parse_multi_categories
 from translation_service import SUPPORTED_LANGUAGES
+from cache_metrics import render_prometheus
 from cache_service import (
     cache, 
     get_resources_cache_key, 
     get_categories_cache_key, 
     get_languages_cache_key,
     get_resource_detail_cache_key,
-
+    get_resources_count_cache_key,
 )
+from pagination import resource_cursor, decode_resource_cursor, resource_keyset_filter
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -28,6 +33,12 @@ SEARCH_CACHE_TTL = 300      # 5 minutes for search results
 LIST_CACHE_TTL = 900        # 15 minutes for categories/languages
 DETAIL_CACHE_TTL = 1800     # 30 minutes for resource details
 
+# Search engine for the free-text `search` parameter:
+# - "fts": weighted search_vector (GIN) ranked with ts_rank_cd, plus trigram
+#   matching on resource_name so small typos still find results
+# - "ilike": legacy leading-wildcard ILIKE over the text columns
+SEARCH_ENGINE = os.environ.get("RESOURCE_SEARCH_ENGINE", "fts").lower()
+
 
 # Mock data for fallback (canonical categories)
 def get_mock_resources():
@@ -67,8 +78,44 @@ def get_mock_resources():
         }
     ]
 
-def serialize_resource(resource: Resource, db: Session = None, language: str = 'en') -> Dict[str, Any]:
-    """Convert SQLAlchemy Resource to dictionary with optional translation support"""
+def build_prefix_tsquery(search: str) -> Optional[str]:
+    """Turn free text into a prefix tsquery string ('word1:* & word2:*').
+
+    Tokens are reduced to letters/digits so user input can never produce
+    tsquery syntax errors. Returns None when nothing searchable remains.
+    """
+    tokens = re.findall(r"[^\W_]+", (search or "").lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+def load_resource_translations(db: Session, resource_ids: List[str], language: str) -> Dict[str, ResourceTranslation]:
+    """Fetch completed translations for a page of resources in a single query.
+
+    Returns a mapping of resource_id -> ResourceTranslation. English (or an
+    empty id list) needs no lookup and yields an empty mapping.
+    """
+    if not language or language == 'en' or not resource_ids:
+        return {}
+    
+    translations = db.query(ResourceTranslation).filter(
+        ResourceTranslation.resource_id.in_(set(resource_ids)),
+        ResourceTranslation.language_code == language,
+        ResourceTranslation.translation_status == 'completed'
+    ).all()
+    return {t.resource_id: t for t in translations}
+
+def serialize_resource(
+    resource: Resource,
+    db: Session = None,
+    language: str = 'en',
+    translations: Dict[str, ResourceTranslation] = None
+) -> Dict[str, Any]:
+    """Convert SQLAlchemy Resource to dictionary with optional translation support.
+    
+    Pass `translations` (from load_resource_translations) when serializing a
+    list so the lookup does not cost one query per resource.
+    """
     
     # Start with the base resource data
     result = {
@@ -90,14 +137,12 @@ def serialize_resource(resource: Resource, db: Session = None, language: str = '
     if not language or language == 'en':
         language = 'en'
     
-    # If language is not English and we have a database session, try to get translations
-    if language != 'en' and db is not None:
+    # If language is not English and we have translations (or a session to load them), apply them
+    if language != 'en' and (translations is not None or db is not None):
         try:
-            translation = db.query(ResourceTranslation).filter(
-                ResourceTranslation.resource_id == resource.id,
-                ResourceTranslation.language_code == language,
-                ResourceTranslation.translation_status == 'completed'
-            ).first()
+            if translations is None:
+                translations = load_resource_translations(db, [resource.id], language)
+            translation = translations.get(resource.id)
             
             if translation:
                 # Use translated content if available
@@ -125,6 +170,57 @@ def serialize_resource(resource: Resource, db: Session = None, language: str = '
     
     return result
 
+def serialize_resources(resources: List[Resource], db: Session = None, language: str = 'en') -> List[Dict[str, Any]]:
+    """Serialize a list of resources, loading their translations in one query"""
+    translations = None
+    if db is not None and language and language != 'en':
+        try:
+            translations = load_resource_translations(db, [r.id for r in resources], language)
+        except Exception as e:
+            logger.error(f"Error batch-loading translations in {language}: {e}")
+            translations = {}
+    return [serialize_resource(resource, db, language, translations) for resource in resources]
+
+def load_serialized_resources(db: Session, resource_ids: List[str], language: str = 'en') -> Dict[str, Dict[str, Any]]:
+    """Serialize resources by ID in one round-trip (translations joined in the same query).
+
+    Returns a mapping of resource_id -> serialized resource; unknown IDs are absent.
+    """
+    ids = list({rid for rid in resource_ids if rid})
+    if not ids:
+        return {}
+    
+    if not language or language == 'en':
+        resources = db.query(Resource).filter(Resource.id.in_(ids)).all()
+        return {r.id: serialize_resource(r, None, 'en') for r in resources}
+    
+    rows = db.query(Resource, ResourceTranslation).outerjoin(
+        ResourceTranslation,
+        and_(
+            ResourceTranslation.resource_id == Resource.id,
+            ResourceTranslation.language_code == language,
+            ResourceTranslation.translation_status == 'completed'
+        )
+    ).filter(Resource.id.in_(ids)).all()
+    translations = {resource.id: translation for resource, translation in rows if translation is not None}
+    return {resource.id: serialize_resource(resource, db, language, translations) for resource, _ in rows}
+
+def hydrate_resources(
+    db: Session,
+    items: List[Dict[str, Any]],
+    language: str = 'en',
+    serialized: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """Replace stored resource snapshots with current (translated) data, keeping their order.
+
+    Items whose resource no longer exists, or that have no id, are returned as stored.
+    Pass `serialized` (from load_serialized_resources) to hydrate several lists with
+    a single query.
+    """
+    if serialized is None:
+        serialized = load_serialized_resources(db, [item.get('id') for item in items], language)
+    return [serialized.get(item.get('id'), item) for item in items]
+
 @router.get("/", summary="Search and filter resources.")
 def search_resources(
     category: str = Query(None),
@@ -138,8 +234,22 @@ def search_resources(
     urgency_level: str = Query(None),
     page: int = 1,
     limit: int = 10,
+    cursor: str = Query(None, description="Continuation token for keyset pagination; pass an empty value for the first page"),
     db: Session = Depends(get_db)
 ):
+    # Cursor mode: page on (priority DESC NULLS LAST, resource_name, id) instead of OFFSET
+    cursor_mode = cursor is not None
+    cursor_values = None
+    if cursor:
+        try:
+            cursor_values = decode_resource_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Handle pagination (clamp page values)
+    page = max(1, page)
+    limit = max(1, min(100, limit))
+
     # Generate cache key
     cache_key = get_resources_cache_key(
         category=category,
@@ -148,20 +258,14 @@ def search_resources(
         language=language,
         location=location,
         audience_type=audience_type,
-        page=page,
-        limit=limit
+        page=None if cursor_mode else page,
+        limit=limit,
+        cursor=cursor
     )
     
-    # Try to get from cache first
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        logger.info(f"Cache HIT for resources search: {cache_key}")
-        cached_result["cached"] = True
-        return cached_result
-    
-    logger.info(f"Cache MISS for resources search: {cache_key}")
-    
-    try:
+    # Concurrent misses for the same key (e.g. right after an import invalidates
+    # the catalog) share one computation instead of each running the query
+    def compute_result():
         # Build base query - only include published and ready resources for public API
         query = db.query(Resource)
         
@@ -199,18 +303,34 @@ def search_resources(
             filters.append(Resource.physical_location.ilike(f"%{location}%"))
         
         # Filter by search term with multilingual support
+        search_rank = None
         if search:
             # Get supported language codes (excluding 'en' since English is always searched)
             SUPPORTED_LANGUAGE_CODES = [code for code in SUPPORTED_LANGUAGES.keys() if code != 'en']
             
-            # Always search English fields
-            search_conditions = [
-                Resource.resource_name.ilike(f"%{search}%"),
-                Resource.summary.ilike(f"%{search}%"),
-                Resource.category.ilike(f"%{search}%"),
-                Resource.subcategory.ilike(f"%{search}%"),
-                Resource.notes.ilike(f"%{search}%")
-            ]
+            tsquery_text = build_prefix_tsquery(search) if SEARCH_ENGINE == "fts" else None
+            if tsquery_text:
+                # English fields via the weighted tsvector (A=name, B=category/subcategory,
+                # C=summary, D=notes); trigram operators catch typos in resource names
+                tsquery = func.to_tsquery('simple', tsquery_text)
+                search_conditions = [
+                    Resource.search_vector.op('@@')(tsquery),
+                    Resource.resource_name.op('%')(search),
+                    literal(search).op('<%')(Resource.resource_name),
+                ]
+                search_rank = (
+                    func.coalesce(func.ts_rank_cd(Resource.search_vector, tsquery, 32), 0),
+                    func.similarity(Resource.resource_name, search),
+                )
+            else:
+                # Always search English fields
+                search_conditions = [
+                    Resource.resource_name.ilike(f"%{search}%"),
+                    Resource.summary.ilike(f"%{search}%"),
+                    Resource.category.ilike(f"%{search}%"),
+                    Resource.subcategory.ilike(f"%{search}%"),
+                    Resource.notes.ilike(f"%{search}%")
+                ]
             
             # If language is supported and not English, also search translated fields
             if language and language in SUPPORTED_LANGUAGE_CODES:
@@ -258,58 +378,100 @@ def search_resources(
             query = query.filter(and_(*filters))
         
         # Default ordering: higher priority first, then alphabetical by name
-        # Use NULLS LAST so missing priorities do not float to top
+        # Use NULLS LAST so missing priorities do not float to top.
+        # Ranked searches order by relevance first and use priority as tie-breaker;
+        # cursor mode always uses the keyset order so continuation tokens stay valid.
         try:
+            rank_order = [expr.desc() for expr in search_rank] if search_rank and not cursor_mode else []
             query = query.order_by(
+                *rank_order,
                 sql_text("priority DESC NULLS LAST"),
-                Resource.resource_name.asc()
+                Resource.resource_name.asc(),
+                Resource.id.asc()
             )
         except Exception:
             # Fallback: alphabetical if ordering fails for any reason
-            query = query.order_by(Resource.resource_name.asc())
+            query = query.order_by(Resource.resource_name.asc(), Resource.id.asc())
 
-        # Handle pagination (clamp page values)
-        page = max(1, page)
-        limit = max(1, min(100, limit))
-        offset = (page - 1) * limit
-        
-        # Get total count for pagination
-        total_count = query.count()
+        # Total count for pagination. Cursor mode reuses a cached count per filter set
+        # so following pages do not re-scan the whole filtered result.
+        if cursor_mode:
+            count_cache_key = get_resources_count_cache_key(
+                category=category,
+                subcategory=subcategory,
+                search=search,
+                language=language,
+                location=location,
+                audience_type=audience_type
+            )
+            # Plain get/set: this runs inside the search recompute, so it must not
+            # wait on another key's single-flight
+            total_count = cache.get(count_cache_key)
+            if total_count is None:
+                total_count = query.order_by(None).count()
+                cache.set(count_cache_key, total_count, SEARCH_CACHE_TTL)
+        else:
+            total_count = query.count()
         
         # Apply pagination
-        resources = query.offset(offset).limit(limit).all()
+        if cursor_mode:
+            if cursor_values:
+                query = query.filter(resource_keyset_filter(
+                    Resource.priority, Resource.resource_name, Resource.id, cursor_values
+                ))
+            # Fetch one extra row to know whether another page exists
+            resources = query.limit(limit + 1).all()
+            has_more = len(resources) > limit
+            resources = resources[:limit]
+        else:
+            offset = (page - 1) * limit
+            resources = query.offset(offset).limit(limit).all()
         
         # Serialize results with translation support
-        result_data = [serialize_resource(resource, db, language) for resource in resources]
+        result_data = serialize_resources(resources, db, language)
         
         # Apply additional filters based on audience characteristics
         if cultural_background or professional_focus or urgency_level:
             # For now, just pass through - could implement more sophisticated filtering
             pass
         
-        result = {
-            "resources": result_data,
-            "pagination": {
+        if cursor_mode:
+            last = resources[-1] if resources else None
+            pagination = {
+                "total": total_count,
+                "limit": limit,
+                "next_cursor": (
+                    resource_cursor(last.priority, last.resource_name, last.id)
+                    if has_more and last is not None else None
+                ),
+                "has_more": has_more
+            }
+        else:
+            pagination = {
                 "total": total_count,
                 "page": page,
                 "limit": limit,
                 "total_pages": (total_count + limit - 1) // limit
-            },
+            }
+        
+        result = {
+            "resources": result_data,
+            "pagination": pagination,
             "filters_applied": {
                 "category": category,
                 "search": search,
                 "language": language,
                 "location": location,
                 "audience_type": audience_type
-            },
-            "cached": False
+            }
         }
         
-        # Cache the result
-        cache.set(cache_key, result, SEARCH_CACHE_TTL)
-        logger.info(f"Cached resources search result: {cache_key}")
-        
         return result
+    
+    try:
+        result, was_cached = cache.get_or_compute(cache_key, compute_result, SEARCH_CACHE_TTL)
+        logger.info(f"Cache {'HIT' if was_cached else 'MISS'} for resources search: {cache_key}")
+        return {**result, "cached": was_cached}
         
     except Exception as e:
         logger.error(f"Database error in search_resources: {e}")
@@ -337,18 +499,9 @@ def get_resource_detail(
     """Get detailed information about a specific resource"""
     
     # Generate cache key (include language for proper caching)
-    cache_key = f"{get_resource_detail_cache_key(resource_id)}_{language}"
+    cache_key = get_resource_detail_cache_key(resource_id, language)
     
-    # Try to get from cache first
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        logger.info(f"Cache HIT for resource detail: {resource_id}")
-        cached_result["cached"] = True
-        return cached_result
-    
-    logger.info(f"Cache MISS for resource detail: {resource_id}")
-    
-    try:
+    def compute_result():
         resource = db.query(Resource).filter(Resource.id == resource_id).first()
         
         if not resource:
@@ -357,14 +510,12 @@ def get_resource_detail(
         if not (getattr(resource, 'published', False) and getattr(resource, 'ready', False)):
             raise HTTPException(status_code=404, detail="Resource not found")
         
-        result = serialize_resource(resource, db, language)
-        result["cached"] = False
-        
-        # Cache the result
-        cache.set(cache_key, result, DETAIL_CACHE_TTL)
-        logger.info(f"Cached resource detail: {resource_id}")
-        
-        return result
+        return serialize_resource(resource, db, language)
+    
+    try:
+        result, was_cached = cache.get_or_compute(cache_key, compute_result, DETAIL_CACHE_TTL)
+        logger.info(f"Cache {'HIT' if was_cached else 'MISS'} for resource detail: {resource_id}")
+        return {**result, "cached": was_cached}
         
     except HTTPException:
         raise
@@ -379,16 +530,7 @@ def get_categories(db: Session = Depends(get_db)):
     # Generate cache key
     cache_key = get_categories_cache_key()
     
-    # Try to get from cache first
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        logger.info("Cache HIT for categories list")
-        cached_result["cached"] = True
-        return cached_result
-    
-    logger.info("Cache MISS for categories list")
-    
-    try:
+    def compute_result():
         # Only consider published & ready resources when building category list
         rows = db.query(Resource.category).filter(Resource.published == True, Resource.ready == True).all()
         seen = set()
@@ -400,16 +542,12 @@ def get_categories(db: Session = Depends(get_db)):
 
         # Ensure only canonical categories are returned in a stable order
         ordered = [c for c in CANONICAL_CATEGORIES if c in seen]
-        result = {
-            "categories": ordered,
-            "cached": False
-        }
-        
-        # Cache the result
-        cache.set(cache_key, result, LIST_CACHE_TTL)
-        logger.info("Cached categories list")
-        
-        return result
+        return {"categories": ordered}
+    
+    try:
+        result, was_cached = cache.get_or_compute(cache_key, compute_result, LIST_CACHE_TTL)
+        logger.info(f"Cache {'HIT' if was_cached else 'MISS'} for categories list")
+        return {**result, "cached": was_cached}
         
     except Exception as e:
         logger.error(f"Database error in get_categories: {e}")
@@ -427,29 +565,15 @@ def get_languages(db: Session = Depends(get_db)):
     # Generate cache key
     cache_key = get_languages_cache_key()
     
-    # Try to get from cache first
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        logger.info("Cache HIT for languages list")
-        cached_result["cached"] = True
-        return cached_result
-    
-    logger.info("Cache MISS for languages list")
-    
-    try:
+    def compute_result():
         # Languages are no longer stored; return empty list for now
         all_languages = set()
-        
-        result = {
-            "languages": sorted(list(all_languages)),
-            "cached": False
-        }
-        
-        # Cache the result
-        cache.set(cache_key, result, LIST_CACHE_TTL)
-        logger.info("Cached languages list")
-        
-        return result
+        return {"languages": sorted(list(all_languages))}
+    
+    try:
+        result, was_cached = cache.get_or_compute(cache_key, compute_result, LIST_CACHE_TTL)
+        logger.info(f"Cache {'HIT' if was_cached else 'MISS'} for languages list")
+        return {**result, "cached": was_cached}
         
     except Exception as e:
         logger.error(f"Database error in get_languages: {e}")
@@ -464,13 +588,15 @@ def get_languages(db: Session = Depends(get_db)):
 
 # Cache management endpoints
 @router.post("/cache/invalidate", summary="Invalidate resource cache.")
-def invalidate_cache():
+def invalidate_cache(
+    purge: bool = Query(False, description="Also delete orphaned entries now instead of letting them expire")
+):
     """Invalidate all resource-related cache entries"""
     try:
-        deleted_count = cache.invalidate_resources_cache()
+        generation = cache.invalidate_resources_cache(purge=purge)
         return {
             "message": "Resource cache invalidated successfully",
-            "deleted_entries": deleted_count,
+            "generation": generation,
             "timestamp": json.dumps(datetime.now(), default=str)
         }
     except Exception as e:
@@ -493,6 +619,12 @@ def get_cache_stats():
             "timestamp": json.dumps(datetime.now(), default=str)
         }
 
+@router.get("/cache/metrics", summary="Cache metrics in Prometheus text format.", response_class=PlainTextResponse)
+def get_cache_metrics():
+    """Per-namespace cache hit/miss/error counters and get/set latency histograms"""
+    totals, _ = cache.get_metrics_totals()
+    return PlainTextResponse(render_prometheus(totals), media_type="text/plain; version=0.0.4")
+
 # Resource modification endpoints with cache invalidation
 @router.post("/", summary="Create a new resource.")
 def create_resource(resource_data: dict, db: Session = Depends(get_db)):
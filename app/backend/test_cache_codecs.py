@@ -0,0 +1,64 @@
+"""
+Tests for the tagged cache value codecs.
+
+Run with: pytest test_cache_codecs.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import cache_codecs
+
+
+PAYLOAD = {"resources": [{"id": "r1", "name": "Food Bank", "priority": 3}], "pagination": {"total": 1}}
+
+requires_orjson = pytest.mark.skipif(cache_codecs.orjson is None, reason="orjson not installed")
+requires_msgpack = pytest.mark.skipif(cache_codecs.msgpack is None, reason="msgpack not installed")
+requires_zstandard = pytest.mark.skipif(cache_codecs.zstandard is None, reason="zstandard not installed")
+
+
+@pytest.mark.parametrize("codec, tag", [
+    ("json", cache_codecs.TAG_JSON),
+    pytest.param("orjson", cache_codecs.TAG_ORJSON, marks=requires_orjson),
+    pytest.param("msgpack", cache_codecs.TAG_MSGPACK, marks=requires_msgpack),
+])
+def test_round_trip(codec, tag):
+    data = cache_codecs.encode(PAYLOAD, codec)
+    assert data[:1] == tag
+    assert cache_codecs.decode(data) == PAYLOAD
+
+
+def test_unavailable_codec_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(cache_codecs, "orjson", None)
+    data = cache_codecs.encode(PAYLOAD, "orjson")
+    assert data[:1] == cache_codecs.TAG_JSON
+    assert cache_codecs.decode(data) == PAYLOAD
+
+
+def test_legacy_untagged_json():
+    assert cache_codecs.decode(json.dumps(PAYLOAD)) == PAYLOAD
+    assert cache_codecs.decode(b"42") == 42
+
+
+@requires_zstandard
+def test_large_payloads_are_compressed():
+    big = {"text": "resource " * 10000}
+    data = cache_codecs.encode(big, "json", compress_threshold=1024)
+    assert data[:1] == cache_codecs.TAG_ZSTD
+    assert cache_codecs.decode(data) == big
+
+
+def test_namespace_overrides(monkeypatch):
+    monkeypatch.setattr(cache_codecs, "_namespace_codecs",
+                        cache_codecs._parse_namespace_codecs("resources=json, resources:search=msgpack"))
+    assert cache_codecs.codec_for_key("resources:search:v2:g1:abc") == "msgpack"
+    assert cache_codecs.codec_for_key("resources:detail:v2:g1:abc") == "json"
+    assert cache_codecs.codec_for_key("categories:list:v2:g1") == cache_codecs.CACHE_CODEC
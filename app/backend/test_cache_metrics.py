@@ -0,0 +1,73 @@
+"""
+Tests for cache metrics namespacing, aggregation and Prometheus rendering.
+
+Run with: pytest test_cache_metrics.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from cache_metrics import CacheMetrics, namespace_of, render_prometheus, summarize
+
+
+@pytest.mark.parametrize("key, namespace", [
+    ("resources:search:v2:g3:ab12", "resources:search"),
+    ("categories:list:v2:g3", "categories:list"),
+    ("languages:v2", "languages"),
+    ("user:42:onboarding", "user:42"),
+    ("v2", "other"),
+])
+def test_namespace_of(key, namespace):
+    assert namespace_of(key) == namespace
+
+
+def _recorded() -> CacheMetrics:
+    metrics = CacheMetrics()
+    for _ in range(3):
+        metrics.incr("resources:search:v2:g1:a", "hits")
+    metrics.incr("resources:search:v2:g1:b", "misses")
+    metrics.observe("resources:search:v2:g1:a", "get", 0.002)
+    metrics.observe("resources:search:v2:g1:a", "get", 0.2)
+    return metrics
+
+
+def test_summarize_reports_hit_rate_and_mean_latency():
+    totals, scope = _recorded().totals()
+    summary = summarize(totals)["resources:search"]
+
+    assert scope == "process"
+    assert (summary["hits"], summary["misses"], summary["hit_rate"]) == (3, 1, 0.75)
+    assert summary["get_avg_ms"] == pytest.approx(101.0)
+    assert summary["set_avg_ms"] is None
+
+
+def test_render_prometheus_histogram_is_cumulative():
+    totals, _ = _recorded().totals()
+    lines = render_prometheus(totals).splitlines()
+
+    assert '# TYPE pioneer_cache_hits_total counter' in lines
+    assert 'pioneer_cache_hits_total{namespace="resources:search"} 3' in lines
+    bucket = 'pioneer_cache_get_duration_seconds_bucket{namespace="resources:search",le="%s"} %d'
+    assert bucket % ("0.001", 0) in lines
+    assert bucket % ("0.0025", 1) in lines
+    assert bucket % ("0.25", 2) in lines
+    assert bucket % ("+Inf", 2) in lines
+    assert 'pioneer_cache_get_duration_seconds_count{namespace="resources:search"} 2' in lines
+    assert 'pioneer_cache_get_duration_seconds_sum{namespace="resources:search"} 0.202000' in lines
+
+
+def test_failed_flush_keeps_deltas():
+    class BrokenRedis:
+        def pipeline(self, **kwargs):
+            raise ConnectionError("down")
+
+    metrics = _recorded()
+    assert metrics.flush(BrokenRedis()) is False
+    assert metrics._pending["resources:search|hits"] == 3
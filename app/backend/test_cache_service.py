@@ -0,0 +1,152 @@
+"""
+Tests for CacheService.get_or_compute single-flight, leases and stale serving,
+against an in-memory stand-in for the Redis client.
+
+Run with: pytest test_cache_service.py -v
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import cache_service
+from cache_service import CacheService
+
+
+class FakeRedis:
+    """The subset of the redis client CacheService uses for plain keys and leases"""
+
+    def __init__(self):
+        self.data = {}
+        self._lock = threading.Lock()
+
+    def ping(self):
+        return True
+
+    def pubsub(self, **kwargs):
+        raise RuntimeError("pubsub not supported")
+
+    def pipeline(self, **kwargs):
+        raise RuntimeError("pipeline not supported")
+
+    def publish(self, channel, message):
+        return 0
+
+    def get(self, key):
+        with self._lock:
+            return self.data.get(key)
+
+    def set(self, key, value, nx=False, px=None):
+        with self._lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def setex(self, key, ttl, value):
+        with self._lock:
+            self.data[key] = value
+
+    def delete(self, key):
+        with self._lock:
+            return 1 if self.data.pop(key, None) is not None else 0
+
+    def eval(self, script, numkeys, key, token):
+        with self._lock:
+            if self.data.get(key) == token:
+                del self.data[key]
+                return 1
+            return 0
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(cache_service.redis, "from_url", lambda *args, **kwargs: fake)
+    monkeypatch.setattr(cache_service, "CACHE_LEASE_WAIT_SECONDS", 0.5)
+    service = CacheService()
+    service.fake = fake
+    return service
+
+
+def _run_threads(targets, timeout=10):
+    threads = [threading.Thread(target=target, daemon=True) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+    return [thread.is_alive() for thread in threads]
+
+
+def test_concurrent_misses_compute_once(cache):
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"total": 42}
+
+    def worker():
+        results.append(cache.get_or_compute("search:a", compute, 60)[0])
+
+    assert not any(_run_threads([worker] * 5))
+    assert len(calls) == 1
+    assert results == [{"total": 42}] * 5
+
+
+def test_nested_computes_on_crossed_keys_do_not_deadlock(cache):
+    # Each thread leads one key and, inside its compute, asks for the other one
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def compute(outer, inner):
+        def _compute():
+            barrier.wait(timeout=5)
+            nested, _ = cache.get_or_compute(inner, lambda: f"{inner}-value", 60)
+            return f"{outer}+{nested}"
+        return _compute
+
+    def worker(outer, inner):
+        return lambda: results.__setitem__(outer, cache.get_or_compute(outer, compute(outer, inner), 60)[0])
+
+    alive = _run_threads([worker("search:a", "count:b"), worker("count:b", "search:a")])
+
+    assert not any(alive)
+    assert results["search:a"].startswith("search:a+")
+    assert results["count:b"].startswith("count:b+")
+
+
+def test_waits_for_value_when_another_worker_holds_the_lease(cache):
+    cache.fake.set("lease:search:b", "other-worker")
+    compute_calls = []
+
+    def other_worker_finishes():
+        time.sleep(0.1)
+        cache.set("search:b", "from other worker", 60)
+
+    threading.Thread(target=other_worker_finishes, daemon=True).start()
+    value, was_cached = cache.get_or_compute("search:b", lambda: compute_calls.append(1), 60)
+
+    assert (value, was_cached) == ("from other worker", True)
+    assert compute_calls == []
+
+
+def test_failed_refresh_serves_stale_value(cache):
+    stale = cache._envelope("old", ttl=60, compute_seconds=0.01)
+    stale["exp"] = time.time() - 1
+    cache.set("search:c", stale, 60)
+
+    def compute():
+        raise RuntimeError("database down")
+
+    assert cache.get_or_compute("search:c", compute, 60) == ("old", True)
+    assert "lease:search:c" not in cache.fake.data
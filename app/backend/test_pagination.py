@@ -0,0 +1,52 @@
+"""
+Tests for keyset pagination cursor helpers.
+
+Run with: pytest test_pagination.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from pagination import (
+    encode_cursor,
+    decode_cursor,
+    resource_cursor,
+    decode_resource_cursor,
+    resource_keyset_sql,
+)
+
+
+def test_cursor_round_trip():
+    token = resource_cursor(5, "Welcome House", "res1")
+    assert decode_resource_cursor(token) == {"p": 5, "n": "Welcome House", "i": "res1"}
+
+
+def test_cursor_is_url_safe():
+    token = encode_cursor({"n": "Ünïcödé / + ?", "i": "x" * 40})
+    assert "=" not in token and "+" not in token and "/" not in token
+    assert decode_cursor(token)["n"] == "Ünïcödé / + ?"
+
+
+@pytest.mark.parametrize("token", ["not-base64!!", encode_cursor({"p": "high", "n": "a", "i": "b"}), encode_cursor({"p": 1})])
+def test_invalid_cursor_raises_value_error(token):
+    with pytest.raises(ValueError):
+        decode_resource_cursor(token)
+
+
+def test_keyset_sql_null_priority_stays_in_null_tail():
+    sql, params = resource_keyset_sql({"p": None, "n": "A", "i": "1"})
+    assert sql.startswith("(priority IS NULL AND")
+    assert "cursor_priority" not in params
+
+
+def test_keyset_sql_with_priority_includes_null_tail():
+    sql, params = resource_keyset_sql({"p": 3, "n": "A", "i": "1"})
+    assert "priority IS NULL" in sql
+    assert params == {"cursor_name": "A", "cursor_id": "1", "cursor_priority": 3}
@@ -0,0 +1,58 @@
+"""
+Tests for the hashed bag-of-words resource embeddings.
+
+Run with: pytest test_resource_embeddings.py -v
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import resource_embeddings
+from resource_embeddings import EMBEDDING_DIM, cosine_scores, embed_resource, embed_text
+
+
+def test_embedding_is_deterministic_and_unit_length():
+    text = "Free legal aid for refugees and asylum seekers"
+    vector = embed_text(text)
+
+    assert vector == embed_text(text)
+    assert len(vector) == EMBEDDING_DIM
+    assert math.isclose(math.sqrt(sum(v * v for v in vector)), 1.0, abs_tol=1e-4)
+
+
+def test_empty_or_stopword_text_embeds_to_zeros():
+    assert embed_text("") == [0.0] * EMBEDDING_DIM
+    assert embed_text("the and of") == [0.0] * EMBEDDING_DIM
+
+
+def test_plural_folding_shares_features():
+    assert embed_text("legal services") == embed_text("legal service")
+
+
+def test_related_text_scores_higher():
+    query = embed_text("english language classes for adults")
+    scores = cosine_scores(query, [
+        embed_resource("ESL Classes", "Free English language classes for adult learners", "Education"),
+        embed_resource("Food Pantry", "Weekly groceries and fresh produce", "Food"),
+    ])
+
+    assert scores[0] > scores[1]
+
+
+def test_cosine_scores_match_without_numpy(monkeypatch):
+    query = embed_text("housing assistance")
+    matrix = [embed_text("rental housing assistance"), embed_text("job training")]
+    expected = cosine_scores(query, matrix)
+
+    monkeypatch.setattr(resource_embeddings, "np", None)
+
+    assert cosine_scores(query, matrix) == pytest.approx(expected, abs=1e-5)
+    assert cosine_scores(query, []) == []
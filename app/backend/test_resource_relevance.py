@@ -0,0 +1,62 @@
+"""
+Tests for precomputed recommender relevance flags.
+
+Run with: pytest test_resource_relevance.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from resource_relevance import (
+    compute_relevance_flags,
+    user_relevance_mask,
+    flags_allowed,
+    FLAG_REFUGEE,
+    FLAG_AFFORDABLE_HOUSING,
+    CULTURAL_PATTERN_SHIFT,
+    CULTURAL_PATTERNS,
+)
+
+
+def test_empty_resource_has_no_flags():
+    assert compute_relevance_flags(None, None) == 0
+    assert compute_relevance_flags("", "") == 0
+
+
+def test_keyword_flags():
+    assert compute_relevance_flags("Refugee Resettlement Office", "") & FLAG_REFUGEE
+    assert compute_relevance_flags("Housing Authority", "Section 8 vouchers") & FLAG_AFFORDABLE_HOUSING
+    assert compute_relevance_flags("Public Library", "Free books") == 0
+
+
+def test_first_cultural_pattern_is_stored():
+    flags = compute_relevance_flags("Hispanic Chamber of Commerce", "Also an african community hub")
+    assert flags >> CULTURAL_PATTERN_SHIFT == CULTURAL_PATTERNS.index("hispanic chamber") + 1
+
+
+@pytest.mark.parametrize("answers, expected", [
+    ({"audience": "refugee_tps"}, True),
+    ({"audience": "student"}, False),
+])
+def test_refugee_resources_only_for_refugees(answers, expected):
+    flags = compute_relevance_flags("Asylum legal clinic", "")
+    assert flags_allowed(flags, user_relevance_mask(answers)) is expected
+
+
+def test_affordable_housing_only_when_selected():
+    flags = compute_relevance_flags("Rental assistance program", "")
+    assert flags_allowed(flags, user_relevance_mask({"housing_need": "affordable"}))
+    assert not flags_allowed(flags, user_relevance_mask({"housing_need": "market_rate"}))
+
+
+def test_cultural_resources_match_user_language():
+    flags = compute_relevance_flags("Latino Chamber", "Business networking")
+    assert flags_allowed(flags, user_relevance_mask({"primary_language": "es"}))
+    assert not flags_allowed(flags, user_relevance_mask({"primary_language": "zh"}))
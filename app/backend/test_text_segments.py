@@ -0,0 +1,39 @@
+"""
+Tests for sentence segmentation, reassembly and batch packing.
+
+Run with: pytest test_text_segments.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from text_segments import split_segments, join_segments, pack_batches
+
+
+@pytest.mark.parametrize("text", [
+    "One sentence only",
+    "Free meals daily. Call ahead!  Open to all?",
+    "Line one.\nLine two.\n\n  Indented after a blank line. ",
+    "See Dr. Smith at 12 Main St. on Mondays. Bring ID.",
+])
+def test_round_trip(text):
+    segments, separators = split_segments(text)
+    assert join_segments(segments, separators) == text
+    assert all("\n" not in segment for segment in segments)
+
+
+def test_splits_sentences_but_not_abbreviations():
+    segments, _ = split_segments("See Dr. Smith on Mondays. Bring ID.")
+    assert segments == ["See Dr. Smith on Mondays.", "Bring ID."]
+
+
+def test_pack_batches_respects_limit():
+    batches = pack_batches(["a" * 4, "b" * 4, "c" * 4, "d" * 20], max_chars=10)
+    assert batches == [["aaaa", "bbbb"], ["cccc"], ["d" * 20]]
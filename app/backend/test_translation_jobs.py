@@ -0,0 +1,128 @@
+"""
+Tests for the translation_jobs queue: dedupe, per-language claim cap, retry
+backoff, supersede and lease requeue.
+
+Needs the PostgreSQL database at DATABASE_URL (skipped when unreachable). The
+tests work in a scratch schema that is dropped afterwards.
+
+Run with: pytest test_translation_jobs.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import translation_jobs
+from database import engine, TranslationJob
+
+SCHEMA = "translation_jobs_test"
+
+
+@pytest.fixture
+def db():
+    try:
+        conn = engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not reachable at DATABASE_URL: {e}")
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    TranslationJob.__table__.create(conn)
+    conn.commit()
+    session = Session(bind=conn)
+    try:
+        yield session
+    finally:
+        session.close()
+        conn.rollback()
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text("RESET search_path"))
+        conn.commit()
+        conn.close()
+
+
+def _jobs(db, **filters):
+    where = " AND ".join(f"{column} = :{column}" for column in filters) or "TRUE"
+    return db.execute(text(f"SELECT * FROM translation_jobs WHERE {where} ORDER BY id"), filters).mappings().all()
+
+
+def test_enqueue_collapses_identical_queued_jobs(db):
+    translation_jobs.enqueue(db, "category_subtitles", 7, {"categories": ["old"]}, languages=["es", "fr"])
+    translation_jobs.enqueue(db, "category_subtitles", 7, {"categories": ["new"]}, languages=["es"])
+
+    rows = _jobs(db, status="queued")
+    assert [row["language_code"] for row in rows] == ["es", "fr"]
+    assert rows[0]["payload"] == {"categories": ["new"]}
+    assert rows[1]["payload"] == {"categories": ["old"]}
+
+
+def test_claim_caps_running_jobs_per_language_across_workers(db):
+    for user_id in (1, 2, 3):
+        translation_jobs.enqueue(db, "user_description", user_id, languages=["es"])
+    translation_jobs.enqueue(db, "user_description", 1, languages=["fr"])
+
+    first = translation_jobs.claim(db, "worker-a", limit=10, per_language=2)
+    second = translation_jobs.claim(db, "worker-b", limit=10, per_language=2)
+
+    assert sorted(job["language_code"] for job in first) == ["es", "es", "fr"]
+    assert second == []
+    assert len(_jobs(db, status="running", language_code="es")) == 2
+
+
+def test_failed_job_is_retried_with_exponential_backoff_then_failed(db, monkeypatch):
+    monkeypatch.setattr(translation_jobs, "TRANSLATION_JOB_RETRY_BASE_SECONDS", 30)
+    translation_jobs.enqueue(db, "user_description", 1, languages=["es"])
+
+    job = translation_jobs.claim(db, "worker-a", limit=1, per_language=2)[0]
+    job["attempts"] = 3  # as if this were the third try
+    translation_jobs.fail(db, job, "translator timed out")
+
+    row = _jobs(db, id=job["id"])[0]
+    delay = db.execute(text("SELECT EXTRACT(EPOCH FROM run_after - updated_at) FROM translation_jobs WHERE id = :id"),
+                       {"id": job["id"]}).scalar()
+    assert row["status"] == "queued"
+    assert row["locked_by"] is None
+    assert row["last_error"] == "translator timed out"
+    assert round(float(delay)) == 120
+
+    job["attempts"] = job["max_attempts"]
+    translation_jobs.fail(db, job, "still failing")
+    assert _jobs(db, id=job["id"])[0]["status"] == "failed"
+
+
+def test_failed_job_is_superseded_by_newer_queued_duplicate(db):
+    translation_jobs.enqueue(db, "user_description", 1, languages=["es"])
+    job = translation_jobs.claim(db, "worker-a", limit=1, per_language=2)[0]
+    # The user edited their answers while the job was running
+    translation_jobs.enqueue(db, "user_description", 1, languages=["es"])
+
+    translation_jobs.fail(db, job, "translator timed out")
+
+    assert _jobs(db, id=job["id"])[0]["status"] == "superseded"
+    assert len(_jobs(db, status="queued", dedupe_key="user_description:1:es")) == 1
+
+
+def test_jobs_with_expired_lease_are_requeued(db, monkeypatch):
+    monkeypatch.setattr(translation_jobs, "TRANSLATION_JOB_LEASE_SECONDS", 60)
+    translation_jobs.enqueue(db, "user_description", 1, languages=["es", "fr"])
+    jobs = translation_jobs.claim(db, "crashed-worker", limit=2, per_language=2)
+    stale_id = jobs[0]["id"]
+    db.execute(text("UPDATE translation_jobs SET locked_at = NOW() - INTERVAL '2 minutes' WHERE id = :id"),
+               {"id": stale_id})
+    db.commit()
+
+    assert translation_jobs.requeue_stale(db) == 1
+
+    row = _jobs(db, id=stale_id)[0]
+    assert row["status"] == "queued"
+    assert row["last_error"] == "Lease expired"
+    assert _jobs(db, id=jobs[1]["id"])[0]["status"] == "running"
@@ -0,0 +1,104 @@
+"""
+Tests for translation memory lookup/store.
+
+The database tests need the PostgreSQL database at DATABASE_URL (skipped when
+unreachable) and work in a scratch schema that is dropped afterwards.
+
+Run with: pytest test_translation_memory.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+import translation_memory
+from database import engine, TranslationMemory
+
+SCHEMA = "translation_memory_test"
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache(monkeypatch):
+    monkeypatch.setattr(translation_memory, "TRANSLATION_MEMORY_ENABLED", True)
+    translation_memory._local.clear()
+    yield
+    translation_memory._local.clear()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    try:
+        conn = engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not reachable at DATABASE_URL: {e}")
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    TranslationMemory.__table__.create(conn)
+    conn.commit()
+    monkeypatch.setattr(translation_memory, "SessionLocal", sessionmaker(bind=conn))
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text("RESET search_path"))
+        conn.commit()
+        conn.close()
+
+
+def test_local_cache_serves_without_database(monkeypatch):
+    def no_database():
+        raise AssertionError("database should not be queried")
+
+    monkeypatch.setattr(translation_memory, "SessionLocal", no_database)
+    digest = translation_memory.source_hash("Call ahead.")
+    translation_memory._local[(digest, "en", "es", "google")] = "Llame antes."
+
+    assert translation_memory.lookup(["Call ahead."], "es") == {"Call ahead.": "Llame antes."}
+
+
+def test_disabled_memory_neither_reads_nor_writes(monkeypatch):
+    monkeypatch.setattr(translation_memory, "TRANSLATION_MEMORY_ENABLED", False)
+    monkeypatch.setattr(translation_memory, "SessionLocal", None)
+
+    translation_memory.store({"Call ahead.": "Llame antes."}, "es")
+    assert translation_memory.lookup(["Call ahead."], "es") == {}
+
+
+def test_store_then_lookup_from_table(db):
+    translation_memory.store({"Call ahead.": "Llame antes.", "Open daily.": "Abierto a diario."}, "es")
+    translation_memory._local.clear()
+
+    found = translation_memory.lookup(["Call ahead.", "Open daily.", "Unknown."], "es")
+
+    assert found == {"Call ahead.": "Llame antes.", "Open daily.": "Abierto a diario."}
+    hits = db.execute(text("SELECT SUM(hit_count) FROM translation_memory")).scalar()
+    assert hits == 2
+
+
+def test_newer_translation_replaces_older_entry(db):
+    translation_memory.store({"Call ahead.": "Llame antes."}, "es")
+    translation_memory.store({"Call ahead.": "Llame con anticipación."}, "es")
+    translation_memory._local.clear()
+
+    assert translation_memory.lookup(["Call ahead."], "es") == {"Call ahead.": "Llame con anticipación."}
+    assert db.execute(text("SELECT COUNT(*) FROM translation_memory")).scalar() == 1
+
+
+def test_entries_are_kept_per_provider_and_language(db):
+    translation_memory.store({"Call ahead.": "[es] Call ahead."}, "es", provider="local")
+    translation_memory._local.clear()
+
+    assert translation_memory.lookup(["Call ahead."], "es", provider="google") == {}
+    assert translation_memory.lookup(["Call ahead."], "fr", provider="local") == {}
+    assert translation_memory.lookup(["Call ahead."], "es", provider="local") == {"Call ahead.": "[es] Call ahead."}
@@ -0,0 +1,110 @@
+"""
+Tests for the translation providers: local dictionary provider, provider
+selection and the per-language googletrans client pool.
+
+Run with: pytest test_translation_providers.py -v
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import translation_providers
+from translation_providers import GoogleTranslateProvider, LocalTranslationProvider, TranslationProvider, create_provider
+
+
+def test_local_provider_uses_dictionary_then_marks_unknown_text(tmp_path, monkeypatch):
+    dictionary = tmp_path / "dictionary.json"
+    dictionary.write_text(json.dumps({"es": {"Free meals daily.": "Comidas gratis a diario."}}))
+    monkeypatch.setenv("TRANSLATION_LOCAL_DICTIONARY", str(dictionary))
+    monkeypatch.setenv("TRANSLATION_LOCAL_USE_MODEL", "false")
+
+    provider = LocalTranslationProvider()
+    results = asyncio.run(provider.translate_batch(["Free meals daily.", "Call ahead."], "es"))
+
+    assert results == ["Comidas gratis a diario.", "[es] Call ahead."]
+
+
+def test_unknown_provider_name_falls_back_to_google():
+    assert create_provider("nope").name == "google"
+
+
+class FakeTranslator:
+    """Stands in for googletrans.Translator; fails while `failures` is positive"""
+
+    instances = []
+    failures = 0
+
+    def __init__(self):
+        FakeTranslator.instances.append(self)
+
+    async def translate(self, text, dest, src):
+        if FakeTranslator.failures:
+            FakeTranslator.failures -= 1
+            raise ConnectionError("connection reset")
+        return type("Result", (), {"text": "\n".join(f"{dest}:{line}" for line in text.split("\n"))})()
+
+
+@pytest.fixture
+def google(monkeypatch):
+    FakeTranslator.instances, FakeTranslator.failures = [], 0
+    monkeypatch.setattr(translation_providers, "Translator", FakeTranslator)
+    provider = GoogleTranslateProvider()
+    provider.requests_per_second = None
+    yield provider
+    provider.close()
+
+
+def test_google_provider_pools_one_client_per_language(google):
+    async def run():
+        await google.translate_batch(["Hello"], "es")
+        await google.translate_batch(["Hi", "Bye"], "es")
+        return await google.translate_batch(["Hello"], "zh")
+
+    assert asyncio.run(run()) == ["zh-cn:Hello"]
+    # One probe client from __init__, then one per target language
+    assert len(FakeTranslator.instances) == 3
+
+
+def test_google_provider_replaces_client_after_error(google):
+    async def run():
+        FakeTranslator.failures = 1
+        with pytest.raises(ConnectionError):
+            await google.translate_batch(["Hello"], "es")
+        return await google.translate_batch(["Hello"], "es")
+
+    assert asyncio.run(run()) == ["es:Hello"]
+    assert len(FakeTranslator.instances) == 3
+
+
+def test_base_provider_requires_translate_batch():
+    with pytest.raises(TypeError):
+        TranslationProvider()
+
+
+def test_translate_text_end_to_end_with_local_provider(tmp_path, monkeypatch):
+    import translation_memory
+    from translation_service import TranslationService
+
+    dictionary = tmp_path / "dictionary.json"
+    dictionary.write_text(json.dumps({"es": {"Free meals daily.": "Comidas gratis a diario."}}))
+    monkeypatch.setenv("TRANSLATION_LOCAL_DICTIONARY", str(dictionary))
+    monkeypatch.setenv("TRANSLATION_LOCAL_USE_MODEL", "false")
+    monkeypatch.setenv("TRANSLATION_MEMORY_ENABLED", "false")
+    monkeypatch.setattr(translation_memory, "TRANSLATION_MEMORY_ENABLED", False)
+
+    service = TranslationService(provider=create_provider("local"))
+    text = "Free meals daily.  Call ahead.\nOpen Monday."
+    result = asyncio.run(service.translate_text(text, "es"))
+
+    assert service.provider.name == "local"
+    assert result == "Comidas gratis a diario.  [es] Call ahead.\n[es] Open Monday."
+    assert service.get_latency_stats()["es"]["errors"] == 0
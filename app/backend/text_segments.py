@@ -0,0 +1,54 @@
+"""
+Sentence segmentation for translation.
+
+split_segments() cuts text into sentences and keeps the exact whitespace
+between them, so join_segments() rebuilds the original layout around
+translated sentences. Segments never contain a newline, which lets several
+of them travel in one translator request joined by "\n".
+"""
+import re
+from typing import List, Optional, Tuple
+
+# Whitespace after sentence-ending punctuation, or any run of newlines
+_BOUNDARY = re.compile(r"((?<=[.!?])[ \t]+|[ \t]*\n[\s]*)")
+# Words whose trailing period does not end a sentence
+_ABBREVIATIONS = {"dr.", "mr.", "mrs.", "ms.", "st.", "ave.", "no.", "vs.", "etc.", "e.g.", "i.e.", "u.s.", "a.m.", "p.m."}
+
+
+def split_segments(text: str) -> Tuple[List[str], List[str]]:
+    """(segments, separators) with len(separators) == len(segments) - 1"""
+    parts = _BOUNDARY.split(text or "")
+    segments, separators = [parts[0]], []
+    for index in range(1, len(parts), 2):
+        separator, following = parts[index], parts[index + 1]
+        last_word = segments[-1].rsplit(None, 1)[-1].lower() if segments[-1].strip() else ""
+        if "\n" not in separator and last_word in _ABBREVIATIONS:
+            segments[-1] += separator + following
+            continue
+        separators.append(separator)
+        segments.append(following)
+    return segments, separators
+
+
+def join_segments(segments: List[str], separators: List[str]) -> str:
+    pieces = [segments[0]]
+    for separator, segment in zip(separators, segments[1:]):
+        pieces.append(separator)
+        pieces.append(segment)
+    return "".join(pieces)
+
+
+def pack_batches(segments: List[str], max_chars: int, max_items: Optional[int] = None) -> List[List[str]]:
+    """Group segments into newline-joined batches of at most max_chars (and
+    max_items) each; a single longer segment gets a batch of its own"""
+    batches: List[List[str]] = []
+    size = 0
+    for segment in segments:
+        fits = batches and size + 1 + len(segment) <= max_chars
+        if fits and (max_items is None or len(batches[-1]) < max_items):
+            batches[-1].append(segment)
+            size += 1 + len(segment)
+        else:
+            batches.append([segment])
+            size = len(segment)
+    return batches
@@ -0,0 +1,251 @@
+"""
+Durable queue for background translations, stored in the translation_jobs table.
+
+Producers (onboarding, admin demo refresh) enqueue one job per target language;
+translation_worker claims them with FOR UPDATE SKIP LOCKED, so any number of
+worker processes can share the queue. Identical queued jobs collapse into one
+(the newest payload wins), failed jobs are retried with exponential backoff,
+and jobs left running by a crashed worker are requeued once their lease expires.
+"""
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import TranslationJob
+
+logger = logging.getLogger(__name__)
+
+KIND_USER_DESCRIPTION = "user_description"
+KIND_CATEGORY_SUBTITLES = "category_subtitles"
+
+TRANSLATION_JOB_MAX_ATTEMPTS = int(os.environ.get("TRANSLATION_JOB_MAX_ATTEMPTS", "5"))
+TRANSLATION_JOB_RETRY_BASE_SECONDS = int(os.environ.get("TRANSLATION_JOB_RETRY_BASE_SECONDS", "30"))
+TRANSLATION_JOB_RETRY_MAX_SECONDS = int(os.environ.get("TRANSLATION_JOB_RETRY_MAX_SECONDS", "3600"))
+# A running job whose worker has not finished it within this time is requeued
+TRANSLATION_JOB_LEASE_SECONDS = int(os.environ.get("TRANSLATION_JOB_LEASE_SECONDS", "600"))
+TRANSLATION_JOB_RETENTION_DAYS = int(os.environ.get("TRANSLATION_JOB_RETENTION_DAYS", "7"))
+
+
+def _target_languages(languages: Optional[Iterable[str]]) -> List[str]:
+    from translation_service import SUPPORTED_LANGUAGES
+    return [lang for lang in (languages or SUPPORTED_LANGUAGES.keys()) if lang != 'en']
+
+
+def enqueue(db: Session, kind: str, subject_id: Any, payload: Optional[Dict[str, Any]] = None,
+            languages: Optional[Iterable[str]] = None) -> int:
+    """Queue one job per target language and commit; returns the number of languages queued"""
+    rows = [
+        {
+            "kind": kind,
+            "subject_id": str(subject_id),
+            "language_code": language,
+            "payload": payload,
+            "dedupe_key": f"{kind}:{subject_id}:{language}",
+            "max_attempts": TRANSLATION_JOB_MAX_ATTEMPTS,
+        }
+        for language in _target_languages(languages)
+    ]
+    if not rows:
+        return 0
+    statement = pg_insert(TranslationJob).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["dedupe_key"],
+        index_where=sql_text("status = 'queued'"),
+        set_={"payload": statement.excluded.payload, "updated_at": sql_text("NOW()")},
+    )
+    try:
+        db.execute(statement)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info(f"🌐 TRANSLATION JOBS: Queued {kind} for {subject_id} in {len(rows)} languages")
+    return len(rows)
+
+
+def enqueue_user_description(db: Session, user_id: int) -> int:
+    return enqueue(db, KIND_USER_DESCRIPTION, user_id)
+
+
+def enqueue_category_subtitles(db: Session, user_id: int, categories: List[Dict[str, Any]]) -> int:
+    categories = [
+        {"key": category.get("key"), "subtitle": category.get("subtitle")}
+        for category in categories or []
+        if category.get("key") and category.get("subtitle")
+    ]
+    if not categories:
+        return 0
+    return enqueue(db, KIND_CATEGORY_SUBTITLES, user_id, {"categories": categories})
+
+
+def claim(db: Session, worker_id: str, limit: int, per_language: int) -> List[Dict[str, Any]]:
+    """Atomically mark up to `limit` due jobs as running for this worker.
+
+    Languages that already have `per_language` jobs running (on any worker) are
+    skipped, so one language's backlog cannot monopolise the translator. Claims
+    are serialized with a transaction-level advisory lock: otherwise two workers
+    could count the same running jobs and both fill the per-language cap.
+    """
+    if limit <= 0:
+        return []
+    db.execute(sql_text("SELECT pg_advisory_xact_lock(hashtext('translation_jobs.claim'))"))
+    rows = db.execute(sql_text("""
+        WITH running AS (
+            SELECT language_code, COUNT(*) AS n
+            FROM translation_jobs
+            WHERE status = 'running'
+            GROUP BY language_code
+        ), due AS (
+            SELECT id, language_code
+            FROM translation_jobs
+            WHERE status = 'queued' AND run_after <= NOW()
+            ORDER BY id
+            LIMIT :scan
+            FOR UPDATE SKIP LOCKED
+        ), eligible AS (
+            SELECT due.id
+            FROM (
+                SELECT id, language_code, ROW_NUMBER() OVER (PARTITION BY language_code ORDER BY id) AS rn
+                FROM due
+            ) due
+            LEFT JOIN running ON running.language_code = due.language_code
+            WHERE due.rn + COALESCE(running.n, 0) <= :per_language
+            ORDER BY due.id
+            LIMIT :limit
+        )
+        UPDATE translation_jobs job
+        SET status = 'running', attempts = job.attempts + 1, locked_by = :worker_id,
+            locked_at = NOW(), updated_at = NOW()
+        FROM eligible
+        WHERE job.id = eligible.id
+        RETURNING job.id, job.kind, job.subject_id, job.language_code, job.payload, job.attempts, job.max_attempts
+    """), {"scan": limit * 10, "limit": limit, "per_language": per_language, "worker_id": worker_id}).mappings().all()
+    db.commit()
+    return [dict(row) for row in rows]
+
+
+def complete(db: Session, job_id: int) -> None:
+    db.execute(sql_text("""
+        UPDATE translation_jobs
+        SET status = 'completed', completed_at = NOW(), updated_at = NOW(), last_error = NULL
+        WHERE id = :job_id
+    """), {"job_id": job_id})
+    db.commit()
+
+
+def _has_queued_duplicate(db: Session, job_id: int) -> bool:
+    return db.execute(sql_text("""
+        SELECT EXISTS (
+            SELECT 1 FROM translation_jobs queued
+            JOIN translation_jobs job ON job.dedupe_key = queued.dedupe_key
+            WHERE job.id = :job_id AND queued.status = 'queued' AND queued.id <> job.id
+        )
+    """), {"job_id": job_id}).scalar()
+
+
+def _supersede(db: Session, job_id: int) -> None:
+    # A newer queued job for the same key will do the work
+    db.execute(sql_text("""
+        UPDATE translation_jobs
+        SET status = 'superseded', completed_at = NOW(), locked_by = NULL, locked_at = NULL, updated_at = NOW()
+        WHERE id = :job_id
+    """), {"job_id": job_id})
+
+
+def _requeue(db: Session, job_id: int, delay: int, error: str) -> None:
+    if _has_queued_duplicate(db, job_id):
+        _supersede(db, job_id)
+        return
+    db.execute(sql_text("""
+        UPDATE translation_jobs
+        SET status = 'queued', run_after = NOW() + make_interval(secs => :delay),
+            locked_by = NULL, locked_at = NULL, last_error = :error, updated_at = NOW()
+        WHERE id = :job_id
+    """), {"job_id": job_id, "delay": delay, "error": error[:2000]})
+
+
+def fail(db: Session, job: Dict[str, Any], error: str) -> None:
+    """Schedule a retry with exponential backoff, or mark the job failed for good"""
+    if job["attempts"] < job["max_attempts"]:
+        delay = min(TRANSLATION_JOB_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1), TRANSLATION_JOB_RETRY_MAX_SECONDS)
+        try:
+            _requeue(db, job["id"], delay, error)
+            db.commit()
+        except IntegrityError:
+            # Another producer queued the same key concurrently
+            db.rollback()
+            _supersede(db, job["id"])
+            db.commit()
+        logger.warning(f"🌐 TRANSLATION JOBS: Job {job['id']} failed (attempt {job['attempts']}), retrying in {delay}s: {error}")
+        return
+    db.execute(sql_text("""
+        UPDATE translation_jobs
+        SET status = 'failed', completed_at = NOW(), last_error = :error, updated_at = NOW()
+        WHERE id = :job_id
+    """), {"job_id": job["id"], "error": error[:2000]})
+    db.commit()
+    logger.error(f"🌐 TRANSLATION JOBS: Job {job['id']} failed permanently after {job['attempts']} attempts: {error}")
+
+
+def requeue_stale(db: Session) -> int:
+    """Return jobs abandoned by crashed workers to the queue; returns how many"""
+    stale_ids = db.execute(sql_text("""
+        SELECT id FROM translation_jobs
+        WHERE status = 'running' AND locked_at < NOW() - make_interval(secs => :lease)
+        ORDER BY id
+        FOR UPDATE SKIP LOCKED
+    """), {"lease": TRANSLATION_JOB_LEASE_SECONDS}).scalars().all()
+    for job_id in stale_ids:
+        try:
+            with db.begin_nested():
+                _requeue(db, job_id, 0, "Lease expired")
+        except IntegrityError:
+            _supersede(db, job_id)
+    db.commit()
+    if stale_ids:
+        logger.warning(f"🌐 TRANSLATION JOBS: Requeued {len(stale_ids)} jobs whose lease expired")
+    return len(stale_ids)
+
+
+def prune(db: Session) -> int:
+    """Delete finished jobs older than TRANSLATION_JOB_RETENTION_DAYS"""
+    result = db.execute(sql_text("""
+        DELETE FROM translation_jobs
+        WHERE status IN ('completed', 'failed', 'superseded') AND completed_at < NOW() - make_interval(days => :days)
+    """), {"days": TRANSLATION_JOB_RETENTION_DAYS})
+    db.commit()
+    return result.rowcount
+
+
+def progress(db: Session) -> Dict[str, Any]:
+    """Job counts by status, kind and language, plus the age of the oldest due job"""
+    rows = db.execute(sql_text("""
+        SELECT kind, language_code, status, COUNT(*) AS n
+        FROM translation_jobs
+        GROUP BY kind, language_code, status
+    """)).all()
+    totals: Dict[str, int] = {}
+    by_kind: Dict[str, Dict[str, int]] = {}
+    by_language: Dict[str, Dict[str, int]] = {}
+    for kind, language, job_status, count in rows:
+        totals[job_status] = totals.get(job_status, 0) + count
+        kind_counts = by_kind.setdefault(kind, {})
+        kind_counts[job_status] = kind_counts.get(job_status, 0) + count
+        language_counts = by_language.setdefault(language, {})
+        language_counts[job_status] = language_counts.get(job_status, 0) + count
+    oldest = db.execute(sql_text("""
+        SELECT EXTRACT(EPOCH FROM NOW() - MIN(run_after))
+        FROM translation_jobs
+        WHERE status = 'queued' AND run_after <= NOW()
+    """)).scalar()
+    return {
+        "totals": totals,
+        "by_kind": by_kind,
+        "by_language": by_language,
+        "oldest_queued_seconds": int(oldest) if oldest is not None else None,
+    }
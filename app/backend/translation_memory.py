@@ -0,0 +1,124 @@
+"""
+Translation memory: content-addressed store of previous translations.
+
+Entries are keyed by (sha256(source text), source language, target language,
+provider), so a string translated once for any resource, user description or
+category subtitle is reused everywhere it appears again, but output of one
+provider (e.g. the offline local provider's pass-through) is never served
+when another one is configured. A small per-process TTL cache
+sits in front of the translation_memory table for hot strings such as
+subtitles.
+
+The memory is an optimization only: if the table is missing or the database
+errors, lookups return nothing and stores are skipped.
+"""
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Iterable
+
+from cachetools import TTLCache
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database import SessionLocal, TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_MEMORY_ENABLED = os.environ.get("TRANSLATION_MEMORY_ENABLED", "true").lower() == "true"
+TRANSLATION_MEMORY_LOCAL_SIZE = int(os.environ.get("TRANSLATION_MEMORY_LOCAL_SIZE", "5000"))
+TRANSLATION_MEMORY_LOCAL_TTL = int(os.environ.get("TRANSLATION_MEMORY_LOCAL_TTL", "3600"))
+
+_local: TTLCache = TTLCache(maxsize=TRANSLATION_MEMORY_LOCAL_SIZE, ttl=TRANSLATION_MEMORY_LOCAL_TTL)
+_local_lock = threading.Lock()
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def lookup(texts: Iterable[str], target_language: str, source_language: str = 'en',
+           provider: str = 'google') -> Dict[str, str]:
+    """Remembered translations by `provider` for any of `texts`, as {source text: translation}"""
+    if not TRANSLATION_MEMORY_ENABLED:
+        return {}
+
+    found: Dict[str, str] = {}
+    missing: Dict[str, str] = {}
+    with _local_lock:
+        for text in texts:
+            digest = source_hash(text)
+            cached = _local.get((digest, source_language, target_language, provider))
+            if cached is not None:
+                found[text] = cached
+            else:
+                missing[digest] = text
+    if not missing:
+        return found
+
+    db = SessionLocal()
+    try:
+        rows = db.query(TranslationMemory.id, TranslationMemory.source_hash, TranslationMemory.translated_text).filter(
+            TranslationMemory.source_hash.in_(list(missing)),
+            TranslationMemory.source_language == source_language,
+            TranslationMemory.language_code == target_language,
+            TranslationMemory.provider == provider,
+        ).all()
+        if rows:
+            db.query(TranslationMemory).filter(TranslationMemory.id.in_([row.id for row in rows])).update(
+                {TranslationMemory.hit_count: TranslationMemory.hit_count + 1, TranslationMemory.last_used_at: func.now()},
+                synchronize_session=False,
+            )
+            db.commit()
+        with _local_lock:
+            for row in rows:
+                found[missing[row.source_hash]] = row.translated_text
+                _local[(row.source_hash, source_language, target_language, provider)] = row.translated_text
+        logger.debug(f"Translation memory [{target_language}]: {len(found)} hits, {len(missing) - len(rows)} misses")
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Translation memory lookup failed: {e}")
+    finally:
+        db.close()
+    return found
+
+
+def store(translations: Dict[str, str], target_language: str, source_language: str = 'en',
+          provider: str = 'google') -> None:
+    """Remember {source text: translation} pairs produced by `provider`, replacing older entries"""
+    if not TRANSLATION_MEMORY_ENABLED or not translations:
+        return
+
+    rows = [
+        {
+            "source_hash": source_hash(text),
+            "source_language": source_language,
+            "language_code": target_language,
+            "provider": provider,
+            "source_text": text,
+            "translated_text": translated,
+        }
+        for text, translated in translations.items()
+        if text and translated
+    ]
+    if not rows:
+        return
+
+    db = SessionLocal()
+    try:
+        statement = pg_insert(TranslationMemory).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["source_hash", "source_language", "language_code", "provider"],
+            set_={"translated_text": statement.excluded.translated_text, "last_used_at": func.now()},
+        )
+        db.execute(statement)
+        db.commit()
+        with _local_lock:
+            for row in rows:
+                _local[(row["source_hash"], source_language, target_language, provider)] = row["translated_text"]
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Translation memory store failed: {e}")
+    finally:
+        db.close()
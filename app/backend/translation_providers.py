@@ -0,0 +1,248 @@
+"""
+Machine translation backends used by TranslationService.
+
+A provider translates batches of short, newline-free texts (sentence
+segments) and describes its own limits: batch size, request rate and cost
+per character. Select one with TRANSLATION_PROVIDER:
+
+    google  googletrans (default)
+    local   offline and deterministic: an Argos Translate model when one is
+            installed, otherwise a JSON dictionary (TRANSLATION_LOCAL_DICTIONARY)
+            with marked pass-through for unknown text. Meant for tests, load
+            tests and staging, where the pipeline should run at full speed
+            without network access or throttling.
+"""
+import abc
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from googletrans import Translator
+except Exception:  # pragma: no cover - optional dependency
+    Translator = None  # type: ignore
+
+try:
+    import argostranslate.translate as argos_translate
+except Exception:  # pragma: no cover - optional dependency
+    argos_translate = None  # type: ignore
+
+from blocking_io import run_blocking
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_PROVIDER = os.environ.get("TRANSLATION_PROVIDER", "google").lower()
+
+# googletrans language code mapping (most codes are the same)
+GOOGLETRANS_CODES = {
+    'en': 'en',
+    'es': 'es',
+    'fr': 'fr',
+    'zh': 'zh-cn',  # googletrans uses zh-cn for simplified Chinese
+    'ar': 'ar',
+    'sw': 'sw',
+    'ne': 'ne',
+    'ps': 'ps',
+    'uz': 'uz',
+    # New languages
+    'fa': 'fa',
+    'ja': 'ja',
+    'de': 'de',
+    'pt': 'pt',
+    'ru': 'ru',
+    'ur': 'ur'
+}
+
+
+class TranslationProvider(abc.ABC):
+    """Base class for translation backends"""
+
+    name = "base"
+    # Most texts and characters accepted by one translate_batch() call
+    max_batch_size = 1
+    max_batch_chars = 5000
+    # None means unthrottled
+    requests_per_second: Optional[float] = None
+    # Estimated USD per million source characters, for usage reporting
+    cost_per_million_chars = 0.0
+
+    def __init__(self):
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def is_available(self) -> bool:
+        return True
+
+    async def throttle(self) -> None:
+        """Space requests to stay under requests_per_second (shared across event loops)"""
+        if not self.requests_per_second:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at)
+            self._next_request_at = start_at + 1.0 / self.requests_per_second
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    @abc.abstractmethod
+    async def translate_batch(self, texts: List[str], target_language: str, source_language: str = 'en') -> List[Optional[str]]:
+        """Translate each text (app language codes); None marks a text that failed"""
+
+    def close(self) -> None:
+        pass
+
+
+class GoogleTranslateProvider(TranslationProvider):
+    """googletrans, with one reusable client per target language"""
+
+    name = "google"
+    max_batch_size = int(os.environ.get("TRANSLATION_GOOGLE_MAX_BATCH_SIZE", "50"))
+    # googletrans rejects requests over 5000 characters
+    max_batch_chars = int(os.environ.get("TRANSLATION_BATCH_MAX_CHARS", "4500"))
+    requests_per_second = float(os.environ.get("TRANSLATION_GOOGLE_REQUESTS_PER_SECOND", "5")) or None
+    # The public googletrans endpoint is free; set the Cloud Translation price when moving to it
+    cost_per_million_chars = float(os.environ.get("TRANSLATION_GOOGLE_COST_PER_MILLION_CHARS", "0"))
+
+    def __init__(self):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="googletrans")  # Limit concurrent translations
+        self._translator_lock = threading.Lock()
+        # Async googletrans clients are bound to the loop that created them, so the
+        # pool is kept per event loop
+        self._translator_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Translator]]" = weakref.WeakKeyDictionary()
+        self._available = False
+        try:
+            Translator()
+            self._available = True
+            logger.info("googletrans translator initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize googletrans translator: {e}")
+
+    def is_available(self) -> bool:
+        return self._available
+
+    def _pooled_translator(self, target_code: str) -> "Translator":
+        loop = asyncio.get_running_loop()
+        with self._translator_lock:
+            pool = self._translator_pools.setdefault(loop, {})
+            translator = pool.get(target_code)
+            if translator is None:
+                translator = pool[target_code] = Translator()
+            return translator
+
+    def _discard_translator(self, target_code: str, translator: "Translator") -> None:
+        """Drop a pooled client after an error so the next call starts with a fresh one"""
+        with self._translator_lock:
+            pool = self._translator_pools.get(asyncio.get_running_loop(), {})
+            if pool.get(target_code) is translator:
+                del pool[target_code]
+
+    async def _translate(self, text: str, target_code: str, source_code: str) -> Optional[str]:
+        """One googletrans request.
+
+        googletrans 4.x is async-native; older sync releases do blocking HTTP,
+        so those calls run on the executor instead of the event loop.
+        """
+        await self.throttle()
+        translator = self._pooled_translator(target_code)
+        try:
+            if inspect.iscoroutinefunction(translator.translate):
+                result = await translator.translate(text, dest=target_code, src=source_code)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._executor, functools.partial(translator.translate, text, dest=target_code, src=source_code)
+                )
+        except Exception:
+            self._discard_translator(target_code, translator)
+            raise
+        if hasattr(result, 'text') and result.text:
+            return result.text
+        logger.warning(f"No text in translation result: {result}")
+        return None
+
+    async def translate_batch(self, texts: List[str], target_language: str, source_language: str = 'en') -> List[Optional[str]]:
+        target_code = GOOGLETRANS_CODES.get(target_language, target_language)
+        source_code = GOOGLETRANS_CODES.get(source_language, source_language)
+        if len(texts) > 1:
+            # Several segments travel as one newline-joined request
+            joined = await self._translate("\n".join(texts), target_code, source_code)
+            lines = [line.strip() for line in joined.split("\n")] if joined else []
+            if len(lines) == len(texts) and all(lines):
+                return lines
+            logger.warning(f"Batched translation to {target_language} returned {len(lines)} lines for {len(texts)} segments; translating one by one")
+        return list(await asyncio.gather(*[self._translate(text, target_code, source_code) for text in texts]))
+
+    def close(self) -> None:
+        logger.info("Shutting down translation service executor...")
+        self._executor.shutdown(wait=True)
+        logger.info("Translation service executor shut down successfully")
+
+
+class LocalTranslationProvider(TranslationProvider):
+    """Offline, deterministic translations with no rate limit.
+
+    Uses an installed Argos Translate language pair when available, then the
+    JSON dictionary at TRANSLATION_LOCAL_DICTIONARY ({"es": {"Hello": "Hola"}}),
+    and otherwise returns the text marked with TRANSLATION_LOCAL_FORMAT
+    (default "[{lang}] {text}") so translated output is easy to recognise.
+    """
+
+    name = "local"
+    max_batch_size = 1000
+    max_batch_chars = 1_000_000
+
+    def __init__(self):
+        super().__init__()
+        self.format = os.environ.get("TRANSLATION_LOCAL_FORMAT", "[{lang}] {text}")
+        self.dictionary: Dict[str, Dict[str, str]] = {}
+        path = os.environ.get("TRANSLATION_LOCAL_DICTIONARY")
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.dictionary = json.load(f)
+                logger.info(f"Loaded local translation dictionary from {path}")
+            except Exception as e:
+                logger.error(f"Failed to load local translation dictionary {path}: {e}")
+        self.use_argos = argos_translate is not None and os.environ.get("TRANSLATION_LOCAL_USE_MODEL", "true").lower() == "true"
+
+    def _translate(self, text: str, target_language: str, source_language: str) -> str:
+        known = self.dictionary.get(target_language, {}).get(text)
+        if known is not None:
+            return known
+        if self.use_argos:
+            try:
+                return argos_translate.translate(text, source_language, target_language)
+            except Exception as e:
+                logger.debug(f"No local model for {source_language}->{target_language}: {e}")
+        return self.format.format(lang=target_language, text=text)
+
+    async def translate_batch(self, texts: List[str], target_language: str, source_language: str = 'en') -> List[Optional[str]]:
+        if self.use_argos:
+            # Model inference is CPU-bound; keep it off the event loop
+            return await run_blocking(lambda: [self._translate(text, target_language, source_language) for text in texts])
+        return [self._translate(text, target_language, source_language) for text in texts]
+
+
+PROVIDERS = {
+    GoogleTranslateProvider.name: GoogleTranslateProvider,
+    LocalTranslationProvider.name: LocalTranslationProvider,
+}
+
+
+def create_provider(name: str = TRANSLATION_PROVIDER) -> TranslationProvider:
+    provider_class = PROVIDERS.get(name)
+    if provider_class is None:
+        logger.error(f"Unknown TRANSLATION_PROVIDER '{name}', using google")
+        provider_class = GoogleTranslateProvider
+    provider = provider_class()
+    logger.info(f"Translation provider: {provider.name}")
+    return provider
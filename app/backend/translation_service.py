@@ -1,19 +1,34 @@
 import hashlib
 import logging
 import asyncio
+import os
 import time
 from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text as sql_text
-from googletrans import Translator
 import random
-from concurrent.futures import ThreadPoolExecutor
 import threading
 
-from database import Resource, ResourceTranslation, User, UserDescriptionTranslation, PriorityCategorySubtitleTranslation
+from database import SessionLocal, Resource, ResourceTranslation, User, UserDescriptionTranslation, PriorityCategorySubtitleTranslation
+from cache_service import cache, user_cache_namespace, RESOURCE_TRANSLATIONS_NAMESPACE
+from blocking_io import run_blocking
+import translation_memory
+from text_segments import split_segments, join_segments, pack_batches
+from translation_providers import TranslationProvider, create_provider
 
 logger = logging.getLogger(__name__)
 
+
+def _with_session(func, *args):
+    """Run a sync DB helper with its own short-lived session (blocking; see _in_session)"""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+TRANSLATION_SLOW_CALL_SECONDS = float(os.environ.get("TRANSLATION_SLOW_CALL_SECONDS", "5"))
+
 # Supported language codes that match our frontend
 SUPPORTED_LANGUAGES = {
     'en': 'English',
@@ -34,45 +49,51 @@ SUPPORTED_LANGUAGES = {
     'ur': 'Urdu'
 }
 
-# googletrans language code mapping (most codes are the same)
-GOOGLETRANS_CODES = {
-    'en': 'en',
-    'es': 'es',
-    'fr': 'fr', 
-    'zh': 'zh-cn',  # googletrans uses zh-cn for simplified Chinese
-    'ar': 'ar',
-    'sw': 'sw',
-    'ne': 'ne',
-    'ps': 'ps',
-    'uz': 'uz',
-    # New languages
-    'fa': 'fa',
-    'ja': 'ja',
-    'de': 'de',
-    'pt': 'pt',
-    'ru': 'ru',
-    'ur': 'ur'
-}
 
 class TranslationService:
-    def __init__(self):
-        self.translator = None
-        self._executor = ThreadPoolExecutor(max_workers=5)  # Limit concurrent translations
-        self._translator_lock = threading.Lock()
-        self._initialize_translator()
-    
-    def _initialize_translator(self):
-        """Initialize googletrans translator"""
-        try:
-            self.translator = Translator()
-            logger.info("googletrans translator initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize googletrans translator: {e}")
-            self.translator = None
-    
+    def __init__(self, provider: Optional[TranslationProvider] = None):
+        self.provider = provider or create_provider()
+        self._latency_lock = threading.Lock()
+        self._latency: Dict[str, Dict[str, float]] = {}
+
+    def _record_latency(self, language: str, seconds: float, characters: int, failed: bool = False):
+        with self._latency_lock:
+            stats = self._latency.setdefault(language, {"calls": 0, "errors": 0, "characters": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["calls"] += 1
+            stats["errors"] += 1 if failed else 0
+            stats["characters"] += characters
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        if seconds > TRANSLATION_SLOW_CALL_SECONDS:
+            logger.warning(f"Slow translation call to {language}: {seconds:.2f}s")
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-language provider call counts, errors, latency and estimated cost for this process"""
+        with self._latency_lock:
+            return {
+                language: {
+                    "provider": self.provider.name,
+                    "calls": int(stats["calls"]),
+                    "errors": int(stats["errors"]),
+                    "characters": int(stats["characters"]),
+                    "estimated_cost_usd": round(stats["characters"] * self.provider.cost_per_million_chars / 1_000_000, 4),
+                    "avg_ms": round(stats["total_seconds"] / stats["calls"] * 1000, 1),
+                    "max_ms": round(stats["max_seconds"] * 1000, 1),
+                }
+                for language, stats in sorted(self._latency.items())
+            }
+
     def is_available(self) -> bool:
         """Check if translation service is available"""
-        return self.translator is not None
+        return self.provider.is_available()
+
+    async def _in_session(self, func, *args):
+        """Run a sync DB helper (first argument: a Session) on the blocking pool.
+
+        Each call gets its own session, so concurrent translations never share
+        one across threads; only provider calls stay on the event loop.
+        """
+        return await run_blocking(_with_session, func, *args)
     
     def calculate_content_hash(self, resource_name: str, summary: str) -> str:
         """Calculate SHA256 hash of translatable content for change detection"""
@@ -84,151 +105,195 @@ class TranslationService:
         content = roadmap_summary or ''
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
     
+    async def _provider_translate(self, texts: List[str], target_language: str, source_language: str) -> List[Optional[str]]:
+        """One provider batch call, timed and retried on errors"""
+        characters = sum(len(text) for text in texts)
+        max_retries = 3
+        for attempt in range(max_retries):
+            started = time.perf_counter()
+            try:
+                results = await self.provider.translate_batch(texts, target_language, source_language)
+                self._record_latency(target_language, time.perf_counter() - started, characters)
+                return results
+            except Exception as e:
+                self._record_latency(target_language, time.perf_counter() - started, characters, failed=True)
+                if attempt < max_retries - 1:
+                    logger.warning(f"Translation attempt {attempt + 1} failed: {e}, retrying...")
+                    await asyncio.sleep(random.uniform(1, 3))  # Longer delay between retries
+                    continue
+                raise
+
     async def _translate_text_async_native(self, text: str, target_language: str, source_language: str = 'en') -> Optional[str]:
-        """Handle async googletrans translation properly"""
-        if not self.translator or not text or not text.strip():
+        """Translate one text with the provider, bypassing translation memory"""
+        if not self.is_available() or not text or not text.strip():
             return None
-        
+        if target_language == source_language:
+            return text  # No translation needed
         try:
-            # Map to googletrans language codes
-            target_code = GOOGLETRANS_CODES.get(target_language, target_language)
-            source_code = GOOGLETRANS_CODES.get(source_language, source_language)
-            
-            if target_code == source_code:
-                return text  # No translation needed
-            
-            # Add random delay to avoid rate limiting
-            await asyncio.sleep(random.uniform(0.1, 0.3))
-            
-            # Retry logic for robustness
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    # Create a new translator instance for each request to avoid conflicts
-                    translator = Translator()
-                    result = translator.translate(text, dest=target_code, src=source_code)
-                    
-                    # Handle both sync and async responses from googletrans
-                    if hasattr(result, '__await__'):
-                        # It's a coroutine, await it
-                        result = await result
-                    
-                    if hasattr(result, 'text') and result.text:
-                        return result.text
-                    else:
-                        logger.warning(f"No text in translation result: {result}")
-                        return None
-                        
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Translation attempt {attempt + 1} failed: {e}, retrying...")
-                        await asyncio.sleep(random.uniform(1, 3))  # Longer delay between retries
-                        continue
-                    else:
-                        raise e
-            
-            return None
-                    
+            return (await self._provider_translate([text], target_language, source_language))[0]
         except Exception as e:
             logger.error(f"Translation error for '{text[:50]}...': {e}")
             return None
     
     async def translate_text(self, text: str, target_language: str, source_language: str = 'en') -> Optional[str]:
-        """Async translation method"""
-        return await self._translate_text_async_native(text, target_language, source_language)
+        """Async translation method.
+
+        The text is split into sentences; sentences already in translation memory
+        are reused, the rest are sent to the translator in as few requests as
+        possible and remembered, and the result is reassembled in order. Editing
+        one sentence of a summary therefore costs one sentence per language.
+        """
+        if not text or not text.strip() or target_language == source_language:
+            return await self._translate_text_async_native(text, target_language, source_language)
+
+        segments, separators = split_segments(text)
+        unique = list(dict.fromkeys(segment for segment in segments if segment.strip()))
+
+        translations = await run_blocking(
+            translation_memory.lookup, unique, target_language, source_language, self.provider.name
+        )
+        missing = [segment for segment in unique if segment not in translations]
+        if missing and not self.is_available():
+            return None
+        if missing:
+            fresh = await self._translate_segments(missing, target_language, source_language)
+            if fresh:
+                await run_blocking(
+                    translation_memory.store, fresh, target_language, source_language, self.provider.name
+                )
+            if len(fresh) < len(missing):
+                return None
+            translations.update(fresh)
+        else:
+            logger.debug(f"Translation memory served all {len(unique)} segments for {target_language}")
+
+        return join_segments([translations.get(segment, segment) for segment in segments], separators)
+
+    async def _translate_segments(self, segments: List[str], target_language: str, source_language: str) -> Dict[str, str]:
+        """Translate newline-free segments in as few provider calls as its batch limits allow"""
+        async def translate_batch(batch: List[str]) -> Dict[str, str]:
+            try:
+                results = await self._provider_translate(batch, target_language, source_language)
+            except Exception as e:
+                logger.error(f"Translation error for {len(batch)} segments to {target_language}: {e}")
+                return {}
+            return {segment: result for segment, result in zip(batch, results) if result}
+
+        batches = pack_batches(segments, self.provider.max_batch_chars, self.provider.max_batch_size)
+        translated: Dict[str, str] = {}
+        for result in await asyncio.gather(*[translate_batch(batch) for batch in batches]):
+            translated.update(result)
+        return translated
     
-    async def translate_resource(self, resource: Resource, target_language: str, db: Session) -> bool:
-        """Async translate a single resource to target language"""
+    async def translate_resource(self, resource: Resource, target_language: str, invalidate: bool = True) -> bool:
+        """Async translate a single resource to target language.
+
+        The resource's name and summary must already be loaded; the result is
+        saved through a short-lived session on the blocking pool. With
+        invalidate=False the caller bumps the cache generation itself.
+        """
         if target_language == 'en':
             return True  # English is source language
         
         # Pending status should already be set by translate_resources_batch
+        resource_id, resource_name, summary = resource.id, resource.resource_name, resource.summary
         
         try:
-            logger.info(f"Translating resource {resource.id} to {target_language}")
+            logger.info(f"Translating resource {resource_id} to {target_language}")
             
             # Create translation tasks for concurrent execution
             tasks = []
             
             # Translate resource name and summary concurrently
-            if resource.resource_name:
-                tasks.append(self.translate_text(resource.resource_name, target_language))
+            if resource_name:
+                tasks.append(self.translate_text(resource_name, target_language))
             else:
                 tasks.append(asyncio.create_task(asyncio.sleep(0, result=None)))  # Dummy task
             
-            if resource.summary:
-                tasks.append(self.translate_text(resource.summary, target_language))
+            if summary:
+                tasks.append(self.translate_text(summary, target_language))
             else:
                 tasks.append(asyncio.create_task(asyncio.sleep(0, result=None)))  # Dummy task
             
             # Wait for both translations to complete
             resource_name_translated, summary_translated = await asyncio.gather(*tasks)
             
-            logger.info(f"Translated name: '{resource.resource_name}' -> '{resource_name_translated}'")
-            logger.info(f"Translated summary: '{resource.summary[:50] if resource.summary else None}...' -> '{summary_translated[:50] if summary_translated else None}...'")
+            logger.info(f"Translated name: '{resource_name}' -> '{resource_name_translated}'")
+            logger.info(f"Translated summary: '{summary[:50] if summary else None}...' -> '{summary_translated[:50] if summary_translated else None}...'")
             
             # Check if we got at least one successful translation
             if not resource_name_translated and not summary_translated:
-                self._save_translation_error(
-                    db, resource.id, target_language, 
+                await self._in_session(
+                    self._save_translation_error, resource_id, target_language,
                     "Failed to translate any content"
                 )
                 return False
             
             # Save translation to database
-            self._save_translation(
-                db, resource.id, target_language,
-                resource_name_translated, summary_translated
+            await self._in_session(
+                self._save_translation, resource_id, target_language,
+                resource_name_translated, summary_translated, invalidate
             )
             
             return True
             
         except Exception as e:
-            logger.error(f"Error translating resource {resource.id} to {target_language}: {e}")
-            self._save_translation_error(db, resource.id, target_language, str(e))
+            logger.error(f"Error translating resource {resource_id} to {target_language}: {e}")
+            await self._in_session(self._save_translation_error, resource_id, target_language, str(e))
             return False
     
-    async def translate_user_description(self, user_id: int, target_language: str, db: Session) -> bool:
-        """Async translate a user's roadmap summary to target language"""
+    @staticmethod
+    def _roadmap_summary(db: Session, user_id: int) -> Optional[str]:
+        """A user's roadmap summary, or None if the user does not exist"""
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            logger.error(f"User {user_id} not found")
+            return None
+        return user.roadmap_summary
+
+    async def translate_user_description(self, user_id: int, target_language: str,
+                                         roadmap_summary: Optional[str] = None) -> bool:
+        """Async translate a user's roadmap summary to target language.
+
+        The summary is looked up when not given; lookups and saves use
+        short-lived sessions on the blocking pool.
+        """
         if target_language == 'en':
             return True  # English is source language
         
         try:
-            # Get fresh user object from database in this session
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user:
-                logger.error(f"User {user_id} not found")
-                return False
+            if roadmap_summary is None:
+                roadmap_summary = await self._in_session(self._roadmap_summary, user_id)
             
-            if not user.roadmap_summary or not user.roadmap_summary.strip():
+            if not roadmap_summary or not roadmap_summary.strip():
                 logger.warning(f"User {user_id} has no roadmap summary to translate")
                 return False
             
             logger.info(f"Translating user {user_id} description to {target_language}")
             
             # Translate the roadmap summary
-            translated_summary = await self.translate_text(user.roadmap_summary, target_language)
+            translated_summary = await self.translate_text(roadmap_summary, target_language)
             
-            logger.info(f"Translated summary: '{user.roadmap_summary[:50]}...' -> '{translated_summary[:50] if translated_summary else None}...'")
+            logger.info(f"Translated summary: '{roadmap_summary[:50]}...' -> '{translated_summary[:50] if translated_summary else None}...'")
             
             # Check if translation was successful
             if not translated_summary:
-                self._save_user_translation_error(
-                    db, user_id, target_language, 
+                await self._in_session(
+                    self._save_user_translation_error, user_id, target_language,
                     "Failed to translate roadmap summary"
                 )
                 return False
             
             # Save translation to database
-            self._save_user_translation(
-                db, user_id, target_language, translated_summary
+            await self._in_session(
+                self._save_user_translation, user_id, target_language, translated_summary
             )
             
             return True
             
         except Exception as e:
             logger.error(f"Error translating user {user_id} description to {target_language}: {e}")
-            self._save_user_translation_error(db, user_id, target_language, str(e))
+            await self._in_session(self._save_user_translation_error, user_id, target_language, str(e))
             return False
     
     def _create_pending_translation(self, db: Session, resource_id: str, language_code: str):
@@ -261,8 +326,11 @@ class TranslationService:
             db.rollback()
 
     def _save_translation(self, db: Session, resource_id: str, language_code: str, 
-                         resource_name: Optional[str], summary: Optional[str]):
-        """Save successful translation to database"""
+                         resource_name: Optional[str], summary: Optional[str], invalidate: bool = True):
+        """Save successful translation to database.
+
+        Batches pass invalidate=False and bump the cache generation once at the end.
+        """
         try:
             # Check if translation already exists
             existing = db.query(ResourceTranslation).filter(
@@ -288,6 +356,9 @@ class TranslationService:
                 db.add(translation)
             
             db.commit()
+            if invalidate:
+                # Cached responses embedding translated resources may show the old (English) text
+                cache.bump_generation(RESOURCE_TRANSLATIONS_NAMESPACE)
             logger.info(f"Saved translation for resource {resource_id} in {language_code}")
             
         except Exception as e:
@@ -378,6 +449,8 @@ class TranslationService:
                 db.add(translation)
             
             db.commit()
+            # Cached dashboard responses for this user may show the old (English) text
+            cache.bump_generation(user_cache_namespace(user_id))
             logger.info(f"Saved user translation for user {user_id} in {language_code}")
             
         except Exception as e:
@@ -423,18 +496,9 @@ class TranslationService:
         if languages is None:
             languages = [lang for lang in SUPPORTED_LANGUAGES.keys() if lang != 'en']
         
-        # Get resources to translate - IMPORTANT: Only translate Ready resources
-        resources = db.query(Resource).filter(
-            Resource.id.in_(resource_ids),
-            Resource.ready == True  # Safety filter: only translate Ready resources
-        ).all()
-        
-        # Log if any resources were filtered out
-        filtered_count = len(resource_ids) - len(resources)
-        if filtered_count > 0:
-            logger.warning(f"Filtered out {filtered_count} non-Ready resources from translation batch")
-        
-        logger.info(f"Starting async batch translation for {len(resources)} Ready resources in {len(languages)} languages")
+        # Pending entries are written on the blocking pool; `db` is not touched
+        # again until the translations have finished
+        resources = await run_blocking(self._start_resources_batch, db, resource_ids, languages)
         
         results = {}
         
@@ -442,30 +506,19 @@ class TranslationService:
         translation_tasks = []
         task_metadata = []
         
-        # First, create all pending translation entries
         for resource in resources:
             results[resource.id] = {}
             
-            # Update resource translation status to pending
-            resource.translation_status = 'pending'
-            
             for language in languages:
                 if language == 'en':
                     results[resource.id][language] = True
                     continue
                 
-                # Create pending translation entry immediately
-                self._create_pending_translation(db, resource.id, language)
-                
                 # Create async task for this resource-language combination
-                task = self.translate_resource(resource, language, db)
+                task = self.translate_resource(resource, language, invalidate=False)
                 translation_tasks.append(task)
                 task_metadata.append((resource.id, language))
         
-        # Commit all pending status updates
-        db.commit()
-        logger.info(f"Created pending entries for {len(translation_tasks)} translations")
-        
         # Execute all translation tasks concurrently with semaphore to limit concurrency
         semaphore = asyncio.Semaphore(3)  # Limit to 3 concurrent resource translations
         
@@ -494,6 +547,55 @@ class TranslationService:
             success, resource_id, language = result
             results[resource_id][language] = success
         
+        await run_blocking(self._finish_resources_batch, db, list(results), results)
+        logger.info(f"Async batch translation completed")
+        return results
+    
+    def _start_resources_batch(self, db: Session, resource_ids: List[str], languages: List[str]) -> List[Resource]:
+        """Mark Ready resources pending and create their pending translations (blocking).
+
+        Returns the resources with name and summary loaded for translation.
+        """
+        # Get resources to translate - IMPORTANT: Only translate Ready resources
+        resources = db.query(Resource).filter(
+            Resource.id.in_(resource_ids),
+            Resource.ready == True  # Safety filter: only translate Ready resources
+        ).all()
+        
+        # Log if any resources were filtered out
+        filtered_count = len(resource_ids) - len(resources)
+        if filtered_count > 0:
+            logger.warning(f"Filtered out {filtered_count} non-Ready resources from translation batch")
+        
+        logger.info(f"Starting async batch translation for {len(resources)} Ready resources in {len(languages)} languages")
+        
+        ready_ids = [resource.id for resource in resources]
+        pending = 0
+        for resource_id in ready_ids:
+            for language in languages:
+                if language != 'en':
+                    # Create pending translation entry immediately
+                    self._create_pending_translation(db, resource_id, language)
+                    pending += 1
+        
+        # Update resource translation status to pending
+        resources = db.query(Resource).filter(Resource.id.in_(ready_ids)).all()
+        for resource in resources:
+            resource.translation_status = 'pending'
+        
+        # Commit all pending status updates; reloading leaves name and summary
+        # readable without further queries
+        db.commit()
+        resources = db.query(Resource).filter(Resource.id.in_(ready_ids)).all()
+        logger.info(f"Created pending entries for {pending} translations")
+        return resources
+    
+    def _finish_resources_batch(self, db: Session, resource_ids: List[str], results: Dict[str, Dict[str, bool]]) -> None:
+        """Store each resource's overall translation status and content hash (blocking)"""
+        if not resource_ids:
+            return
+        resources = db.query(Resource).filter(Resource.id.in_(resource_ids)).all()
+        
         # Update overall resource translation status
         for resource in resources:
             resource_results = results.get(resource.id, {})
@@ -516,8 +618,9 @@ class TranslationService:
             )
         
         db.commit()
-        logger.info(f"Async batch translation completed")
-        return results
+        # One bump for the whole batch: cached responses embedding these
+        # resources may still show the old (English) text
+        cache.bump_generation(RESOURCE_TRANSLATIONS_NAMESPACE)
     
     async def translate_user_description_batch(self, user_id: int, db: Session, 
                                              languages: Optional[List[str]] = None) -> Dict[str, bool]:
@@ -529,45 +632,28 @@ class TranslationService:
         if languages is None:
             languages = [lang for lang in SUPPORTED_LANGUAGES.keys() if lang != 'en']
         
-        # Get user to translate
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            logger.error(f"User {user_id} not found")
+        # Pending entries are written on the blocking pool; `db` is not touched
+        # again until the translations have finished
+        roadmap_summary = await run_blocking(self._start_user_description_batch, db, user_id, languages)
+        if not roadmap_summary:
             return {}
         
-        if not user.roadmap_summary or not user.roadmap_summary.strip():
-            logger.warning(f"User {user_id} has no roadmap summary to translate")
-            return {}
-        
-        logger.info(f"Starting async batch translation for user {user_id} description in {len(languages)} languages")
-        
         results = {}
         
-        # Update user translation status to pending
-        user.roadmap_translation_status = 'pending'
-        
         # Create translation tasks for all languages
         translation_tasks = []
         task_metadata = []
         
-        # First, create all pending translation entries
         for language in languages:
             if language == 'en':
                 results[language] = True
                 continue
             
-            # Create pending translation entry immediately
-            self._create_pending_user_translation(db, user.id, language)
-            
             # Create async task for this language
-            task = self.translate_user_description(user.id, language, db)
+            task = self.translate_user_description(user_id, language, roadmap_summary)
             translation_tasks.append(task)
             task_metadata.append(language)
         
-        # Commit all pending status updates
-        db.commit()
-        logger.info(f"Created pending entries for {len(translation_tasks)} user translations")
-        
         # Execute all translation tasks concurrently with semaphore to limit concurrency
         semaphore = asyncio.Semaphore(3)  # Limit to 3 concurrent translations
         
@@ -596,6 +682,50 @@ class TranslationService:
             success, language = result
             results[language] = success
         
+        await run_blocking(self._finish_user_description_batch, db, user_id, roadmap_summary, results)
+        logger.info(f"Async user description translation completed")
+        return results
+    
+    def _start_user_description_batch(self, db: Session, user_id: int, languages: List[str]) -> Optional[str]:
+        """Mark a user's description pending and create its pending translations (blocking).
+
+        Returns the roadmap summary to translate, or None when there is nothing to do.
+        """
+        # Get user to translate
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            logger.error(f"User {user_id} not found")
+            return None
+        
+        roadmap_summary = user.roadmap_summary
+        if not roadmap_summary or not roadmap_summary.strip():
+            logger.warning(f"User {user_id} has no roadmap summary to translate")
+            return None
+        
+        logger.info(f"Starting async batch translation for user {user_id} description in {len(languages)} languages")
+        
+        # Update user translation status to pending
+        user.roadmap_translation_status = 'pending'
+        
+        # Create pending translation entries immediately
+        pending = 0
+        for language in languages:
+            if language != 'en':
+                self._create_pending_user_translation(db, user_id, language)
+                pending += 1
+        
+        # Commit all pending status updates
+        db.commit()
+        logger.info(f"Created pending entries for {pending} user translations")
+        return roadmap_summary
+    
+    def _finish_user_description_batch(self, db: Session, user_id: int, roadmap_summary: str,
+                                       results: Dict[str, bool]) -> None:
+        """Store the user's overall description translation status and hash (blocking)"""
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return
+        
         # Update overall user translation status
         if results:
             all_successful = all(results.values())
@@ -610,14 +740,12 @@ class TranslationService:
         else:
             user.roadmap_translation_status = 'failed'
         
-        # Update content hash
+        # Update content hash (of the summary that was translated)
         user.last_roadmap_translation_hash = self.calculate_user_description_hash(
-            user.roadmap_summary
+            roadmap_summary
         )
         
         db.commit()
-        logger.info(f"Async user description translation completed")
-        return results
     
     def get_translation_status(self, db: Session) -> Dict[str, any]:
         """Get overall translation status statistics"""
@@ -804,6 +932,30 @@ class TranslationService:
             logger.error(f"Error updating translation status from database: {e}")
             db.rollback()
     
+    def refresh_user_translation_status(self, db: Session, user: User):
+        """Set a user's roadmap_translation_status from their stored translations (caller commits)"""
+        # Count successful translations for this user
+        completed_translations = db.query(UserDescriptionTranslation).filter(
+            UserDescriptionTranslation.user_id == user.id,
+            UserDescriptionTranslation.translation_status == 'completed'
+        ).count()
+
+        failed_translations = db.query(UserDescriptionTranslation).filter(
+            UserDescriptionTranslation.user_id == user.id,
+            UserDescriptionTranslation.translation_status == 'failed'
+        ).count()
+
+        total_expected = len([lang for lang in SUPPORTED_LANGUAGES.keys() if lang != 'en'])
+
+        if completed_translations >= total_expected:
+            user.roadmap_translation_status = 'completed'
+        elif failed_translations > 0:
+            user.roadmap_translation_status = 'failed'
+        elif completed_translations > 0:
+            user.roadmap_translation_status = 'pending'
+        else:
+            user.roadmap_translation_status = 'not_started'
+    
     def update_user_translation_status_from_db(self, db: Session):
         """Update user translation status based on existing translations in database"""
         try:
@@ -814,27 +966,7 @@ class TranslationService:
             ).all()
             
             for user in users:
-                # Count successful translations for this user
-                completed_translations = db.query(UserDescriptionTranslation).filter(
-                    UserDescriptionTranslation.user_id == user.id,
-                    UserDescriptionTranslation.translation_status == 'completed'
-                ).count()
-                
-                failed_translations = db.query(UserDescriptionTranslation).filter(
-                    UserDescriptionTranslation.user_id == user.id,
-                    UserDescriptionTranslation.translation_status == 'failed'
-                ).count()
-                
-                total_expected = len([lang for lang in SUPPORTED_LANGUAGES.keys() if lang != 'en'])
-                
-                if completed_translations >= total_expected:
-                    user.roadmap_translation_status = 'completed'
-                elif failed_translations > 0:
-                    user.roadmap_translation_status = 'failed'
-                elif completed_translations > 0:
-                    user.roadmap_translation_status = 'pending'
-                else:
-                    user.roadmap_translation_status = 'not_started'
+                self.refresh_user_translation_status(db, user)
             
             db.commit()
             logger.info("Updated user translation status from database")
@@ -886,16 +1018,13 @@ class TranslationService:
                     results[category_key][language] = True
                     continue
                 
-                # Create pending translation entry immediately
-                self._create_pending_category_subtitle_translation(db, user_id, category_key, language)
-                
                 # Create async task for this category-language combination
-                task = self._translate_category_subtitle(user_id, category_key, subtitle, language, db)
+                task = self._translate_category_subtitle(user_id, category_key, subtitle, language)
                 translation_tasks.append(task)
                 task_metadata.append((category_key, language))
         
-        # Commit all pending status updates
-        db.commit()
+        # Create all pending translation entries (blocking pool) before translating
+        await run_blocking(self._create_pending_category_subtitles, db, user_id, task_metadata)
         logger.info(f"Created pending entries for {len(translation_tasks)} category subtitle translations")
         
         # Execute all translation tasks concurrently with semaphore to limit concurrency
@@ -930,9 +1059,16 @@ class TranslationService:
         logger.info(f"Category subtitle translation completed for user {user_id}")
         return results
     
+    def _create_pending_category_subtitles(self, db: Session, user_id: int,
+                                           pending: List[Tuple[str, str]]) -> None:
+        """Create pending subtitle translations for (category_key, language) pairs and commit (blocking)"""
+        for category_key, language in pending:
+            self._create_pending_category_subtitle_translation(db, user_id, category_key, language)
+        db.commit()
+    
     async def _translate_category_subtitle(self, user_id: int, category_key: str, subtitle: str, 
-                                          target_language: str, db: Session) -> bool:
-        """Translate a single category subtitle"""
+                                          target_language: str) -> bool:
+        """Translate a single category subtitle; the result is saved on the blocking pool"""
         try:
             logger.info(f"Translating category subtitle for user {user_id}, category {category_key} to {target_language}")
             
@@ -943,22 +1079,22 @@ class TranslationService:
             
             # Check if translation was successful
             if not subtitle_translated:
-                self._save_category_subtitle_translation_error(
-                    db, user_id, category_key, target_language, 
+                await self._in_session(
+                    self._save_category_subtitle_translation_error, user_id, category_key, target_language,
                     "Failed to translate subtitle"
                 )
                 return False
             
             # Save translation to database
-            self._save_category_subtitle_translation(
-                db, user_id, category_key, target_language, subtitle_translated
+            await self._in_session(
+                self._save_category_subtitle_translation, user_id, category_key, target_language, subtitle_translated
             )
             
             return True
             
         except Exception as e:
             logger.error(f"Error translating category subtitle for user {user_id}, category {category_key} to {target_language}: {e}")
-            self._save_category_subtitle_translation_error(db, user_id, category_key, target_language, str(e))
+            await self._in_session(self._save_category_subtitle_translation_error, user_id, category_key, target_language, str(e))
             return False
     
     def _create_pending_category_subtitle_translation(self, db: Session, user_id: int, 
@@ -1021,6 +1157,7 @@ class TranslationService:
                 db.add(translation)
             
             db.commit()
+            cache.bump_generation(user_cache_namespace(user_id))
             logger.info(f"Saved category subtitle translation for user {user_id}, category {category_key} in {language_code}")
             
         except Exception as e:
@@ -1081,10 +1218,7 @@ class TranslationService:
     
     def cleanup(self):
         """Clean up resources (call on application shutdown)"""
-        if hasattr(self, '_executor') and self._executor:
-            logger.info("Shutting down translation service executor...")
-            self._executor.shutdown(wait=True)
-            logger.info("Translation service executor shut down successfully")
+        self.provider.close()
 
 # Global translation service instance
 translation_service = TranslationService()
\ No newline at end of file
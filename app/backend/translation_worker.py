@@ -0,0 +1,169 @@
+"""
+Worker that processes the translation_jobs queue (see translation_jobs.py).
+
+Runs as its own process, started next to the API by docker_entrypoint.py
+(TRANSLATION_WORKER_PROCESS=false to run it elsewhere, e.g. as a separate
+deployment):
+
+    python translation_worker.py
+
+For single-process development, TRANSLATION_WORKER_EMBEDDED=true runs one
+inside the API process instead, on a separate thread with its own event loop
+so translation work never competes with request handling.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from database import SessionLocal, User
+from blocking_io import run_blocking
+import translation_jobs
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_WORKER_EMBEDDED = os.environ.get("TRANSLATION_WORKER_EMBEDDED", "false").lower() == "true"
+TRANSLATION_WORKER_CONCURRENCY = int(os.environ.get("TRANSLATION_WORKER_CONCURRENCY", "4"))
+# Max jobs running per target language across all workers
+TRANSLATION_JOBS_PER_LANGUAGE = int(os.environ.get("TRANSLATION_JOBS_PER_LANGUAGE", "2"))
+TRANSLATION_WORKER_POLL_SECONDS = float(os.environ.get("TRANSLATION_WORKER_POLL_SECONDS", "2"))
+MAINTENANCE_INTERVAL_SECONDS = 60
+
+
+def _queue_call(func, *args):
+    """Run a translation_jobs function with its own short-lived session"""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+
+async def _translate_user_description(db, job: Dict[str, Any]) -> None:
+    from translation_service import translation_service
+    user_id = int(job["subject_id"])
+    language = job["language_code"]
+    results = await translation_service.translate_user_description_batch(user_id, db, languages=[language])
+    user = db.query(User).filter(User.id == user_id).first()
+    if user:
+        translation_service.refresh_user_translation_status(db, user)
+        db.commit()
+    if results.get(language) is False:
+        raise RuntimeError(f"Roadmap summary translation to {language} failed")
+
+
+async def _translate_category_subtitles(db, job: Dict[str, Any]) -> None:
+    from translation_service import translation_service
+    language = job["language_code"]
+    categories = (job.get("payload") or {}).get("categories") or []
+    results = await translation_service.translate_category_subtitles(int(job["subject_id"]), categories, db, languages=[language])
+    failed = [key for key, languages in results.items() if not languages.get(language)]
+    if failed:
+        raise RuntimeError(f"Subtitle translation to {language} failed for: {', '.join(failed)}")
+
+
+HANDLERS = {
+    translation_jobs.KIND_USER_DESCRIPTION: _translate_user_description,
+    translation_jobs.KIND_CATEGORY_SUBTITLES: _translate_category_subtitles,
+}
+
+
+class TranslationWorker:
+    def __init__(self, worker_id: Optional[str] = None,
+                 concurrency: int = TRANSLATION_WORKER_CONCURRENCY,
+                 per_language: int = TRANSLATION_JOBS_PER_LANGUAGE):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.per_language = per_language
+        self._stopping = False
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        from translation_service import translation_service
+        handler = HANDLERS.get(job["kind"])
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if handler is None:
+                raise RuntimeError(f"Unknown translation job kind: {job['kind']}")
+            if not translation_service.is_available():
+                raise RuntimeError("Translation service not available")
+            await handler(db, job)
+        except Exception as e:
+            db.rollback()
+            await run_blocking(_queue_call, translation_jobs.fail, job, str(e))
+            return
+        finally:
+            db.close()
+        await run_blocking(_queue_call, translation_jobs.complete, job["id"])
+        logger.info(f"🌐 TRANSLATION WORKER: Job {job['id']} ({job['kind']} {job['subject_id']} → {job['language_code']}) "
+                    f"done in {time.perf_counter() - started:.1f}s")
+
+    async def run(self) -> None:
+        logger.info(f"🌐 TRANSLATION WORKER: {self.worker_id} started "
+                    f"(concurrency {self.concurrency}, {self.per_language} per language)")
+        running: Set[asyncio.Task] = set()
+        last_maintenance = 0.0
+        while not self._stopping:
+            try:
+                if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL_SECONDS:
+                    last_maintenance = time.monotonic()
+                    await run_blocking(_queue_call, translation_jobs.requeue_stale)
+                    await run_blocking(_queue_call, translation_jobs.prune)
+
+                jobs = await run_blocking(_queue_call, translation_jobs.claim, self.worker_id,
+                                          self.concurrency - len(running), self.per_language)
+                for job in jobs:
+                    task = asyncio.create_task(self._process(job))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+            except Exception as e:
+                logger.error(f"🌐 TRANSLATION WORKER: Queue poll failed: {e}")
+                jobs = []
+
+            if running and (jobs or len(running) >= self.concurrency):
+                await asyncio.wait(running, timeout=TRANSLATION_WORKER_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(TRANSLATION_WORKER_POLL_SECONDS)
+
+        if running:
+            logger.info(f"🌐 TRANSLATION WORKER: Waiting for {len(running)} running jobs")
+            await asyncio.gather(*running, return_exceptions=True)
+        logger.info(f"🌐 TRANSLATION WORKER: {self.worker_id} stopped")
+
+
+_embedded_thread: Optional[threading.Thread] = None
+
+
+def start_embedded_worker() -> None:
+    """Run a worker on a background thread with its own event loop (API startup)"""
+    global _embedded_thread
+    if not TRANSLATION_WORKER_EMBEDDED or _embedded_thread is not None:
+        return
+    worker = TranslationWorker()
+    _embedded_thread = threading.Thread(target=lambda: asyncio.run(worker.run()), name="translation-worker", daemon=True)
+    _embedded_thread.start()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = TranslationWorker()
+
+    async def _run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()